@@ -0,0 +1,168 @@
+"""视频帧转换基准测试（无界面运行）
+
+对比两种把解码出的 BGR 帧变成窗口尺寸 Surface 的方式：
+
+- copy：原来的做法，每帧新分配缩放结果和 RGB 转换结果，再交换坐标轴后
+  make_surface（Surface 自己再存一份像素）
+- zero-copy：解码和缩放都写进复用的数组，Surface 用 pygame.image.frombuffer
+  按 BGR 格式直接引用缩放结果
+
+分别统计整段视频的转换耗时（不含解码），以及每帧转换期间新分配的 NumPy
+内存峰值（tracemalloc 统计，单独跑一遍，不影响计时）和 Surface 是否复制了
+像素。
+
+用法（在仓库根目录下）:
+    python AirConditionerGame/benchmarks/convert_benchmark.py
+    python AirConditionerGame/benchmarks/convert_benchmark.py --passes 5 --size 1920x1080
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import cv2
+import numpy as np
+import pygame
+from video_stream import bgr_surface
+
+DEFAULT_VIDEO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             'assets', 'videos', 'background.mp4')
+
+
+@dataclass
+class ConvertResult:
+    """一种转换方式的测试结果"""
+    method: str  # 转换方式
+    frames: int  # 每遍的帧数
+    clip_ms: float  # 转换整段视频的耗时（毫秒，多遍取最小值）
+    frame_ms: float  # 每帧转换耗时（毫秒）
+    alloc_mb_per_frame: float  # 每帧转换期间新分配的 NumPy 内存峰值（MB）
+    surface_copies: int  # 每帧 Surface 复制像素的次数（0 表示直接引用数组）
+
+
+class CopyConverter:
+    """原来的转换方式：缩放、转 RGB、交换坐标轴后 make_surface"""
+    name = 'copy'
+
+    def __init__(self, size):
+        self.size = size
+
+    def read(self, cap):
+        return cap.read()
+
+    def convert(self, frame):
+        frame = cv2.resize(frame, self.size)
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        return pygame.surfarray.make_surface(frame.swapaxes(0, 1)), frame
+
+
+class ZeroCopyConverter:
+    """复用解码和缩放的数组，Surface 直接引用 BGR 缩放结果"""
+    name = 'zero-copy'
+
+    def __init__(self, size):
+        self.size = size
+        self._decoded = None
+        self._resized = np.empty((size[1], size[0], 3), dtype=np.uint8)
+
+    def read(self, cap):
+        ok, self._decoded = cap.read(self._decoded)
+        return ok, self._decoded
+
+    def convert(self, frame):
+        resized = cv2.resize(frame, self.size, dst=self._resized)
+        return bgr_surface(resized, self.size), resized
+
+
+def run_pass(converter, video_path, trace=False):
+    """解码整段视频并逐帧转换
+
+    Returns:
+        (帧数, 转换耗时秒数, 每帧新分配峰值字节数的平均值, Surface 复制次数)
+    """
+    cap = cv2.VideoCapture(video_path)
+    frames = 0
+    seconds = 0.0
+    alloc_bytes = 0
+    copies = 0
+    try:
+        while True:
+            ok, frame = converter.read(cap)
+            if not ok:
+                break
+            if trace:
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            surface, pixels = converter.convert(frame)
+            seconds += time.perf_counter() - start
+            if trace:
+                alloc_bytes += tracemalloc.get_traced_memory()[1] - base
+            if surface._pixels_address != pixels.ctypes.data:
+                copies += 1
+            frames += 1
+            del surface, pixels
+    finally:
+        cap.release()
+    return frames, seconds, alloc_bytes / max(1, frames), copies
+
+
+def run(converter, video_path, passes):
+    """多遍计时取最小值，再单独跑一遍统计内存分配"""
+    best = None
+    for _ in range(passes):
+        frames, seconds, _, copies = run_pass(converter, video_path)
+        best = seconds if best is None else min(best, seconds)
+
+    tracemalloc.start()
+    try:
+        _, _, alloc_bytes, _ = run_pass(converter, video_path, trace=True)
+    finally:
+        tracemalloc.stop()
+
+    return ConvertResult(
+        method=converter.name,
+        frames=frames,
+        clip_ms=best * 1000,
+        frame_ms=best * 1000 / max(1, frames),
+        alloc_mb_per_frame=alloc_bytes / 1e6,
+        surface_copies=round(copies / max(1, frames))
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='视频帧转换基准测试')
+    parser.add_argument('--video', default=DEFAULT_VIDEO, help='视频文件路径')
+    parser.add_argument('--size', default='1024x576', help='输出尺寸，宽x高')
+    parser.add_argument('--passes', type=int, default=3, help='计时遍数（取最小值）')
+    parser.add_argument('--json', help='将结果写入 JSON 文件')
+    args = parser.parse_args(argv)
+
+    size = tuple(int(v) for v in args.size.split('x'))
+    pygame.init()
+    pygame.display.set_mode(size)
+
+    results = [run(converter, args.video, args.passes)
+               for converter in (CopyConverter(size), ZeroCopyConverter(size))]
+
+    print(f"视频 {os.path.basename(args.video)}, 输出 {size[0]}x{size[1]}, {args.passes} 遍")
+    for r in results:
+        print(f"[{r.method}] {r.frames} 帧 整段 {r.clip_ms:.1f} ms | 每帧 {r.frame_ms:.2f} ms | "
+              f"新分配 {r.alloc_mb_per_frame:.2f} MB/帧 | Surface 复制 {r.surface_copies} 次/帧")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'config': vars(args), 'results': [asdict(r) for r in results]},
+                      f, ensure_ascii=False, indent=2)
+    pygame.quit()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
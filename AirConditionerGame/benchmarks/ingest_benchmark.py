@@ -0,0 +1,97 @@
+"""多进程视频解码基准测试（无界面运行）
+
+对比单进程顺序解码和不同进程数的 IngestedVideo 冷加载整段视频的耗时，
+并逐帧核对多进程解码结果与顺序解码一致。
+
+子进程跳到自己范围的开头时，解码器要从前一个关键帧解码过来；关键帧
+稀疏的短视频（x264 默认 250 帧一个关键帧）每个范围都要从头解码，进程数
+带来的收益有限。
+
+用法（在仓库根目录下）:
+    python AirConditionerGame/benchmarks/ingest_benchmark.py
+    python AirConditionerGame/benchmarks/ingest_benchmark.py --workers 1,2,4,8 --video long.mp4
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import cv2
+import numpy as np
+from parallel_ingest import IngestedVideo
+
+DEFAULT_VIDEO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             'assets', 'videos', 'background.mp4')
+
+
+@dataclass
+class IngestResult:
+    """一种解码方式的测试结果"""
+    workers: int  # 进程数，0 表示在本进程顺序解码
+    frames: int  # 解码的帧数
+    seconds: float  # 整段视频的解码耗时（秒）
+    speedup: float  # 相对顺序解码的加速比
+    mismatched_frames: int  # 与顺序解码结果不一致的帧数
+
+
+def decode_sequential(video_path, size):
+    """在本进程顺序解码、缩放整段视频"""
+    cap = cv2.VideoCapture(video_path)
+    frames = []
+    frame = None
+    try:
+        while True:
+            ok, frame = cap.read(frame)
+            if not ok:
+                break
+            frames.append(cv2.resize(frame, size))
+    finally:
+        cap.release()
+    return np.array(frames)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='多进程视频解码基准测试')
+    parser.add_argument('--video', default=DEFAULT_VIDEO, help='视频文件路径')
+    parser.add_argument('--size', default='1024x576', help='输出尺寸，宽x高')
+    parser.add_argument('--workers', default=f'1,2,4,{os.cpu_count() or 1}',
+                        help='逗号分隔的进程数')
+    parser.add_argument('--json', help='将结果写入 JSON 文件')
+    args = parser.parse_args(argv)
+
+    size = tuple(int(v) for v in args.size.split('x'))
+    start = time.perf_counter()
+    expected = decode_sequential(args.video, size)
+    baseline = time.perf_counter() - start
+    results = [IngestResult(0, len(expected), baseline, 1.0, 0)]
+
+    for workers in sorted({int(w) for w in args.workers.split(',') if w.strip()}):
+        start = time.perf_counter()
+        video = IngestedVideo(args.video, size, workers)
+        seconds = time.perf_counter() - start
+        mismatched = sum(1 for a, b in zip(video.frames, expected) if not np.array_equal(a, b))
+        mismatched += abs(len(video.frames) - len(expected))
+        results.append(IngestResult(workers, len(video.frames), seconds,
+                                    baseline / seconds if seconds else 0.0, mismatched))
+        video.close()
+
+    print(f"视频 {os.path.basename(args.video)}, 输出 {size[0]}x{size[1]}, CPU {os.cpu_count()} 核")
+    for r in results:
+        name = '顺序解码' if r.workers == 0 else f"{r.workers} 进程"
+        print(f"[{name}] {r.frames} 帧 {r.seconds * 1000:.0f} ms | 加速 {r.speedup:.2f}x | "
+              f"不一致 {r.mismatched_frames} 帧")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'config': vars(args), 'results': [asdict(r) for r in results]},
+                      f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""闪烁粒子基准测试（无界面运行）
+
+对比原来的字典列表写法（逐个 draw.circle，在绘制循环里 list.remove）和
+ParticlePool（按列存放、整体更新、批量贴图）在不同存活粒子数下每帧的
+更新和绘制耗时。每帧补充新粒子，使存活数保持在目标附近。
+
+用法（在仓库根目录下）:
+    python AirConditionerGame/benchmarks/particle_benchmark.py
+    python AirConditionerGame/benchmarks/particle_benchmark.py --counts 1000,5000 --frames 300
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+from particles import ParticlePool
+
+WINDOW_SIZE = (1024, 576)
+GOLD = (255, 215, 0)
+LIFE_FRAMES = 20  # 粒子寿命（帧），与原来的闪烁效果一致
+
+
+@dataclass
+class ParticleResult:
+    """单个粒子数下一种写法的测试结果"""
+    method: str  # 写法
+    particles: int  # 目标存活粒子数
+    live_mean: float  # 实际平均存活粒子数
+    update_ms: float  # 每帧更新耗时（毫秒，字典写法为 0：更新混在绘制里）
+    draw_ms: float  # 每帧绘制耗时（毫秒）
+    frame_ms: float  # 合计
+
+
+def run_dicts(target, frames, screen):
+    """原来的写法：字典列表，绘制时扣寿命并 list.remove"""
+    particles = []
+    per_frame = target // LIFE_FRAMES + 1
+    draw = 0.0
+    live = 0
+    for _ in range(frames):
+        for _ in range(per_frame):
+            particles.append({
+                'x': random.randint(400, 600), 'y': random.randint(200, 400),
+                'size': random.randint(2, 4), 'life': LIFE_FRAMES, 'color': GOLD
+            })
+        live += len(particles)
+        start = time.perf_counter()
+        for particle in particles[:]:
+            pygame.draw.circle(screen, particle['color'],
+                               (int(particle['x']), int(particle['y'])), particle['size'])
+            particle['life'] -= 1
+            if particle['life'] <= 0:
+                particles.remove(particle)
+        draw += time.perf_counter() - start
+    return ParticleResult('dict-list', target, live / frames, 0.0,
+                          draw * 1000 / frames, draw * 1000 / frames)
+
+
+def run_pool(target, frames, screen):
+    """ParticlePool：整体更新，批量贴图"""
+    pool = ParticlePool(target * 2, [GOLD], sizes=(2, 3, 4))
+    per_frame = target // LIFE_FRAMES + 1
+    dt = 1 / 60
+    update = draw = 0.0
+    live = 0
+    for _ in range(frames):
+        pool.emit(
+            position=np.random.uniform((400, 200), (600, 400), (per_frame, 2)),
+            velocity=np.zeros((per_frame, 2)),
+            size=np.random.randint(2, 5, per_frame),
+            life=np.full(per_frame, LIFE_FRAMES * dt),
+            color=np.zeros(per_frame, dtype=np.uint8)
+        )
+        live += pool.count
+        start = time.perf_counter()
+        pool.update(dt)
+        middle = time.perf_counter()
+        pool.draw(screen)
+        update += middle - start
+        draw += time.perf_counter() - middle
+    return ParticleResult('pool', target, live / frames, update * 1000 / frames,
+                          draw * 1000 / frames, (update + draw) * 1000 / frames)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='闪烁粒子基准测试')
+    parser.add_argument('--counts', default='10,100,1000,5000', help='逗号分隔的目标存活粒子数')
+    parser.add_argument('--frames', type=int, default=180, help='每种情况的帧数')
+    parser.add_argument('--json', help='将结果写入 JSON 文件')
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    screen = pygame.display.set_mode(WINDOW_SIZE)
+    results = []
+    for count in (int(c) for c in args.counts.split(',') if c.strip()):
+        results.append(run_dicts(count, args.frames, screen))
+        results.append(run_pool(count, args.frames, screen))
+
+    print(f"窗口 {WINDOW_SIZE[0]}x{WINDOW_SIZE[1]}, 每种情况 {args.frames} 帧")
+    for r in results:
+        print(f"[{r.method} {r.particles}] 平均存活 {r.live_mean:.0f} | 更新 {r.update_ms:.3f} ms | "
+              f"绘制 {r.draw_ms:.3f} ms | 合计 {r.frame_ms:.3f} ms")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'config': vars(args), 'results': [asdict(r) for r in results]},
+                      f, ensure_ascii=False, indent=2)
+    pygame.quit()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""房间温度模拟基准测试（无界面运行）
+
+按不同网格分辨率运行 RoomThermal，分别统计每帧的模拟步进、叠加层上色
+和放大、叠加层贴到窗口上的耗时，以及空调开启一段时间后的房间平均温度。
+
+用法（在仓库根目录下）:
+    python AirConditionerGame/benchmarks/thermal_benchmark.py
+    python AirConditionerGame/benchmarks/thermal_benchmark.py --grids 64x36,256x144 --seconds 60
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from thermal import RoomThermal
+
+WINDOW_SIZE = (1024, 576)
+OUTLET_RECT = (680, 128, 178, 50)  # 与 main.py 中空调出风口的位置一致
+
+
+@dataclass
+class ThermalResult:
+    """单个网格分辨率的测试结果"""
+    grid: str  # 网格分辨率
+    frames: int  # 模拟帧数
+    step_ms: float  # 每帧模拟步进耗时（毫秒）
+    overlay_ms: float  # 每帧叠加层上色和放大耗时（毫秒）
+    blit_ms: float  # 每帧叠加层贴到窗口上的耗时（毫秒）
+    total_ms: float  # 三项合计
+    mean_temperature: float  # 结束时房间平均温度
+    min_temperature: float  # 结束时最低温度
+
+
+def run(grid, seconds, fps, screen):
+    """空调开启状态下模拟 seconds 秒"""
+    room = RoomThermal(WINDOW_SIZE, grid)
+    room.set_outlet(OUTLET_RECT)
+    frames = int(seconds * fps)
+    dt = 1 / fps
+    step = overlay = blit = 0.0
+    for _ in range(frames):
+        start = time.perf_counter()
+        room.step(dt, True, 26)
+        middle = time.perf_counter()
+        surface = room.render_overlay()
+        end = time.perf_counter()
+        screen.blit(surface, (0, 0))
+        step += middle - start
+        overlay += end - middle
+        blit += time.perf_counter() - end
+    return ThermalResult(
+        grid=f"{grid[0]}x{grid[1]}",
+        frames=frames,
+        step_ms=step * 1000 / frames,
+        overlay_ms=overlay * 1000 / frames,
+        blit_ms=blit * 1000 / frames,
+        total_ms=(step + overlay + blit) * 1000 / frames,
+        mean_temperature=room.mean_temperature,
+        min_temperature=float(room.temperature.min())
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='房间温度模拟基准测试')
+    parser.add_argument('--grids', default='32x18,64x36,128x72,256x144',
+                        help='逗号分隔的网格分辨率，列数x行数')
+    parser.add_argument('--seconds', type=float, default=10, help='模拟的秒数')
+    parser.add_argument('--fps', type=int, default=60, help='模拟帧率')
+    parser.add_argument('--json', help='将结果写入 JSON 文件')
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    screen = pygame.display.set_mode(WINDOW_SIZE)
+    grids = [tuple(int(v) for v in g.split('x')) for g in args.grids.split(',') if g.strip()]
+    results = [run(grid, args.seconds, args.fps, screen) for grid in grids]
+
+    print(f"窗口 {WINDOW_SIZE[0]}x{WINDOW_SIZE[1]}, 模拟 {args.seconds:g} 秒 @{args.fps} 帧/秒")
+    for r in results:
+        print(f"[{r.grid}] 步进 {r.step_ms:.3f} ms | 叠加层 {r.overlay_ms:.3f} ms | "
+              f"贴图 {r.blit_ms:.3f} ms | 合计 {r.total_ms:.3f} ms | "
+              f"平均 {r.mean_temperature:.2f}°C 最低 {r.min_temperature:.2f}°C")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'config': vars(args), 'results': [asdict(r) for r in results]},
+                      f, ensure_ascii=False, indent=2)
+    pygame.quit()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,192 @@
+import mmap
+import struct
+import cv2
+import numpy as np
+from video_stream import bgr_surface
+
+# 差分缓存文件头：魔数、宽、高、帧数、帧率、分块边长、更新块总数，之后依次是
+# 第 0 帧（完整 BGR）、每帧更新块的起始下标（帧数 + 1 个 uint32）、每个更新块的
+# 位置（列、行各一个 uint16）、更新块图集（所有更新块竖着排成一列，BGR）
+_HEADER = struct.Struct('<4sIIIdII')
+_MAGIC = b'ACD1'
+
+# Surface 超过 65535 行时贴图出错，更新块图集按这个高度切成多个 Surface
+_STRIP_HEIGHT = 32768
+
+
+class DeltaEncoder:
+    """把视频帧编码成分块差分
+
+    每帧分成边长相同的方块，只保留与当前画面（按已保留的块拼出的画面，
+    不是上一帧原图，误差不会累积）相差超过阈值的块。第 0 帧完整保存；
+    序号 0 的差分是从最后一帧回到第 0 帧，阈值为 0，循环播放时每一圈都从
+    完全相同的画面开始。
+    """
+    def __init__(self, size, tile_size, threshold):
+        """
+        Args:
+            size: 帧尺寸 (宽, 高)
+            tile_size: 分块边长（像素）
+            threshold: 块内任一像素任一通道相差超过该值才更新（0 为无损）
+        """
+        self.size = size
+        self.tile_size = tile_size
+        self.threshold = threshold
+        self.columns = -(-size[0] // tile_size)
+        self.rows = -(-size[1] // tile_size)
+        self._keyframe = None
+        self._canvas = None  # 按分块补齐尺寸的当前画面
+        self._frame_tiles = [np.empty((0, 2), dtype=np.uint16)]  # 每帧更新块的位置（第 0 帧最后计算）
+        self._tiles = []  # 每帧更新块的像素，形状 (块数, 边长, 边长, 3)
+        self.count = 0
+
+    def _pad(self, frame):
+        """边缘复制补齐到分块边长的整数倍"""
+        height = self.rows * self.tile_size
+        width = self.columns * self.tile_size
+        if frame.shape[0] == height and frame.shape[1] == width:
+            return frame.copy()
+        return cv2.copyMakeBorder(frame, 0, height - frame.shape[0], 0, width - frame.shape[1],
+                                  cv2.BORDER_REPLICATE)
+
+    def _changed(self, frame, threshold):
+        """与当前画面相差超过阈值的块，更新当前画面并返回 (位置, 像素)"""
+        t = self.tile_size
+        diff = cv2.absdiff(frame, self._canvas).reshape(self.rows, t, self.columns, t * 3)
+        rows, columns = np.nonzero(diff.max(axis=(1, 3)) > threshold)
+        blocks = self._canvas.reshape(self.rows, t, self.columns, t, 3).swapaxes(1, 2)
+        source = frame.reshape(self.rows, t, self.columns, t, 3).swapaxes(1, 2)
+        pixels = source[rows, columns]
+        blocks[rows, columns] = pixels
+        return np.stack([columns, rows], axis=1).astype(np.uint16), pixels
+
+    def add(self, frame):
+        """编码下一帧（BGR，帧尺寸；数组可以在返回后被复用）"""
+        if self._keyframe is None:
+            self._keyframe = self._pad(frame)
+            self._canvas = self._keyframe.copy()
+            self._tiles.append(np.empty((0, self.tile_size, self.tile_size, 3), dtype=np.uint8))
+        else:
+            positions, pixels = self._changed(self._pad(frame), self.threshold)
+            self._frame_tiles.append(positions)
+            self._tiles.append(pixels)
+        self.count += 1
+
+    @property
+    def change_ratio(self):
+        """每帧平均更新的块占全部块的比例"""
+        total = sum(len(p) for p in self._frame_tiles)
+        return total / max(1, self.count * self.rows * self.columns)
+
+    def write(self, f, fps):
+        """计算回到第 0 帧的差分并写入文件
+
+        Args:
+            f: 以二进制写入方式打开的文件
+            fps: 视频帧率
+        """
+        self._frame_tiles[0], self._tiles[0] = self._changed(self._keyframe, 0)
+        offsets = np.zeros(self.count + 1, dtype=np.uint32)
+        np.cumsum([len(p) for p in self._frame_tiles], out=offsets[1:])
+        t = self.tile_size
+        height = self.rows * t
+        width = self.columns * t
+        f.write(_HEADER.pack(_MAGIC, width, height, self.count, fps, t, int(offsets[-1])))
+        f.write(self._keyframe.data)
+        f.write(offsets.data)
+        for positions in self._frame_tiles:
+            f.write(positions.data)
+        for pixels in self._tiles:
+            f.write(np.ascontiguousarray(pixels).data)
+
+
+class DeltaVideo:
+    """从内存映射的分块差分缓存播放视频
+
+    画布常驻，播放到下一帧时只把变化的块贴到画布上；跳过的帧按顺序补上
+    它们的差分。更新块图集切成几段，每段是一个直接引用映射内存的 Surface。
+    接口与 CachedVideo 相同。
+    """
+    def __init__(self, cache_path, size):
+        """映射缓存文件，文件不存在或不完整时抛出异常
+
+        Args:
+            cache_path: 缓存文件路径
+            size: 画布尺寸 (宽, 高)（缓存按分块补齐，可能更大）
+        """
+        with open(cache_path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, width, height, count, fps, t, total = _HEADER.unpack_from(self._map)
+            keyframe_bytes = width * height * 3
+            tile_bytes = t * t * 3
+            offset = _HEADER.size + keyframe_bytes
+            if magic != _MAGIC or count == 0 or len(self._map) != \
+                    offset + (count + 1) * 4 + total * 4 + total * tile_bytes:
+                raise ValueError(f"Invalid delta cache: {cache_path}")
+        except Exception:
+            self._map.close()
+            raise
+
+        self.size = size
+        self.fps = fps
+        self.dropped_frames = 0
+        self.tile_size = t
+        view = memoryview(self._map)
+        self.first_frame = bgr_surface(view[_HEADER.size:offset], (width, height))
+
+        offsets = np.frombuffer(self._map, dtype=np.uint32, count=count + 1, offset=offset)
+        offset += (count + 1) * 4
+        positions = np.frombuffer(self._map, dtype=np.uint16, count=total * 2,
+                                  offset=offset).reshape(total, 2)
+        offset += total * 4
+        per_strip = _STRIP_HEIGHT // t
+        self._atlas = [
+            bgr_surface(view[offset + k * tile_bytes:offset + min(k + per_strip, total) * tile_bytes],
+                        (t, (min(k + per_strip, total) - k) * t))
+            for k in range(0, total, per_strip)
+        ]
+
+        # 每帧的贴图参数，直接交给 Surface.blits
+        self._blits = []
+        for i in range(count):
+            start, end = int(offsets[i]), int(offsets[i + 1])
+            self._blits.append([
+                (self._atlas[k // per_strip], (int(x) * t, int(y) * t), (0, k % per_strip * t, t, t))
+                for k, (x, y) in enumerate(positions[start:end].tolist(), start)
+            ])
+        self.change_ratio = total / (count * (width // t) * (height // t))
+
+        self._canvas = self.first_frame.subsurface((0, 0) + tuple(size)).copy()
+        self._canvas_seq = 0
+
+    def frame(self, seq):
+        """把画布推进到序号对应的帧（序号循环播放时不回绕）"""
+        if seq < self._canvas_seq:
+            self.rewind()
+        count = len(self._blits)
+        # 每一圈开始时的画面都与第 0 帧完全相同，落后超过一圈时直接跳到这一圈开头
+        if seq - self._canvas_seq > count:
+            self._canvas.blit(self.first_frame, (0, 0))
+            self._canvas_seq = seq - seq % count
+        for s in range(self._canvas_seq + 1, seq + 1):
+            self._canvas.blits(self._blits[s % count], doreturn=False)
+        self._canvas_seq = seq
+        return self._canvas
+
+    def rewind(self):
+        """画布回到第 0 帧"""
+        self._canvas.blit(self.first_frame, (0, 0))
+        self._canvas_seq = 0
+
+    def close(self):
+        """释放引用映射内存的 Surface 并解除映射"""
+        self._blits = []
+        self._atlas = []
+        self._canvas = None
+        self.first_frame = None
+        try:
+            self._map.close()
+        except BufferError:
+            # 还有 Surface 在别处被引用，交给进程退出时释放
+            pass
@@ -0,0 +1,186 @@
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import cv2
+import numpy as np
+from delta_video import DeltaEncoder
+from video_stream import bgr_surface
+
+# 缓存文件头：魔数、宽、高、帧数、帧率，之后是逐帧连续存放的 BGR 数据
+_HEADER = struct.Struct('<4sIIId')
+_MAGIC = b'ACV2'
+
+
+def frame_cache_path(video_path, size, cache_dir, tile_size=0, threshold=0):
+    """按视频内容哈希、窗口尺寸和差分参数得到缓存文件路径
+
+    Args:
+        video_path: 视频文件路径
+        size: 输出尺寸 (宽, 高)
+        cache_dir: 缓存目录
+        tile_size: 差分分块边长，0 表示缓存完整帧
+        threshold: 差分阈值
+    """
+    digest = hashlib.sha1()
+    with open(video_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    name = f"{digest.hexdigest()[:16]}_{size[0]}x{size[1]}"
+    if tile_size:
+        name += f"_t{tile_size}q{threshold}.delta"
+    else:
+        name += ".bgr"
+    return os.path.join(cache_dir, name)
+
+
+class CachedVideo:
+    """从内存映射的缓存文件播放视频
+
+    每一帧的 Surface 直接引用映射的内存（pygame.image.frombuffer），不解码也不
+    复制；同时运行的多个实例共用同一份页缓存。接口与 VideoStream 相同。
+    """
+    def __init__(self, cache_path):
+        """映射缓存文件，文件不存在或不完整时抛出异常
+
+        Args:
+            cache_path: 缓存文件路径
+        """
+        with open(cache_path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, width, height, count, fps = _HEADER.unpack_from(self._map)
+            frame_bytes = width * height * 3
+            if magic != _MAGIC or count == 0 or \
+                    len(self._map) != _HEADER.size + count * frame_bytes:
+                raise ValueError(f"Invalid frame cache: {cache_path}")
+        except Exception:
+            self._map.close()
+            raise
+
+        self.size = (width, height)
+        self.fps = fps
+        self.dropped_frames = 0
+        view = memoryview(self._map)
+        self._frames = [
+            bgr_surface(view[_HEADER.size + i * frame_bytes:_HEADER.size + (i + 1) * frame_bytes],
+                        self.size)
+            for i in range(count)
+        ]
+        self.first_frame = self._frames[0]
+
+    def frame(self, seq):
+        """取序号对应的帧（序号循环播放时不回绕）"""
+        return self._frames[seq % len(self._frames)]
+
+    def rewind(self):
+        """从头开始播放（按序号取帧，无需处理）"""
+
+    def close(self):
+        """释放引用映射内存的 Surface 并解除映射"""
+        self._frames = []
+        self.first_frame = None
+        try:
+            self._map.close()
+        except BufferError:
+            # 还有 Surface 在别处被引用，交给进程退出时释放
+            pass
+
+
+class FrameCacheBuilder:
+    """后台线程解码整个视频并写入缓存文件
+
+    指定分块边长时写入分块差分缓存（DeltaVideo 播放），否则写入完整帧缓存
+    （CachedVideo 播放）。先写入临时文件，完成后原子替换为缓存文件，同时
+    启动的多个实例互不干扰；中途失败或被停止时删除临时文件，下次启动重新
+    生成。
+    """
+    def __init__(self, video_path, size, cache_path, tile_size=0, threshold=0, frames=None):
+        """启动生成线程
+
+        Args:
+            video_path: 视频文件路径
+            size: 输出尺寸 (宽, 高)
+            cache_path: 缓存文件路径
+            tile_size: 差分分块边长，0 表示缓存完整帧
+            threshold: 差分阈值（块内像素相差超过该值才更新）
+            frames: 已解码、缩放好的全部帧（BGR，形状 (帧数, 高, 宽, 3)），
+                给出时直接写入，不再解码
+        """
+        self.video_path = video_path
+        self.size = size
+        self.cache_path = cache_path
+        self.tile_size = tile_size
+        self.threshold = threshold
+        self.frames = frames
+        self.done = False  # 缓存文件是否已生成
+        self.change_ratio = None  # 差分缓存每帧更新块的比例
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name='FrameCacheBuilder', daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """停止生成并等待线程退出"""
+        self._stopped = True
+        self._thread.join()
+
+    def _decode(self, cap, consume):
+        """逐帧解码、缩放后交给 consume（解码和缩放都复用同一块内存），
+        已给出全部帧时直接逐帧交给 consume
+
+        Returns:
+            解码的帧数
+        """
+        count = 0
+        if self.frames is not None:
+            for frame in self.frames:
+                if self._stopped:
+                    break
+                consume(frame)
+                count += 1
+            return count
+        frame = None
+        resized = np.empty((self.size[1], self.size[0], 3), dtype=np.uint8)
+        while not self._stopped:
+            ret, frame = cap.read(frame)
+            if not ret:
+                break
+            consume(cv2.resize(frame, self.size, dst=resized))
+            count += 1
+        return count
+
+    def _run(self):
+        """解码整个视频写入临时文件，完成后替换为缓存文件"""
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+        temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        cap = cv2.VideoCapture(self.video_path)
+        try:
+            if not cap.isOpened():
+                return
+            fps = cap.get(cv2.CAP_PROP_FPS) or 30
+            with open(temp_path, 'wb') as f:
+                if self.tile_size:
+                    encoder = DeltaEncoder(self.size, self.tile_size, self.threshold)
+                    count = self._decode(cap, encoder.add)
+                    if count:
+                        encoder.write(f, fps)
+                        self.change_ratio = encoder.change_ratio
+                else:
+                    f.write(_HEADER.pack(_MAGIC, self.size[0], self.size[1], 0, fps))
+                    count = self._decode(cap, lambda frame: f.write(frame.data))
+                    # 帧数最后写回文件头
+                    f.seek(0)
+                    f.write(_HEADER.pack(_MAGIC, self.size[0], self.size[1], count, fps))
+            if self._stopped or count == 0:
+                return
+            os.replace(temp_path, self.cache_path)
+            self.done = True
+            if self.change_ratio is not None:
+                print(f"Delta video cache written: {self.change_ratio:.1%} of tiles change per frame")
+        except OSError as e:
+            print(f"Error writing frame cache: {str(e)}")
+        finally:
+            cap.release()
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
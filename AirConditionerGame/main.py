@@ -1,9 +1,15 @@
+import time
+START_TIME = time.perf_counter()  # 启动时间，用于统计首帧和视频出现的耗时
+
 import pygame
 import sys
 import os
 import random
-import cv2
 import numpy as np
+from particles import ParticlePool
+from playback_clock import PlaybackClock
+from thermal import RoomThermal
+from video_loader import VideoLoader
 
 # 初始化Pygame
 pygame.init()
@@ -20,42 +26,6 @@ BLACK = (0, 0, 0)
 GRAY = (200, 200, 200)
 GOLD = (255, 215, 0)
 
-# 加载视频背景
-def load_video_background(video_path):
-    try:
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            print(f"Error: Could not open video file: {video_path}")
-            return None, 30  # 返回None和默认帧率
-        
-        # 获取视频信息
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        
-        # 读取所有帧
-        frames = []
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-                
-            # 调整帧大小以匹配窗口
-            frame = cv2.resize(frame, (WINDOW_WIDTH, WINDOW_HEIGHT))
-            # 转换颜色空间从BGR到RGB
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            # 转换为Pygame surface
-            frame = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
-            frames.append(frame)
-        
-        cap.release()
-        if not frames:  # 如果没有成功读取到任何帧
-            print("Error: No frames were read from the video")
-            return None, 30
-        return frames, fps
-    except Exception as e:
-        print(f"Error loading video: {str(e)}")
-        return None, 30
-
 # 加载图片资源
 def load_image(name):
     return pygame.image.load(os.path.join('AirConditionerGame', 'assets', 'images', name))
@@ -64,18 +34,30 @@ def load_image(name):
 background = load_image('liveroom.png')
 background = pygame.transform.scale(background, (WINDOW_WIDTH, WINDOW_HEIGHT))
 
-# 尝试加载视频背景
+# 视频背景在后台加载，加载完成前先显示静态背景，完成后淡入视频
 video_path = os.path.join('AirConditionerGame', 'assets', 'videos', 'background.mp4')
-video_frames, video_fps = load_video_background(video_path)
+cache_dir = os.path.join('AirConditionerGame', 'cache')
+VIDEO_FADE_SECONDS = 0.5  # 静态背景淡入视频的时长
+VIDEO_TILE_SIZE = 32  # 视频缓存的差分分块边长，0 表示缓存完整帧
+VIDEO_TILE_THRESHOLD = 8  # 块内像素相差超过该值才更新（0 为无损）
+# 没有缓存时并行解码视频的进程数，默认 1 表示边播放边解码，内存占用有上限；
+# 大于 1 时整段视频先解码到共享内存，启动更快但内存随视频长度增长
+VIDEO_INGEST_WORKERS = 1
 
-# 如果视频加载失败，使用静态背景
-if video_frames is None:
-    print("Using static background image instead of video")
-    video_frames = [background]  # 使用静态背景图片
-    video_fps = 30  # 设置默认帧率
+# 房间温度模拟
+HEAT_OVERLAY = False  # 是否显示房间温度叠加层（调试用）
+THERMAL_GRID = (64, 36)  # 房间温度网格分辨率 (列数, 行数)
 
-current_frame = 0
-frame_timer = 0
+# 开关闪烁粒子
+SPARKLE_COLORS = [GOLD, (255, 240, 150), WHITE]  # 金色为主，夹杂浅金和白色
+SPARKLE_NORMALS = np.array([(0, -1), (1, 0), (0, 1), (-1, 0)], dtype=np.float32)  # 上右下左各边向外的方向
+SPARKLE_RATE = 600  # 每秒加入的粒子数
+SPARKLE_SECONDS = 1.0  # 闪烁持续时间
+SPARKLE_CAPACITY = 4096  # 最多同时存在的粒子数
+
+# 按真实时间推进视频帧（帧序号从 0 开始递增，循环播放时不回绕），
+# 帧率在视频加载完成后更新
+playback = PlaybackClock(30)
 
 class Remote:
     def __init__(self):
@@ -92,41 +74,41 @@ class Remote:
         self.image_click = pygame.transform.scale(self.image_click, (self.width, self.height))
         self.button_pressed = False
         self.sparkle_effect = False
-        self.sparkle_timer = 0
-        self.sparkle_particles = []
+        self.sparkle_timer = 0  # 闪烁已持续的秒数
+        self.sparkle_budget = 0.0  # 还没加入的粒子数（不足一个的部分留到下一帧）
+        self.sparkles = ParticlePool(SPARKLE_CAPACITY, SPARKLE_COLORS, sizes=(2, 3, 4), gravity=60)
         self.is_animating = False  # 控制是否正在动画中
         self.animation_speed = 5  # 动画速度
         self.mouse_entered = False  # 控制鼠标是否进入窗口
         self.is_retracting = False  # 控制是否正在退回
         
-    def create_sparkle_particle(self):
+    def emit_sparkles(self, count):
+        """在开关按钮四周随机位置批量加入向外飞散的粒子"""
         button_x = self.x + 15
         button_y = self.y + 77
         button_width = 55
         button_height = 12
         
         # 在按钮周围随机位置创建粒子
-        side = random.randint(0, 3)  # 0:上, 1:右, 2:下, 3:左
-        if side == 0:  # 上边
-            x = random.randint(button_x - 5, button_x + button_width + 5)
-            y = button_y - 5
-        elif side == 1:  # 右边
-            x = button_x + button_width + 5
-            y = random.randint(button_y - 5, button_y + button_height + 5)
-        elif side == 2:  # 下边
-            x = random.randint(button_x - 5, button_x + button_width + 5)
-            y = button_y + button_height + 5
-        else:  # 左边
-            x = button_x - 5
-            y = random.randint(button_y - 5, button_y + button_height + 5)
-            
-        return {
-            'x': x,
-            'y': y,
-            'size': random.randint(2, 4),
-            'life': 20,  # 粒子寿命
-            'color': (255, 215, 0)  # 金色
-        }
+        side = np.random.randint(0, 4, count)  # 0:上, 1:右, 2:下, 3:左
+        along = np.random.random(count)
+        x = np.where(side == 1, button_x + button_width + 5,
+                     np.where(side == 3, button_x - 5, button_x - 5 + along * (button_width + 10)))
+        y = np.where(side == 0, button_y - 5,
+                     np.where(side == 2, button_y + button_height + 5,
+                              button_y - 5 + along * (button_height + 10)))
+        # 沿所在的边向外飞，带一点随机偏转
+        normal = SPARKLE_NORMALS[side]
+        speed = np.random.uniform(30, 120, count)[:, None]
+        jitter = np.random.uniform(-40, 40, (count, 2))
+        
+        self.sparkles.emit(
+            position=np.stack([x, y], axis=1),
+            velocity=normal * speed + jitter,
+            size=np.random.randint(2, 5, count),
+            life=np.random.uniform(0.25, 0.6, count),  # 粒子寿命（秒）
+            color=np.random.randint(0, len(SPARKLE_COLORS), count)
+        )
         
     def is_fully_visible(self):
         return self.y <= self.target_y
@@ -136,7 +118,21 @@ class Remote:
         return (self.x <= mouse_pos[0] <= self.x + self.width and 
                 self.y <= mouse_pos[1] <= self.y + self.height)
         
-    def update(self):
+    def update(self, dt=1 / 60):
+        # 更新闪烁粒子（遥控器动画提前返回时也要更新）
+        if self.sparkle_effect:
+            self.sparkle_budget += SPARKLE_RATE * dt
+            count = int(self.sparkle_budget)
+            self.sparkle_budget -= count
+            if count:
+                self.emit_sparkles(count)
+            self.sparkle_timer += dt
+            if self.sparkle_timer >= SPARKLE_SECONDS:  # 闪烁持续1秒，已有的粒子自然消失
+                self.sparkle_effect = False
+                self.sparkle_timer = 0
+                self.sparkle_budget = 0.0
+        self.sparkles.update(dt)
+        
         if self.is_retracting:  # 如果正在退回
             if self.y < WINDOW_HEIGHT - 50:  # 如果还没退到露出50像素的位置
                 self.y += self.animation_speed
@@ -169,27 +165,8 @@ class Remote:
         else:
             screen.blit(self.image, (self.x, self.y))
             
-        # 绘制闪烁效果
-        if self.sparkle_effect:
-            # 更新粒子
-            if len(self.sparkle_particles) < 10:  # 限制最大粒子数
-                self.sparkle_particles.append(self.create_sparkle_particle())
-            
-            # 绘制和更新粒子
-            for particle in self.sparkle_particles[:]:
-                pygame.draw.circle(screen, particle['color'], 
-                                 (int(particle['x']), int(particle['y'])), 
-                                 particle['size'])
-                particle['life'] -= 1
-                if particle['life'] <= 0:
-                    self.sparkle_particles.remove(particle)
-            
-            # 更新闪烁计时器
-            self.sparkle_timer += 1
-            if self.sparkle_timer >= 60:  # 闪烁持续1秒
-                self.sparkle_effect = False
-                self.sparkle_timer = 0
-                self.sparkle_particles.clear()
+        # 绘制闪烁效果（粒子在 update 中更新）
+        self.sparkles.draw(screen)
 
 class AirConditioner:
     def __init__(self):
@@ -198,7 +175,8 @@ class AirConditioner:
         self.x = 680
         self.y = 50
         self.power = False
-        self.temperature = 26
+        self.temperature = 26  # 设定温度
+        self.room_temperature = self.temperature  # 显示的室温，由房间温度模拟每帧更新
         # 加载空调图片
         self.image_close = load_image('air_condition_close.png')
         self.image_open = load_image('air_condition_open.png')
@@ -232,7 +210,7 @@ class AirConditioner:
         # 绘制温度显示
         if self.power:
             font = pygame.font.SysFont("microsoft yahei", 24)
-            temp_text = f"{self.temperature}°C"
+            temp_text = f"{round(self.room_temperature)}°C"
             text = font.render(temp_text, True, BLACK)
             text_rect = text.get_rect(center=(self.x + self.width//2, self.y + 25))
             screen.blit(text, text_rect)
@@ -241,11 +219,23 @@ def main():
     clock = pygame.time.Clock()
     remote = Remote()
     ac = AirConditioner()
-    global current_frame, frame_timer
+    # 房间温度场，出风口在空调下方吹风的位置
+    room = RoomThermal((WINDOW_WIDTH, WINDOW_HEIGHT), THERMAL_GRID)
+    room.set_outlet((ac.x, ac.y - 10 + ac.height, ac.width, 50))
+    dt = 1 / 60
+    loader = VideoLoader(video_path, (WINDOW_WIDTH, WINDOW_HEIGHT), cache_dir,
+                         VIDEO_TILE_SIZE, VIDEO_TILE_THRESHOLD, VIDEO_INGEST_WORKERS)
+    video = None
+    fade_start = None  # 视频开始淡入的时间
+    first_frame_shown = False
     
     while True:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                if playback.dropped_frames or playback.late_frames:
+                    print(f"Video playback: {playback.dropped_frames} dropped, "
+                          f"{playback.late_frames} late frames")
+                loader.close()
                 pygame.quit()
                 sys.exit()
                 
@@ -267,9 +257,13 @@ def main():
                     ac.power = remote.power
                     remote.sparkle_effect = True  # 触发闪烁效果
                     remote.is_retracting = True  # 开始退回动画
-                    # 如果关闭空调，重置视频帧到第一帧
-                    if not remote.power:
-                        current_frame = 0
+                    # 打开空调时从头播放视频，关闭时重置视频帧到第一帧
+                    if remote.power:
+                        playback.start()
+                    else:
+                        playback.stop()
+                        if video is not None:
+                            video.rewind()
                 remote.button_pressed = False
                 
             if event.type == pygame.MOUSEMOTION:
@@ -277,23 +271,55 @@ def main():
                 mouse_pos = pygame.mouse.get_pos()
                 remote.mouse_entered = remote.is_mouse_over(mouse_pos)
         
-        # 更新视频帧（只在空调开启时更新）
-        if ac.power:
-            frame_timer += 1
-            if frame_timer >= 60 / video_fps:  # 根据视频帧率更新
-                current_frame = (current_frame + 1) % len(video_frames)
-                frame_timer = 0
+        # 视频加载完成：开始淡入，正在播放时从头播放
+        if video is None and loader.video is not None:
+            video = loader.video
+            playback.fps = video.fps
+            if playback.running:
+                playback.start()
+            fade_start = time.perf_counter()
+        
+        # 更新视频帧（只在空调开启时播放）
+        current_frame = playback.frame_index()
         
         # 更新遥控器位置
-        remote.update()
+        remote.update(dt)
+        
+        # 更新房间温度
+        room.step(dt, ac.power, ac.temperature)
+        ac.room_temperature = room.mean_temperature
         
         # 绘制
-        screen.blit(video_frames[current_frame], (0, 0))
+        fade = 1.0
+        if video is not None and fade_start is not None:
+            fade = (time.perf_counter() - fade_start) / VIDEO_FADE_SECONDS
+        if video is None or fade < 1.0:
+            screen.blit(background, (0, 0))
+        if video is not None:
+            frame = video.frame(current_frame)
+            if fade < 1.0:
+                # 视频帧可能与缓存共用，用完恢复不透明
+                frame.set_alpha(int(255 * fade))
+                screen.blit(frame, (0, 0))
+                frame.set_alpha(None)
+            else:
+                screen.blit(frame, (0, 0))
+        if HEAT_OVERLAY:
+            screen.blit(room.render_overlay(), (0, 0))
         remote.draw(screen)
         ac.draw(screen)
         pygame.display.flip()
         
-        clock.tick(60)
+        # 记录首帧和视频出现的耗时
+        if not first_frame_shown:
+            first_frame_shown = True
+            print(f"Time to first frame: {(time.perf_counter() - START_TIME) * 1000:.0f} ms")
+        if fade_start is not None and fade >= 1.0:
+            print(f"Time to video: {(time.perf_counter() - START_TIME) * 1000:.0f} ms "
+                  f"(loaded in {loader.load_seconds * 1000:.0f} ms)")
+            fade_start = None
+        
+        dt = clock.tick(60) / 1000
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,120 @@
+import os
+import subprocess
+import sys
+import cv2
+import numpy as np
+from multiprocessing import resource_tracker, shared_memory
+
+
+def _ingest_range(video_path, size, start, stop, shm_name, count):
+    """子进程：解码 [start, stop) 范围的帧，缩放后写进共享内存
+
+    Returns:
+        实际读到的帧数
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    # 只是挂接，不能让子进程的资源跟踪器在退出时删除共享内存
+    resource_tracker.unregister(shm._name, 'shared_memory')
+    frames = np.ndarray((count, size[1], size[0], 3), dtype=np.uint8, buffer=shm.buf)
+    cap = cv2.VideoCapture(video_path)
+    try:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+        frame = None
+        for i in range(start, stop):
+            ok, frame = cap.read(frame)
+            if not ok:
+                return i - start
+            cv2.resize(frame, size, dst=frames[i])
+        return stop - start
+    finally:
+        cap.release()
+        del frames
+        shm.close()
+
+
+class IngestedVideo:
+    """多进程解码整个视频到共享内存后播放
+
+    视频按帧范围平均分给多个子进程，各自跳到范围开头解码、缩放，写进
+    共享内存里各自的位置，全部完成后按顺序就是整段视频。子进程只导入
+    OpenCV 和 NumPy，不会执行游戏的初始化。每帧的 Surface 直接引用共享
+    内存。接口与 CachedVideo 相同。
+    """
+    def __init__(self, video_path, size, workers):
+        """解码整个视频，失败时抛出异常
+
+        Args:
+            video_path: 视频文件路径
+            size: 输出尺寸 (宽, 高)
+            workers: 子进程数
+        """
+        from video_stream import bgr_surface
+
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise IOError(f"Could not open video file: {video_path}")
+        self.fps = cap.get(cv2.CAP_PROP_FPS) or 30
+        count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+        if count <= 0:
+            raise IOError("No frames were read from the video")
+
+        self.size = size
+        self.dropped_frames = 0
+        frame_bytes = size[0] * size[1] * 3
+        self._shm = shared_memory.SharedMemory(create=True, size=count * frame_bytes)
+        try:
+            workers = max(1, min(workers, count))
+            ranges = [(count * i // workers, count * (i + 1) // workers) for i in range(workers)]
+            processes = [
+                subprocess.Popen(
+                    [sys.executable, os.path.abspath(__file__), video_path,
+                     str(size[0]), str(size[1]), str(start), str(stop), self._shm.name, str(count)],
+                    stdout=subprocess.PIPE, text=True)
+                for start, stop in ranges
+            ]
+            # 帧数只是估计值，只保留从头开始连续解码成功的帧
+            decoded = 0
+            complete = True
+            for process, (start, stop) in zip(processes, ranges):
+                output, _ = process.communicate()
+                read = int(output) if process.returncode == 0 and output.strip() else 0
+                if complete and start == decoded:
+                    decoded += read
+                complete = complete and read == stop - start
+            if decoded == 0:
+                raise IOError("No frames were read from the video")
+
+            self.frames = np.ndarray((decoded, size[1], size[0], 3), dtype=np.uint8,
+                                     buffer=self._shm.buf)
+            self._frames = [bgr_surface(frame, size) for frame in self.frames]
+        except Exception:
+            self._shm.close()
+            self._shm.unlink()
+            raise
+        self.first_frame = self._frames[0]
+
+    def frame(self, seq):
+        """取序号对应的帧（序号循环播放时不回绕）"""
+        return self._frames[seq % len(self._frames)]
+
+    def rewind(self):
+        """从头开始播放（按序号取帧，无需处理）"""
+
+    def close(self):
+        """释放引用共享内存的 Surface 并删除共享内存"""
+        self._frames = []
+        self.frames = None
+        self.first_frame = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # 还有 Surface 在别处被引用，交给进程退出时释放
+            pass
+        self._shm.unlink()
+
+
+if __name__ == '__main__':
+    # 子进程入口：视频路径 宽 高 开始帧 结束帧 共享内存名 总帧数
+    path, width, height, first, last, name, total = sys.argv[1:8]
+    print(_ingest_range(path, (int(width), int(height)), int(first), int(last), name, int(total)))
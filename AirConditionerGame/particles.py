@@ -0,0 +1,90 @@
+import numpy as np
+import pygame
+
+
+class ParticlePool:
+    """预分配的粒子池
+
+    粒子属性按列存放在固定容量的 NumPy 数组里（位置、速度、大小、剩余寿命、
+    颜色下标），存活的粒子始终排在前 count 个。更新时整体推进位置、扣减
+    寿命，再用布尔掩码一次性把死亡的粒子剔除并压紧；绘制时按 (颜色, 大小)
+    从查找表里整体取出预先画好的圆点（透明色 + RLE 加速，比逐个 draw.circle
+    和带透明通道的贴图都快），整批交给 Surface.blits。更新和绘制互不依赖，
+    绘制不改变任何状态。
+    """
+    def __init__(self, capacity, palette, sizes, gravity=0.0):
+        """
+        Args:
+            capacity: 最多同时存活的粒子数，超出时新粒子被丢弃
+            palette: 颜色列表，粒子用下标引用
+            sizes: 可能的粒子半径（整数像素）
+            gravity: 竖直方向加速度（像素/秒²）
+        """
+        self.capacity = capacity
+        self.gravity = gravity
+        self.count = 0
+        self.position = np.zeros((capacity, 2), dtype=np.float32)
+        self.velocity = np.zeros((capacity, 2), dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.uint8)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros(capacity, dtype=np.uint8)
+
+        # 预先画好的圆点查找表：下标为 颜色下标 * 步长 + 半径，绘制时左上角偏移半径
+        colorkey = (255, 0, 255) if (0, 0, 0) in [tuple(c) for c in palette] else (0, 0, 0)
+        self._stride = max(sizes) + 1
+        self._sprites = np.empty(len(palette) * self._stride, dtype=object)
+        for index, color in enumerate(palette):
+            for radius in sizes:
+                sprite = pygame.Surface((radius * 2 + 1, radius * 2 + 1))
+                sprite.fill(colorkey)
+                pygame.draw.circle(sprite, color, (radius, radius), radius)
+                sprite.set_colorkey(colorkey, pygame.RLEACCEL)
+                if pygame.display.get_surface() is not None:
+                    sprite = sprite.convert()
+                self._sprites[index * self._stride + radius] = sprite
+
+    def emit(self, position, velocity, size, life, color):
+        """批量加入粒子（参数都是长度相同的数组），返回实际加入的数量"""
+        n = min(len(life), self.capacity - self.count)
+        end = self.count + n
+        self.position[self.count:end] = position[:n]
+        self.velocity[self.count:end] = velocity[:n]
+        self.size[self.count:end] = size[:n]
+        self.life[self.count:end] = life[:n]
+        self.color[self.count:end] = color[:n]
+        self.count = end
+        return n
+
+    def update(self, dt):
+        """推进 dt 秒：移动、扣减寿命并剔除寿命耗尽的粒子"""
+        n = self.count
+        if n == 0:
+            return
+        velocity = self.velocity[:n]
+        if self.gravity:
+            velocity[:, 1] += self.gravity * dt
+        self.position[:n] += velocity * dt
+        life = self.life[:n]
+        life -= dt
+        alive = life > 0
+        alive_count = int(np.count_nonzero(alive))
+        if alive_count == n:
+            return
+        # 存活的粒子压紧到前面（保持原来的顺序）
+        for array in (self.position, self.velocity, self.size, self.life, self.color):
+            array[:alive_count] = array[:n][alive]
+        self.count = alive_count
+
+    def clear(self):
+        """清空所有粒子"""
+        self.count = 0
+
+    def draw(self, screen):
+        """把所有存活的粒子批量贴到屏幕上"""
+        n = self.count
+        if n == 0:
+            return
+        sizes = self.size[:n]
+        sprites = self._sprites[self.color[:n].astype(np.intp) * self._stride + sizes].tolist()
+        corners = (self.position[:n] - sizes[:, None]).astype(np.int32).tolist()
+        screen.blits(zip(sprites, corners), doreturn=False)
@@ -0,0 +1,57 @@
+import time
+
+
+class PlaybackClock:
+    """按真实时间计算视频应显示的帧
+
+    开始播放时记下单调时钟，之后每次取帧按经过的时间换算成序号（第 n 帧的
+    显示时间为 n / 帧率），与游戏循环的帧率和卡顿无关。循环落后时直接跳到
+    当前时间对应的帧，跳过的帧记入丢帧数；显示时已晚于显示时间半帧以上的帧
+    记入迟到数。
+    """
+    def __init__(self, fps, time_func=time.monotonic):
+        """初始化播放时钟（暂停状态）
+
+        Args:
+            fps: 视频帧率
+            time_func: 返回秒数的单调时钟
+        """
+        self.fps = fps
+        self._time = time_func
+        self._start_time = None  # 第 0 帧的显示时间，None 表示暂停
+        self._last_seq = 0  # 上一次显示的帧序号
+        self.dropped_frames = 0  # 循环落后而跳过的帧数
+        self.late_frames = 0  # 晚于显示时间半帧以上才显示的帧数
+
+    @property
+    def running(self):
+        """是否正在播放"""
+        return self._start_time is not None
+
+    def start(self):
+        """从第 0 帧开始播放"""
+        self._start_time = self._time()
+        self._last_seq = 0
+
+    def stop(self):
+        """停止播放，停在第 0 帧"""
+        self._start_time = None
+        self._last_seq = 0
+
+    def frame_index(self):
+        """当前时间应显示的帧序号（从 0 开始递增，循环播放时不回绕）"""
+        if self._start_time is None:
+            return 0
+        elapsed = (self._time() - self._start_time) * self.fps
+        seq = int(elapsed)
+        if seq > self._last_seq:
+            self.dropped_frames += seq - self._last_seq - 1
+            if elapsed - seq > 0.5:
+                self.late_frames += 1
+            self._last_seq = seq
+        return self._last_seq
+
+    def reset_stats(self):
+        """重置丢帧和迟到计数"""
+        self.dropped_frames = 0
+        self.late_frames = 0
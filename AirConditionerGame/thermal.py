@@ -0,0 +1,119 @@
+import math
+import numpy as np
+import pygame
+
+# 温度叠加层的颜色：最冷时为蓝色，接近室外温度时为红色
+COLD_COLOR = np.array([40, 120, 255], dtype=np.float32)
+HOT_COLOR = np.array([255, 90, 30], dtype=np.float32)
+
+
+class RoomThermal:
+    """客厅温度场
+
+    把窗口分成均匀的网格，每格一个温度，每帧用 NumPy 整体推进一步：
+    热量按扩散方程在相邻格之间传导（边界不导热），整个房间缓慢向室外温度
+    回升（墙壁和窗户漏热），空调开启时出风口所在的格子被冷风拉向出风温度。
+    扩散系数按窗口像素给出，换网格分辨率不改变降温的快慢。
+
+    温度叠加层先在网格尺寸的小 Surface 上按温度上色（越冷越蓝、越热越红，
+    越冷越不透明），再平滑放大到窗口尺寸，两个 Surface 都只分配一次。
+    """
+    def __init__(self, size, grid=(64, 36), outdoor=32.0, diffusion=3000.0,
+                 leak=0.01, cooling=1.5, overlay_alpha=120):
+        """
+        Args:
+            size: 窗口尺寸 (宽, 高)
+            grid: 网格分辨率 (列数, 行数)
+            outdoor: 室外温度，房间初始温度
+            diffusion: 扩散系数（像素²/秒）
+            leak: 每秒向室外温度回升的比例
+            cooling: 出风口每秒向出风温度靠近的比例
+            overlay_alpha: 最冷处叠加层的不透明度（室外温度处为一半）
+        """
+        self.size = size
+        self.columns, self.rows = grid
+        self.outdoor = outdoor
+        self.leak = leak
+        self.cooling = cooling
+        self.overlay_alpha = overlay_alpha
+        cell_width = size[0] / self.columns
+        cell_height = size[1] / self.rows
+        # 换算成网格单位（格²/秒），两个方向格子尺寸不同时取较小的一边
+        self._diffusion = diffusion / min(cell_width, cell_height) ** 2
+
+        self.temperature = np.full((self.rows, self.columns), outdoor, dtype=np.float32)
+        self._laplacian = np.empty_like(self.temperature)
+        self._outlet = None  # 出风口覆盖的 (行切片, 列切片)
+
+        # 叠加层：网格尺寸的上色结果，放大后贴到窗口上
+        self._small = pygame.Surface(grid, pygame.SRCALPHA)
+        self.overlay = pygame.Surface(size, pygame.SRCALPHA)
+        self._color_range = (outdoor - 12.0, outdoor)  # 上色的温度范围
+
+    def set_outlet(self, rect):
+        """设置出风口区域
+
+        Args:
+            rect: 出风口在窗口中的矩形 (x, y, 宽, 高)
+        """
+        x, y, width, height = rect
+        scale_x = self.columns / self.size[0]
+        scale_y = self.rows / self.size[1]
+        left = max(0, int(x * scale_x))
+        top = max(0, int(y * scale_y))
+        right = min(self.columns, max(left + 1, math.ceil((x + width) * scale_x)))
+        bottom = min(self.rows, max(top + 1, math.ceil((y + height) * scale_y)))
+        self._outlet = (slice(top, bottom), slice(left, right))
+
+    @property
+    def mean_temperature(self):
+        """房间平均温度"""
+        return float(self.temperature.mean())
+
+    def step(self, dt, power, setpoint):
+        """推进一步
+
+        Args:
+            dt: 经过的时间（秒）
+            power: 空调是否开启
+            setpoint: 空调设定温度
+        """
+        temperature = self.temperature
+        laplacian = self._laplacian
+        # 显式格式每一小步的扩散量不能超过 0.25，否则数值不稳定
+        substeps = max(1, math.ceil(self._diffusion * dt / 0.2))
+        rate = self._diffusion * dt / substeps
+        for _ in range(substeps):
+            # 五点拉普拉斯，边界格子缺的邻居按自身温度算（边界不导热）
+            np.multiply(temperature, -4.0, out=laplacian)
+            laplacian[1:] += temperature[:-1]
+            laplacian[0] += temperature[0]
+            laplacian[:-1] += temperature[1:]
+            laplacian[-1] += temperature[-1]
+            laplacian[:, 1:] += temperature[:, :-1]
+            laplacian[:, 0] += temperature[:, 0]
+            laplacian[:, :-1] += temperature[:, 1:]
+            laplacian[:, -1] += temperature[:, -1]
+            laplacian *= rate
+            temperature += laplacian
+
+        temperature += (self.outdoor - temperature) * min(1.0, self.leak * dt)
+        if power and self._outlet is not None:
+            # 出风温度比设定温度低几度，房间才能降到设定温度附近
+            outlet = temperature[self._outlet]
+            outlet += (setpoint - 6.0 - outlet) * min(1.0, self.cooling * dt)
+
+    def render_overlay(self):
+        """按当前温度更新叠加层并返回（窗口尺寸，带透明度）"""
+        low, high = self._color_range
+        # 温度映射到 0（最冷）到 1（室外温度），网格是 (行, 列)，Surface 数组是 (x, y)
+        heat = np.clip((self.temperature.T - low) / (high - low), 0.0, 1.0)
+        rgb = COLD_COLOR + (HOT_COLOR - COLD_COLOR) * heat[..., None]
+        pixels = pygame.surfarray.pixels3d(self._small)
+        pixels[...] = rgb
+        del pixels
+        alpha = pygame.surfarray.pixels_alpha(self._small)
+        alpha[...] = (1.0 - 0.5 * heat) * self.overlay_alpha
+        del alpha
+        pygame.transform.smoothscale(self._small, self.size, self.overlay)
+        return self.overlay
@@ -0,0 +1,82 @@
+import threading
+import time
+
+
+class VideoLoader:
+    """后台线程加载视频背景
+
+    在后台线程里导入 OpenCV（导入本身要一百多毫秒）并打开视频：优先映射已
+    解码的帧缓存，没有缓存时边播放边解码，同时在后台生成缓存供下次启动
+    使用。窗口先显示静态背景，加载完成后再切换到视频。
+
+    没有缓存且可以用多个进程时，先用多个子进程把整段视频解码到共享内存
+    （IngestedVideo）直接播放，再从共享内存生成缓存，不再重复解码。
+
+    指定分块边长时缓存分块差分（DeltaVideo），否则缓存完整帧（CachedVideo）。
+    """
+    def __init__(self, video_path, size, cache_dir, tile_size=0, threshold=0, workers=1):
+        """启动加载线程
+
+        Args:
+            video_path: 视频文件路径
+            size: 输出尺寸 (宽, 高)
+            cache_dir: 帧缓存目录
+            tile_size: 差分分块边长，0 表示缓存完整帧
+            threshold: 差分阈值（块内像素相差超过该值才更新）
+            workers: 没有缓存时并行解码的进程数，1 表示边播放边解码
+        """
+        self.video_path = video_path
+        self.size = size
+        self.cache_dir = cache_dir
+        self.tile_size = tile_size
+        self.threshold = threshold
+        self.workers = workers
+        self.video = None  # 加载成功后为 CachedVideo、DeltaVideo、IngestedVideo 或 VideoStream
+        self.cache_builder = None
+        self.ready = False  # 加载是否已结束（成功或失败）
+        self.load_seconds = 0.0  # 加载耗时
+        self._thread = threading.Thread(target=self._run, name='VideoLoader', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """导入 OpenCV 并打开视频"""
+        start = time.perf_counter()
+        try:
+            # 用到 cv2 的模块只在这里导入
+            from delta_video import DeltaVideo
+            from frame_cache import CachedVideo, FrameCacheBuilder, frame_cache_path
+            from video_stream import VideoStream
+
+            cache_path = frame_cache_path(self.video_path, self.size, self.cache_dir,
+                                          self.tile_size, self.threshold)
+            try:
+                if self.tile_size:
+                    self.video = DeltaVideo(cache_path, self.size)
+                    print(f"Delta video: {self.video.change_ratio:.1%} of tiles change per frame")
+                else:
+                    self.video = CachedVideo(cache_path)
+            except (OSError, ValueError):
+                if self.workers > 1:
+                    from parallel_ingest import IngestedVideo
+                    self.video = IngestedVideo(self.video_path, self.size, self.workers)
+                    frames = self.video.frames
+                else:
+                    self.video = VideoStream(self.video_path, self.size)
+                    frames = None
+                self.cache_builder = FrameCacheBuilder(self.video_path, self.size, cache_path,
+                                                       self.tile_size, self.threshold, frames)
+        except Exception as e:
+            # 如果视频加载失败，继续使用静态背景
+            print(f"Error loading video: {str(e)}")
+            print("Using static background image instead of video")
+        finally:
+            self.load_seconds = time.perf_counter() - start
+            self.ready = True
+
+    def close(self):
+        """等待加载结束，停止生成缓存并释放视频"""
+        self._thread.join()
+        if self.cache_builder is not None:
+            self.cache_builder.close()
+        if self.video is not None:
+            self.video.close()
@@ -0,0 +1,197 @@
+import threading
+import cv2
+import numpy as np
+import pygame
+
+
+def bgr_surface(bgr, size):
+    """把 BGR 数组包装成 Surface（共用数组内存，不复制）
+
+    Args:
+        bgr: 形状为 (高, 宽, 3) 的连续 BGR 数组，Surface 使用期间不能改写
+        size: 尺寸 (宽, 高)
+    """
+    return pygame.image.frombuffer(bgr, size, 'BGR')
+
+
+class VideoStream:
+    """边播放边解码的视频背景
+
+    后台线程按顺序解码视频帧，放进固定容量的环形缓冲区（只领先播放几秒），
+    播放到末尾时跳回开头循环。内存占用只取决于缓冲秒数和窗口尺寸，与视频
+    长度无关。
+
+    帧按序号取用：序号从 0 开始一直递增，循环播放时不回绕；第 0 帧在创建时
+    同步解码并常驻，空调关闭时停在第 0 帧。解码跟不上播放时跳过落后的帧
+    （只读取不转换），记入丢帧数。
+
+    每帧只做一次缩放，直接写进槽位里复用的 BGR 数组，Surface 直接引用这个
+    数组（不转换颜色、不交换坐标轴、不复制）。槽位要等播放越过它之后才会
+    被改写，正在显示的帧不会被覆盖。
+    """
+    def __init__(self, video_path, size, buffer_seconds=2.0):
+        """打开视频并解码第一帧
+
+        Args:
+            video_path: 视频文件路径
+            size: 输出尺寸 (宽, 高)
+            buffer_seconds: 解码领先播放的最多秒数
+        """
+        self.size = size
+        self._cap = cv2.VideoCapture(video_path)
+        if not self._cap.isOpened():
+            raise IOError(f"Could not open video file: {video_path}")
+        self.fps = self._cap.get(cv2.CAP_PROP_FPS) or 30
+
+        # 第 0 帧常驻（单独的数组），空调关闭和视频重新开始时显示
+        ok, self._decoded = self._cap.read()
+        if not ok:
+            self._cap.release()
+            raise IOError("No frames were read from the video")
+        self._first_bgr = self._resize(self._decoded, None)
+        self.first_frame = bgr_surface(self._first_bgr, size)
+
+        # 环形缓冲区：槽位 seq % 容量 存放帧序号和 BGR 数组，数组第一次用到时
+        # 分配，之后一直复用
+        self._capacity = max(2, int(self.fps * buffer_seconds))
+        self._slot_seqs = [-1] * self._capacity
+        self._slot_frames = [None] * self._capacity
+        self._cond = threading.Condition()
+        self._write_seq = 1  # 下一个要解码的序号
+        self._read_seq = 0  # 播放仍可能用到的最早序号
+        self._wanted_seq = 0  # 播放最近请求的序号
+        self._generation = 0  # 每次跳回开头加一，丢弃跳转前解码的帧
+        self._stopped = False
+        self.dropped_frames = 0  # 解码落后而跳过的帧数
+
+        # 当前显示的帧（只在播放线程转换为 Surface）
+        self._surface_seq = 0
+        self._surface = self.first_frame
+
+        self._thread = threading.Thread(target=self._run, name='VideoStream', daemon=True)
+        self._thread.start()
+
+    def _resize(self, frame, out):
+        """缩放到窗口尺寸，写进 out（为 None 时新分配）"""
+        if out is None:
+            out = np.empty((self.size[1], self.size[0], 3), dtype=np.uint8)
+        return cv2.resize(frame, self.size, dst=out)
+
+    def frame(self, seq):
+        """取序号对应的帧，还没解码到时返回已解码的最新一帧
+
+        Args:
+            seq: 帧序号（从 0 开始递增，循环播放时不回绕）
+        """
+        if seq == self._surface_seq:
+            return self._surface
+        if seq == 0:
+            self._surface_seq, self._surface = 0, self.first_frame
+            return self._surface
+
+        with self._cond:
+            self._wanted_seq = max(self._wanted_seq, seq)
+            # 找不晚于 seq 的最新一帧，更早的帧不再需要
+            found = None
+            newest = min(seq, self._write_seq - 1)
+            for s in range(newest, max(self._read_seq, newest - self._capacity + 1) - 1, -1):
+                if self._slot_seqs[s % self._capacity] == s:
+                    found = s
+                    break
+            if found is not None:
+                self._read_seq = found
+                bgr = self._slot_frames[found % self._capacity]
+            self._cond.notify_all()
+
+        if found is not None and found != self._surface_seq:
+            self._surface_seq, self._surface = found, bgr_surface(bgr, self.size)
+        return self._surface
+
+    def rewind(self):
+        """从头开始播放（下一次请求序号 1 时从视频第二帧继续）"""
+        with self._cond:
+            self._generation += 1
+            self._slot_seqs = [-1] * self._capacity
+            self._write_seq = 1
+            self._read_seq = 0
+            self._wanted_seq = 0
+            self._cond.notify_all()
+        self._surface_seq, self._surface = 0, self.first_frame
+
+    @property
+    def buffered_frames(self):
+        """缓冲区中已解码、尚未播放的帧数"""
+        with self._cond:
+            return self._write_seq - 1 - self._read_seq
+
+    @property
+    def buffer_bytes(self):
+        """缓冲区的槽位全部分配后的内存占用（字节）"""
+        return self._capacity * self.size[0] * self.size[1] * 3
+
+    def close(self):
+        """停止解码线程并释放视频"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._thread.join()
+        self._cap.release()
+
+    def _read(self, decode):
+        """读取下一帧，到末尾时跳回开头
+
+        Args:
+            decode: 是否解码出图像（跳帧时只读取）
+
+        Returns:
+            解码的 BGR 数组（每次复用同一个），跳帧时为 True，视频无法继续读取时为 None
+        """
+        for _ in range(2):
+            if decode:
+                ok, frame = self._cap.read(self._decoded)
+            else:
+                ok, frame = self._cap.grab(), True
+            if ok:
+                return frame
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        return None
+
+    def _run(self):
+        """解码线程：缓冲区未满时解码下一帧"""
+        generation = 0
+        while True:
+            with self._cond:
+                while not self._stopped and \
+                        self._write_seq - self._read_seq >= self._capacity:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                rewound = generation != self._generation
+                generation = self._generation
+                seq = self._write_seq
+                skip = seq < self._wanted_seq
+                slot = seq % self._capacity
+                out = self._slot_frames[slot]
+
+            if rewound:
+                # 跳回开头：第 0 帧已常驻，从第二帧开始解码
+                self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                self._cap.grab()
+
+            # 解码落后于播放：只读取不转换，直接跳到播放需要的帧
+            frame = self._read(decode=not skip)
+            if frame is None:
+                return
+            # 槽位在播放越过它之前不会被重新写入，缩放时不用持锁
+            bgr = None if skip else self._resize(frame, out)
+
+            with self._cond:
+                if generation != self._generation:
+                    continue
+                if skip:
+                    self.dropped_frames += 1
+                else:
+                    self._slot_seqs[slot] = seq
+                    self._slot_frames[slot] = bgr
+                self._write_seq = seq + 1
+                self._cond.notify_all()
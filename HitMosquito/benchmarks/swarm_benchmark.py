@@ -0,0 +1,142 @@
+"""蚊群基准测试（无界面运行）
+
+对比原来的写法（每只蚊子一个 Mosquito 对象，逐个 update、逐个 blit，点击时
+逐个 check_hit）和 MosquitoSwarm（按列存放、整体更新、批量贴图、网格点击
+检测）在不同蚊子数下每帧的更新、绘制耗时和点击检测的耗时。两种写法用同一组
+蚊子图片（与游戏蚊群模式一样缩小、转换成屏幕格式并开启 RLE 加速）。每帧
+点击一次；蚊群每隔若干帧在更新中重建网格，这部分计入更新耗时。
+
+用法（在仓库根目录下）:
+    python HitMosquito/benchmarks/swarm_benchmark.py
+    python HitMosquito/benchmarks/swarm_benchmark.py --counts 1000,10000 --frames 300
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from src.mosquito import Mosquito
+from src.swarm import MosquitoSwarm
+from src.utils import load_image
+
+WINDOW_SIZE = (1024, 768)
+MOSQUITO_SIZE = 40  # 与 Game 中蚊群模式的蚊子边长一致
+HIT_MARGIN = 5
+ASSETS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets', 'images')
+
+
+@dataclass
+class SwarmResult:
+    """单个蚊子数下一种写法的测试结果"""
+    method: str  # 写法
+    mosquitos: int  # 蚊子数
+    update_ms: float  # 每帧更新耗时（毫秒）
+    draw_ms: float  # 每帧绘制耗时（毫秒）
+    click_us: float  # 每次点击检测耗时（微秒，只检测，不打死蚊子）
+    frame_ms: float  # 更新加绘制
+
+
+def make_images():
+    """与游戏蚊群模式相同尺寸、相同格式的两张蚊子图片"""
+    images = []
+    for name in ('mosquito.png', 'mosquito_close.png'):
+        image = load_image(os.path.join(ASSETS, name), (MOSQUITO_SIZE, MOSQUITO_SIZE)).convert_alpha()
+        image.set_alpha(255, pygame.RLEACCEL)
+        images.append(image)
+    return images
+
+
+def random_clicks(frames):
+    """每帧一次随机点击"""
+    return [(random.uniform(0, WINDOW_SIZE[0]), random.uniform(0, WINDOW_SIZE[1])) for _ in range(frames)]
+
+
+def run_objects(count, frames, screen, images, clicks):
+    """原来的写法：Mosquito 对象列表"""
+    mosquitos = []
+    for _ in range(count):
+        mosquito = Mosquito(random.randint(0, WINDOW_SIZE[0] - MOSQUITO_SIZE),
+                            random.randint(0, WINDOW_SIZE[1] - MOSQUITO_SIZE))
+        mosquito.width = mosquito.height = MOSQUITO_SIZE
+        mosquitos.append(mosquito)
+    image_open, image_close = images
+    update = draw = click = 0.0
+    for frame in range(frames):
+        start = time.perf_counter()
+        for mosquito in mosquitos[:]:
+            mosquito.update(*WINDOW_SIZE)
+            if not mosquito.alive:
+                mosquitos.remove(mosquito)
+        middle = time.perf_counter()
+        for mosquito in mosquitos:
+            screen.blit(image_open if mosquito.is_open else image_close, (mosquito.x, mosquito.y))
+        end = time.perf_counter()
+        for mosquito in mosquitos:
+            if mosquito.check_hit(clicks[frame]):
+                break
+        update += middle - start
+        draw += end - middle
+        click += time.perf_counter() - end
+    return SwarmResult('objects', count, update * 1000 / frames, draw * 1000 / frames,
+                       click * 1e6 / frames, (update + draw) * 1000 / frames)
+
+
+def run_swarm(count, frames, screen, images, clicks):
+    """MosquitoSwarm：整体更新，批量贴图，网格点击检测"""
+    swarm = MosquitoSwarm(count, *WINDOW_SIZE, size=MOSQUITO_SIZE, hit_margin=HIT_MARGIN)
+    swarm.spawn(count)
+    image_open, image_close = images
+    update = draw = click = 0.0
+    for frame in range(frames):
+        start = time.perf_counter()
+        swarm.update()
+        middle = time.perf_counter()
+        swarm.draw(screen, image_open, image_close)
+        end = time.perf_counter()
+        swarm.hit_test(clicks[frame])
+        update += middle - start
+        draw += end - middle
+        click += time.perf_counter() - end
+    return SwarmResult('swarm', count, update * 1000 / frames, draw * 1000 / frames,
+                       click * 1e6 / frames, (update + draw) * 1000 / frames)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='蚊群基准测试')
+    parser.add_argument('--counts', default='2,100,1000,5000,10000', help='逗号分隔的蚊子数')
+    parser.add_argument('--frames', type=int, default=120, help='每种情况的帧数')
+    parser.add_argument('--json', help='将结果写入 JSON 文件')
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    screen = pygame.display.set_mode(WINDOW_SIZE)
+    images = make_images()
+    results = []
+    for count in (int(c) for c in args.counts.split(',') if c.strip()):
+        clicks = random_clicks(args.frames)
+        results.append(run_objects(count, args.frames, screen, images, clicks))
+        results.append(run_swarm(count, args.frames, screen, images, clicks))
+
+    print(f"窗口 {WINDOW_SIZE[0]}x{WINDOW_SIZE[1]}, 蚊子 {MOSQUITO_SIZE}x{MOSQUITO_SIZE}, "
+          f"每种情况 {args.frames} 帧，每帧一次点击检测")
+    for r in results:
+        print(f"[{r.method} {r.mosquitos}] 更新 {r.update_ms:.3f} ms | 绘制 {r.draw_ms:.3f} ms | "
+              f"点击 {r.click_us:.1f} us | 合计 {r.frame_ms:.3f} ms")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'config': vars(args), 'results': [asdict(r) for r in results]},
+                      f, ensure_ascii=False, indent=2)
+    pygame.quit()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
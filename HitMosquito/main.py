@@ -1,13 +1,18 @@
+import argparse
 import pygame
 import sys
 from src.game import Game
 
 def main():
+    parser = argparse.ArgumentParser(description="拍蚊子游戏")
+    parser.add_argument("--swarm", type=int, default=0, help="蚊群模式：屏幕上保持的蚊子数量")
+    args = parser.parse_args()
+    
     # 初始化pygame
     pygame.init()
     
     # 创建游戏实例
-    game = Game()
+    game = Game(swarm_size=args.swarm)
     
     # 运行游戏主循环
     game.run()
@@ -2,10 +2,18 @@ import pygame
 import sys
 from src.mosquito import Mosquito
 from src.player import Player
+from src.swarm import MosquitoSwarm
 from src.utils import load_image, load_sound, random_position
 
+SWARM_MOSQUITO_SIZE = 40  # 蚊群模式下蚊子的边长（图片和击中范围）
+SWARM_HIT_MARGIN = 5  # 蚊群模式下击中范围的边距
+
 class Game:
-    def __init__(self):
+    def __init__(self, swarm_size=0):
+        """
+        Args:
+            swarm_size: 大于 0 时进入蚊群模式，屏幕上保持这么多只蚊子
+        """
         # 设置窗口
         self.width = 1024
         self.height = 768
@@ -19,6 +27,7 @@ class Game:
         # 游戏状态
         self.running = True
         self.game_over = False
+        self.swarm_size = swarm_size
         
         # 加载资源
         self.load_resources()
@@ -26,7 +35,13 @@ class Game:
         # 初始化游戏对象
         self.player = Player()
         self.mosquitos = []
-        self.spawn_mosquito()
+        self.swarm = None
+        if swarm_size > 0:
+            self.swarm = MosquitoSwarm(swarm_size, self.width, self.height,
+                                       size=SWARM_MOSQUITO_SIZE, hit_margin=SWARM_HIT_MARGIN)
+            self.swarm.spawn(swarm_size)
+        else:
+            self.spawn_mosquito()
         
     def load_resources(self):
         """加载游戏资源"""
@@ -35,6 +50,8 @@ class Game:
         self.mosquito_img = load_image("HitMosquito/assets/images/mosquito.png", (120, 120))
         self.mosquito_close_img = load_image("HitMosquito/assets/images/mosquito_close.png", (120, 120))  # 加载第二张蚊子图片
         self.hand_cursor = load_image("HitMosquito/assets/images/hand.png", (150, 150))
+        if self.swarm_size > 0:
+            self.load_swarm_images()
         
         # 加载音效
         self.hit_sound = load_sound("HitMosquito/assets/sounds/hit.mp3")
@@ -44,6 +61,24 @@ class Game:
         # 设置自定义光标
         if self.hand_cursor:
             pygame.mouse.set_visible(False)
+            
+        # 字体只创建一次
+        self.font = pygame.font.SysFont("microsoftyahei", 36)
+        
+    def load_swarm_images(self):
+        """加载蚊群模式的小尺寸蚊子图片（转换成屏幕格式并开启 RLE 加速，大量贴图更快）"""
+        size = (SWARM_MOSQUITO_SIZE, SWARM_MOSQUITO_SIZE)
+        images = []
+        for path in ("HitMosquito/assets/images/mosquito.png", "HitMosquito/assets/images/mosquito_close.png"):
+            image = load_image(path, size)
+            if image is None:
+                # 图片缺失时用黑色方块代替
+                image = pygame.Surface(size)
+                image.fill((0, 0, 0))
+            image = image.convert_alpha()
+            image.set_alpha(255, pygame.RLEACCEL)
+            images.append(image)
+        self.swarm_open_img, self.swarm_close_img = images
         
     def spawn_mosquito(self):
         """生成新的蚊子"""
@@ -61,6 +96,16 @@ class Game:
     def handle_click(self, pos):
         """处理点击事件"""
         hit = False
+        if self.swarm is not None:
+            # 蚊群模式用网格只检查点击位置附近的蚊子
+            index = self.swarm.hit_test(pos)
+            if index is not None:
+                self.swarm.kill(index)
+                self.player.add_score()
+                if self.hit_sound:
+                    self.hit_sound.play()
+                hit = True
+                
         for mosquito in self.mosquitos:
             if mosquito.check_hit(pos):
                 mosquito.alive = False
@@ -85,6 +130,12 @@ class Game:
         if self.game_over:
             return
             
+        if self.swarm is not None:
+            # 整群移动，补齐被打死的蚊子
+            self.swarm.update()
+            self.swarm.spawn(self.swarm_size - self.swarm.count)
+            return
+            
         # 更新蚊子
         for mosquito in self.mosquitos[:]:
             mosquito.update(self.width, self.height)
@@ -104,6 +155,9 @@ class Game:
             self.screen.fill((255, 255, 255))
             
         # 绘制蚊子
+        if self.swarm is not None:
+            self.swarm.draw(self.screen, self.swarm_open_img, self.swarm_close_img)
+            
         for mosquito in self.mosquitos:
             if self.mosquito_img and self.mosquito_close_img:
                 # 根据蚊子的动画状态选择图片
@@ -113,7 +167,7 @@ class Game:
                 mosquito.draw(self.screen)
                 
         # 绘制分数
-        font = pygame.font.SysFont("microsoftyahei", 36)
+        font = self.font
         
         score_text = font.render(f"分数: {self.player.get_score()}", True, (0, 0, 0))
         misses_text = font.render(f"未击中: {self.player.get_misses()}", True, (0, 0, 0))
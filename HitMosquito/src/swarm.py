@@ -0,0 +1,174 @@
+import time
+import numpy as np
+
+
+class MosquitoSwarm:
+    """用 NumPy 数组表示的一大群蚊子
+
+    每只蚊子的位置、方向和翅膀相位按列存放，存活的蚊子排在前 count 个，
+    每帧整体移动和反弹；翅膀状态由当前时间和各自的相位算出，整群只取一次
+    时间。被击中的蚊子用最后一只填补空位。
+
+    点击检测用均匀网格：格子边长不小于击中范围，按击中范围左上角所在的
+    格子对蚊子排序，记下每个格子在排序结果中的起止位置。一个点只可能落在
+    左上角位于同一格或左、上、左上相邻格的蚊子的击中范围内。
+
+    网格不随每帧移动重建：每只蚊子每帧每个方向最多移动 speed 像素，查询时
+    按建网格以来的累计移动量把查找范围向四周放宽，累计移动量超过半格时才在
+    update 中重建（默认速度和尺寸下约 25 帧一次），查找范围最多 3x3 格。被
+    击中的蚊子只改写网格条目到蚊子下标的映射，不重建；加入蚊子时重建。点击
+    检测因此不排序，耗时只和附近格子里的蚊子数有关，重建的 O(n) 开销分摊到
+    帧更新里。
+    """
+    def __init__(self, capacity, screen_width, screen_height, size=60, hit_margin=10,
+                 speed=1, animation_interval=0.2):
+        """
+        Args:
+            capacity: 最多同时存在的蚊子数
+            screen_width: 屏幕宽度
+            screen_height: 屏幕高度
+            size: 蚊子边长（击中范围不含边距）
+            hit_margin: 击中范围向外扩展的边距，使击中更容易
+            speed: 每帧移动的像素数
+            animation_interval: 翅膀切换间隔（秒）
+        """
+        self.capacity = capacity
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.size = size
+        self.hit_margin = hit_margin
+        self.speed = speed
+        self.animation_interval = animation_interval
+        self.count = 0
+        self.position = np.zeros((capacity, 2), dtype=np.float32)
+        self.direction = np.zeros((capacity, 2), dtype=np.float32)
+        self.phase = np.zeros(capacity, dtype=np.float32)  # 翅膀相位（秒）
+        self.is_open = np.ones(capacity, dtype=bool)  # 翅膀状态
+
+        # 均匀网格
+        self.cell_size = size + 2 * hit_margin
+        self._columns = int(screen_width // self.cell_size) + 2
+        self._rows = int(screen_height // self.cell_size) + 2
+        self._order = np.zeros(0, dtype=np.intp)  # 按格子排序后的蚊子下标
+        self._cell_start = np.zeros(self._columns * self._rows + 1, dtype=np.intp)
+        # 格子编号放得下时用 16 位整数，稳定排序走基数排序，比默认整数类型快一个数量级
+        self._cell_dtype = np.int16 if self._columns * self._rows <= np.iinfo(np.int16).max else np.int32
+        # 网格条目（建网格时的蚊子下标）和当前蚊子下标的相互映射，-1 表示已被打死
+        self._entry_index = np.zeros(capacity, dtype=np.intp)
+        self._index_entry = np.zeros(capacity, dtype=np.intp)
+        self._drift = 0  # 建网格以来每个方向的最大累计移动量（像素）
+        self._max_drift = self.cell_size // 2  # 超过时重建网格
+
+    def spawn(self, count):
+        """在随机位置加入蚊子，返回实际加入的数量"""
+        count = min(count, self.capacity - self.count)
+        start, end = self.count, self.count + count
+        self.position[start:end, 0] = np.random.randint(0, self.screen_width - self.size + 1, count)
+        self.position[start:end, 1] = np.random.randint(0, self.screen_height - self.size + 1, count)
+        self.direction[start:end] = np.random.choice([-1.0, 1.0], (count, 2))
+        self.phase[start:end] = np.random.uniform(0, 2 * self.animation_interval, count)
+        self.count = end
+        if count > 0:
+            self._rebuild_grid()
+        return count
+
+    def update(self):
+        """整体移动、碰到边界反弹并更新翅膀状态"""
+        n = self.count
+        position = self.position[:n]
+        direction = self.direction[:n]
+        position += direction * self.speed
+
+        # 边界检查
+        limit = (self.screen_width - self.size, self.screen_height - self.size)
+        for axis in (0, 1):
+            bounce = (position[:, axis] <= 0) | (position[:, axis] >= limit[axis])
+            direction[bounce, axis] *= -1
+
+        # 翅膀每隔一个动画间隔切换一次；当前时间先对一个周期取余，
+        # 避免和 float32 的相位相加时丢失精度
+        now = time.perf_counter() % (2 * self.animation_interval)
+        ticks = ((self.phase[:n] + now) / self.animation_interval).astype(np.int32)
+        np.equal(ticks & 1, 0, out=self.is_open[:n])
+
+        self._drift += self.speed
+        if self._drift > self._max_drift:
+            self._rebuild_grid()
+
+    def kill(self, index):
+        """移除一只蚊子（用最后一只填补空位）"""
+        last = self.count - 1
+        for array in (self.position, self.direction, self.phase, self.is_open):
+            array[index] = array[last]
+        self.count = last
+        # 网格中被打死的条目作废，最后一只的条目改指向新位置
+        # （打死的就是最后一只时两个条目相同，作废要在后面）
+        dead, moved = self._index_entry[index], self._index_entry[last]
+        self._entry_index[moved] = index
+        self._entry_index[dead] = -1
+        self._index_entry[index] = moved
+
+    def _rebuild_grid(self):
+        """按击中范围左上角所在的格子对蚊子排序"""
+        n = self.count
+        # 网格向左上多留一格，容纳边距超出屏幕的部分；浮点数的 // 很慢，
+        # 平移成正数后用除法加截断代替
+        corner = (self.position[:n] + (self.cell_size - self.hit_margin)) / self.cell_size
+        corner = corner.astype(self._cell_dtype)
+        np.clip(corner[:, 0], 0, self._columns - 1, out=corner[:, 0])
+        np.clip(corner[:, 1], 0, self._rows - 1, out=corner[:, 1])
+        cells = corner[:, 1] * corner.dtype.type(self._columns) + corner[:, 0]
+        self._order = np.argsort(cells, kind='stable')
+        counts = np.bincount(cells, minlength=self._columns * self._rows)
+        self._cell_start[0] = 0
+        np.cumsum(counts, out=self._cell_start[1:])
+        self._entry_index[:n] = self._index_entry[:n] = np.arange(n)
+        self._drift = 0
+
+    def hit_test(self, pos):
+        """找出点击位置上的蚊子
+
+        Args:
+            pos: 点击位置 (x, y)
+
+        Returns:
+            最上面（最后绘制）一只被击中的蚊子下标，没有击中时为 None
+        """
+        if self.count == 0:
+            return None
+        # 击中时左上角现在位于 [pos - cell_size, pos]，建网格时还可能再偏 drift 像素
+        cell, drift = self.cell_size, self._drift
+        left = min(max(int((pos[0] - cell - drift) // cell) + 1, 0), self._columns - 1)
+        right = min(max(int((pos[0] + drift) // cell) + 1, 0), self._columns - 1)
+        top = min(max(int((pos[1] - cell - drift) // cell) + 1, 0), self._rows - 1)
+        bottom = min(max(int((pos[1] + drift) // cell) + 1, 0), self._rows - 1)
+        # 同一行里相邻的格子在排序结果中是相连的
+        slices = []
+        for r in range(top, bottom + 1):
+            start = self._cell_start[r * self._columns + left]
+            end = self._cell_start[r * self._columns + right + 1]
+            slices.append(self._order[start:end])
+        candidates = self._entry_index[np.concatenate(slices)]
+        candidates = candidates[candidates >= 0]
+        if len(candidates) == 0:
+            return None
+
+        x = self.position[candidates, 0]
+        y = self.position[candidates, 1]
+        margin = self.hit_margin
+        hit = (x - margin <= pos[0]) & (pos[0] <= x + self.size + margin) & \
+              (y - margin <= pos[1]) & (pos[1] <= y + self.size + margin)
+        if not hit.any():
+            return None
+        return int(candidates[hit].max())
+
+    def draw(self, screen, image_open, image_close):
+        """按翅膀状态批量绘制所有蚊子"""
+        n = self.count
+        if n == 0:
+            return
+        # 下标 0 为合翅，1 为张翅
+        lookup = np.empty(2, dtype=object)
+        lookup[0], lookup[1] = image_close, image_open
+        images = lookup[self.is_open[:n].view(np.uint8)].tolist()
+        screen.blits(zip(images, self.position[:n].astype(np.int32).tolist()), doreturn=False)
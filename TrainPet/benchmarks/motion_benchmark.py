@@ -0,0 +1,116 @@
+"""车头运动引擎基准测试（不需要 Qt）
+
+直接调用 MotionEngine.step 推进，统计每秒能模拟的步数，以及在两种
+运动模式之间来回切换的耗时。
+
+用法（在 TrainPet 目录下）:
+    python benchmarks/motion_benchmark.py --steps 1000000
+    python benchmarks/motion_benchmark.py --modes scan --fps 120
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from states.motion_engine import MODE_BORDER, MODE_SCAN, MotionEngine
+
+MODES = {'border': MODE_BORDER, 'scan': MODE_SCAN}
+
+
+@dataclass
+class MotionResult:
+    """单个运动模式的测试结果"""
+    mode: str  # 运动模式
+    steps: int  # 推进步数
+    seconds: float  # 耗时（秒）
+    steps_per_second: float  # 每秒模拟步数
+    simulated_hours: float  # 模拟的运动时长（小时）
+    switch_ns: float  # 切换一次运动模式的平均耗时（纳秒）
+
+
+def make_engine(width: int, height: int, head_size: int) -> MotionEngine:
+    """创建覆盖整个屏幕的引擎，车头从右下角出发"""
+    engine = MotionEngine()
+    engine.set_bounds(0, 0, width, height, head_size)
+    engine.place(width - head_size, height - head_size)
+    return engine
+
+
+def run(mode: str, steps: int, fps: int, width: int, height: int,
+        head_size: int) -> MotionResult:
+    """按固定步长推进指定步数
+
+    Args:
+        mode: 'border' 或 'scan'
+        steps: 推进步数
+        fps: 模拟帧率（决定每步的时长）
+        width: 屏幕宽度
+        height: 屏幕高度
+        head_size: 车头方框边长
+
+    Returns:
+        MotionResult: 测试结果
+    """
+    engine = make_engine(width, height, head_size)
+    engine.set_mode(MODES[mode])
+    step = engine.step
+    dt = 1.0 / fps
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        step(dt)
+    seconds = time.perf_counter() - start
+
+    # 模式切换：来回切换，取平均
+    switches = 100000
+    set_mode = engine.set_mode
+    start = time.perf_counter()
+    for _ in range(switches // 2):
+        set_mode(MODE_SCAN)
+        set_mode(MODE_BORDER)
+    switch_seconds = time.perf_counter() - start
+
+    return MotionResult(
+        mode=mode,
+        steps=steps,
+        seconds=seconds,
+        steps_per_second=steps / seconds if seconds else 0.0,
+        simulated_hours=steps * dt / 3600,
+        switch_ns=switch_seconds / switches * 1e9
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='车头运动引擎基准测试')
+    parser.add_argument('--steps', type=int, default=1000000, help='每个模式推进的步数')
+    parser.add_argument('--modes', default='border,scan', help='逗号分隔的模式：border, scan')
+    parser.add_argument('--fps', type=int, default=60, help='模拟帧率')
+    parser.add_argument('--width', type=int, default=1920, help='屏幕宽度')
+    parser.add_argument('--height', type=int, default=1080, help='屏幕高度')
+    parser.add_argument('--head-size', type=int, default=254, help='车头方框边长')
+    parser.add_argument('--json', help='将结果写入 JSON 文件')
+    args = parser.parse_args(argv)
+
+    results = [run(name.strip(), args.steps, args.fps, args.width, args.height, args.head_size)
+               for name in args.modes.split(',') if name.strip()]
+
+    print(f"屏幕 {args.width}x{args.height}, 车头 {args.head_size}, {args.fps} 帧/秒")
+    for r in results:
+        print(f"[{r.mode}] {r.steps} 步 {r.seconds:.2f} 秒 | "
+              f"{r.steps_per_second / 1e6:.2f} M 步/秒 | 模拟 {r.simulated_hours:.1f} 小时 | "
+              f"切换模式 {r.switch_ns:.0f} ns")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'config': vars(args), 'results': [asdict(r) for r in results]},
+                      f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
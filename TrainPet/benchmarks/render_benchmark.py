@@ -0,0 +1,378 @@
+"""列车渲染基准测试（无界面运行）
+
+在 offscreen 平台上用模拟时钟驱动运动状态跑完指定圈数，需要重绘的帧
+通过 TrainRenderer 绘制到 QImage，统计绘制耗时分位数、变换缓存命中率、
+图片分配次数和峰值内存。
+
+窗口几何模式之间的对比看原生调用次数（移动、改尺寸、遮罩）和合成器
+需要重新合成的面积：移动窗口时新旧两个位置都要重新合成，叠加层模式
+只有列车上一次和这一次占据的区域。
+
+开启后台渲染线程时，每帧等渲染线程合成完再贴图，绘制耗时只统计 GUI 线程
+的贴图，渲染线程的合成耗时单独统计。没有交给渲染线程（查不到图集）或贴图
+失败的帧计为失败帧，出现失败帧时以非零状态退出。
+
+用法（在 TrainPet 目录下）:
+    python benchmarks/render_benchmark.py --laps 3 --states border,scan
+    python benchmarks/render_benchmark.py --dpr 2 --carriages 3 --json result.json
+    python benchmarks/render_benchmark.py --window-mode overlay
+    python benchmarks/render_benchmark.py --render-thread
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import resource
+except ImportError:  # Windows 没有 resource 模块
+    resource = None
+
+
+@dataclass
+class BenchmarkResult:
+    """单个状态的测试结果"""
+    state: str  # 运动状态
+    laps: int  # 圈数
+    frames: int  # 帧数
+    repaints: int  # 重绘帧数
+    paint_p50_ms: float  # 绘制耗时中位数（毫秒）
+    paint_p90_ms: float
+    paint_p99_ms: float
+    paint_max_ms: float
+    render_thread_ms: float  # 渲染线程每帧合成耗时的平均值（毫秒，未开启时为 0）
+    failed_frames: int  # 渲染线程没有收到快照或贴图失败的重绘帧数
+    update_p50_ms: float  # 状态推进和布局耗时中位数（毫秒）
+    update_p99_ms: float
+    gui_busy_ms: float  # GUI 线程每帧推进和绘制占用的 CPU 时间平均值（毫秒）
+    variant_lookups: int  # 朝向变体查询次数
+    variant_hit_rate: float  # 变体命中率（图集或变换缓存）
+    strip_hit_rate: float  # 合成长条缓存命中率
+    pixmap_allocations: int  # 新分配的图片数（变换缓存和长条缓存未命中）
+    cache_bytes: int  # 结束时缓存占用字节数
+    window_moves: int  # 窗口移动次数
+    window_resizes: int  # 窗口尺寸变化次数
+    mask_updates: int  # 叠加层点击遮罩更新次数
+    damaged_kpx_per_frame: float  # 每帧需要合成器重新合成的面积（千逻辑像素）
+    peak_rss_kb: Optional[int]  # 进程峰值常驻内存（KB），不支持的平台为 None
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """取分位数（毫秒）"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+
+
+def peak_rss_kb() -> Optional[int]:
+    """进程峰值常驻内存（KB）"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS 单位为字节，Linux 为 KB
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def moved_damage(old, new) -> int:
+    """窗口移动或改尺寸时合成器需要重新合成的面积（新旧位置的并集）"""
+    overlap = old.intersected(new)
+    return (old.width() * old.height() + new.width() * new.height()
+            - overlap.width() * overlap.height())
+
+
+def quiet_offscreen_warnings():
+    """屏蔽 offscreen 平台不支持窗口遮罩的警告（叠加层每次更新遮罩都会输出）"""
+    from PySide6.QtCore import qInstallMessageHandler
+
+    previous = None
+
+    def handler(mode, context, message):
+        if 'does not support setting window masks' in message:
+            return
+        if previous is not None:
+            previous(mode, context, message)
+        else:
+            sys.stderr.write(message + '\n')
+
+    previous = qInstallMessageHandler(handler)
+
+
+def configure_offscreen(width: int, height: int, device_pixel_ratio: float) -> str:
+    """生成 offscreen 平台的屏幕配置，必须在创建 QApplication 之前调用
+
+    Returns:
+        str: 配置文件路径
+    """
+    config = {
+        'synthesizedFocus': True,
+        'windowFrameMargins': False,
+        'screens': [{
+            'name': 'benchmark', 'x': 0, 'y': 0,
+            'width': width, 'height': height,
+            'logicalDpi': 96, 'logicalBaseDpi': 96,
+            'dpr': device_pixel_ratio
+        }]
+    }
+    fd, path = tempfile.mkstemp(prefix='trainpet-screen-', suffix='.json')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(config, f)
+    os.environ['QT_QPA_PLATFORM'] = f'offscreen:configfile={path}'
+    return path
+
+
+class RenderBenchmark:
+    """驱动 TrainPet 的运动状态并逐帧渲染"""
+    def __init__(self, carriages: int, fps: int, use_atlas: bool, window_mode: str = 'fixed',
+                 render_thread: bool = False):
+        from PySide6.QtWidgets import QApplication
+        from train_config import train_config
+        from train_pet import TrainPet
+        from utils.motion_clock import MotionClock
+
+        self._app = QApplication.instance() or QApplication(sys.argv)
+        quiet_offscreen_warnings()
+        self._frame_time = 1.0 / fps
+        self._now = 0.0
+
+        # 模拟时钟：每帧固定前进，结果与机器快慢无关
+        train_config.MAX_CARRIAGES = max(train_config.MAX_CARRIAGES, carriages)
+        train_config.WINDOW_GEOMETRY_MODE = window_mode
+        train_config.RENDER_THREAD = render_thread
+        self._pet = TrainPet(MotionClock(lambda: self._now))
+        self._pet.show()
+        if not self._pet.wait_for_images():
+            raise RuntimeError('图片加载失败')
+        self._pet.set_carriage_count(carriages)
+        if use_atlas:
+            self._pet.renderer.wait_for_atlas()
+        QApplication.sendPostedEvents()
+
+        # 不运行事件循环，帧调度器的定时器不会触发，由基准测试逐帧调用
+        self._device_pixel_ratio = self._pet.device_pixel_ratio
+
+    def close(self):
+        """结束渲染线程（不运行事件循环，不会收到退出通知）"""
+        worker = self._pet.renderer.render_worker
+        if worker is not None:
+            worker.stop()
+
+    def run(self, state_name: str, laps: int) -> BenchmarkResult:
+        """跑完指定圈数
+
+        Args:
+            state_name: 'border'（沿屏幕边框）或 'scan'（水平扫描换行）
+            laps: 圈数
+
+        Returns:
+            BenchmarkResult: 测试结果
+        """
+        from PySide6.QtCore import Qt
+        from PySide6.QtGui import QImage, QPainter
+        from states.motion_engine import MODE_BORDER, MODE_SCAN
+
+        pet = self._pet
+        renderer = pet.renderer
+        renderer.clear_cache()
+        renderer.reset_stats()
+        worker = renderer.render_worker if pet.overlay is None else None
+        if worker is not None:
+            worker.wait_until_idle()
+            worker.reset_stats()
+        geometry_before = pet.geometry_stats
+        overlay = pet.overlay
+        if overlay is not None:
+            overlay.flush_mask()
+            overlay.take_pending_damage()
+            overlay.reset_stats()
+
+        if state_name == 'border':
+            pet.set_motion_mode(MODE_BORDER)
+            frames = int(laps * pet.motion.path_length / pet.move_speed / self._frame_time)
+        elif state_name == 'scan':
+            pet.set_motion_mode(MODE_SCAN)
+            frames = None
+        else:
+            raise ValueError(f'未知的运动状态: {state_name}')
+
+        ratio = self._device_pixel_ratio
+        screen = pet.screen_geometry
+        image = QImage(int(screen.width() * ratio), int(screen.height() * ratio),
+                       QImage.Format.Format_ARGB32_Premultiplied)
+        image.setDevicePixelRatio(ratio)
+
+        paint_times: List[float] = []
+        update_times: List[float] = []
+        gui_busy = 0.0
+        lookups = 0
+        completed = 0
+        frame = 0
+        repaints = 0
+        failed = 0
+        damaged = 0
+        while (frames is not None and frame < frames) or (frames is None and completed < laps):
+            self._now += self._frame_time
+            frame += 1
+
+            row = pet.current_row
+            window_before = pet.geometry()
+            repaints_before = pet.scheduler.stats.repaints
+            submitted_before = worker.stats.submitted if worker is not None else 0
+            busy_start = time.thread_time()
+            start = time.perf_counter()
+            pet.update_frame()
+            update_times.append(time.perf_counter() - start)
+            gui_busy += time.thread_time() - busy_start
+
+            painter = QPainter(image)
+            if overlay is not None:
+                # 叠加层：只清除并重绘脏区域，遮罩在事件循环里合并更新
+                region = overlay.take_pending_damage()
+                overlay.flush_mask()
+                if not region.isEmpty():
+                    painter.setClipRegion(region)
+                    painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+                    painter.fillRect(image.rect(), Qt.GlobalColor.transparent)
+                    painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+                    start = time.perf_counter()
+                    overlay.render_trains(painter, region)
+                    paint_times.append(time.perf_counter() - start)
+                    repaints += 1
+            else:
+                # 移动窗口：新旧位置都要重新合成；没有移动时只有重绘的窗口需要合成
+                window = pet.geometry()
+                repainted = pet.scheduler.stats.repaints != repaints_before
+                if window != window_before:
+                    damaged += moved_damage(window_before, window)
+                elif repainted:
+                    damaged += window.width() * window.height()
+                if repainted:
+                    # 只清除窗口区域，与窗口自身的绘制面积一致
+                    painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+                    painter.fillRect(0, 0, pet.width(), pet.height(), Qt.GlobalColor.transparent)
+                    painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+                    if worker is not None:
+                        # GUI 线程只贴上渲染线程合成好的一帧；这一帧没有提交时
+                        # 贴上的是旧帧，和贴图失败一样不算有效的测量
+                        worker.wait_until_idle()
+                        submitted = worker.stats.submitted != submitted_before
+                        busy_start = time.thread_time()
+                        start = time.perf_counter()
+                        if not worker.blit(painter, pet) or not submitted:
+                            failed += 1
+                    else:
+                        busy_start = time.thread_time()
+                        start = time.perf_counter()
+                        renderer.render_placements(painter, pet.placements, pet.pos(),
+                                                   pet.render_scale, ratio)
+                    paint_times.append(time.perf_counter() - start)
+                    gui_busy += time.thread_time() - busy_start
+                    repaints += 1
+            painter.end()
+            lookups += len(pet.placements)
+
+            # 扫描一遍回到第一行算一圈
+            if state_name == 'scan' and row > 0 and pet.current_row == 0:
+                completed += 1
+
+        variant_stats = renderer.cache_stats
+        strip_stats = renderer.strip_cache_stats
+        geometry = pet.geometry_stats
+        mask_updates = 0
+        worker_stats = worker.stats if worker is not None else None
+        if overlay is not None:
+            damaged = overlay.stats.damaged_pixels
+            mask_updates = overlay.stats.mask_updates
+        return BenchmarkResult(
+            state=state_name,
+            laps=laps,
+            frames=frame,
+            repaints=repaints,
+            paint_p50_ms=percentile(paint_times, 0.5),
+            paint_p90_ms=percentile(paint_times, 0.9),
+            paint_p99_ms=percentile(paint_times, 0.99),
+            paint_max_ms=max(paint_times) * 1000 if paint_times else 0.0,
+            render_thread_ms=worker_stats.render_seconds / worker_stats.rendered * 1000
+            if worker_stats is not None and worker_stats.rendered else 0.0,
+            failed_frames=failed,
+            update_p50_ms=percentile(update_times, 0.5),
+            update_p99_ms=percentile(update_times, 0.99),
+            gui_busy_ms=gui_busy / frame * 1000 if frame else 0.0,
+            variant_lookups=lookups,
+            variant_hit_rate=1.0 - variant_stats.misses / lookups if lookups else 0.0,
+            strip_hit_rate=strip_stats.hit_rate,
+            pixmap_allocations=variant_stats.misses + strip_stats.misses,
+            cache_bytes=variant_stats.bytes_used + strip_stats.bytes_used,
+            window_moves=geometry.moves - geometry_before.moves,
+            window_resizes=geometry.resizes - geometry_before.resizes,
+            mask_updates=mask_updates,
+            damaged_kpx_per_frame=damaged / frame / 1000 if frame else 0.0,
+            peak_rss_kb=peak_rss_kb()
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='列车渲染基准测试（offscreen）')
+    parser.add_argument('--laps', type=int, default=1, help='每个状态跑的圈数')
+    parser.add_argument('--states', default='border,scan', help='逗号分隔的状态：border, scan')
+    parser.add_argument('--carriages', type=int, default=2, help='车厢数')
+    parser.add_argument('--width', type=int, default=1920, help='屏幕宽度')
+    parser.add_argument('--height', type=int, default=1080, help='屏幕高度')
+    parser.add_argument('--dpr', type=float, default=1.0, help='设备像素比')
+    parser.add_argument('--fps', type=int, default=60, help='模拟帧率')
+    parser.add_argument('--no-atlas', action='store_true', help='不等待朝向图集，只用实时变换')
+    parser.add_argument('--window-mode', choices=('fixed', 'fit', 'overlay'), default='fixed',
+                        help='窗口几何模式：fixed 固定尺寸，fit 贴合列车，overlay 全屏叠加层')
+    parser.add_argument('--render-thread', action='store_true',
+                        help='开启后台渲染线程（叠加层模式不使用）')
+    parser.add_argument('--json', help='将结果写入 JSON 文件')
+    args = parser.parse_args(argv)
+
+    config_path = configure_offscreen(args.width, args.height, args.dpr)
+    try:
+        benchmark = RenderBenchmark(args.carriages, args.fps, not args.no_atlas,
+                                    args.window_mode, args.render_thread)
+        try:
+            results = [benchmark.run(name.strip(), args.laps)
+                       for name in args.states.split(',') if name.strip()]
+        finally:
+            benchmark.close()
+    finally:
+        os.remove(config_path)
+
+    print(f"屏幕 {args.width}x{args.height} @{args.dpr}x, 车厢 {args.carriages}, "
+          f"{'实时变换' if args.no_atlas else '朝向图集'}, 窗口 {args.window_mode}, "
+          f"渲染线程 {'开' if args.render_thread else '关'}")
+    for r in results:
+        print(f"[{r.state}] {r.laps} 圈 {r.frames} 帧 重绘 {r.repaints} | "
+              f"绘制 p50 {r.paint_p50_ms:.3f} p90 {r.paint_p90_ms:.3f} "
+              f"p99 {r.paint_p99_ms:.3f} max {r.paint_max_ms:.3f} ms | "
+              f"渲染线程 {r.render_thread_ms:.3f} ms 失败 {r.failed_frames} 帧 | "
+              f"更新 p50 {r.update_p50_ms:.3f} p99 {r.update_p99_ms:.3f} ms | "
+              f"GUI 线程 {r.gui_busy_ms:.3f} ms/帧 | "
+              f"变体命中 {r.variant_hit_rate:.1%} 长条命中 {r.strip_hit_rate:.1%} | "
+              f"图片分配 {r.pixmap_allocations} 缓存 {r.cache_bytes / 1024:.0f} KB | "
+              f"窗口移动 {r.window_moves} 改尺寸 {r.window_resizes} 遮罩 {r.mask_updates} | "
+              f"合成面积 {r.damaged_kpx_per_frame:.1f} K像素/帧 | "
+              f"峰值内存 {r.peak_rss_kb if r.peak_rss_kb is not None else '-'} KB")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'config': vars(args), 'results': [asdict(r) for r in results]},
+                      f, ensure_ascii=False, indent=2)
+
+    failed = sum(r.failed_frames for r in results)
+    if failed:
+        print(f'渲染线程有 {failed} 帧没有渲染，耗时不可信', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""列车集群基准测试（无界面运行）
+
+在 offscreen 平台上运行真实的事件循环，统计不同列车数量下进程占用的
+CPU（以单核为 100%）、GUI 线程占用的 CPU、实际帧率、每帧推进所有列车的
+平均耗时和重绘占比。可以切换窗口几何模式，对比每列列车一个窗口和所有列车
+共用一个叠加层；也可以开启后台渲染线程，对比 GUI 线程的繁忙程度。
+
+用法（在 TrainPet 目录下）:
+    python benchmarks/swarm_benchmark.py --counts 1,50,200 --seconds 5
+    python benchmarks/swarm_benchmark.py --counts 200 --window-mode overlay
+    python benchmarks/swarm_benchmark.py --counts 1,50 --render-thread
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.render_benchmark import configure_offscreen, peak_rss_kb, quiet_offscreen_warnings
+
+
+@dataclass
+class SwarmResult:
+    """单个列车数量的测试结果"""
+    count: int  # 列车数量
+    seconds: float  # 运行时长（秒）
+    cpu_fraction: float  # 进程 CPU 占用（单核为 1.0）
+    gui_cpu_fraction: float  # GUI 线程 CPU 占用（单核为 1.0）
+    render_thread_ms: float  # 渲染线程每帧合成一列列车的平均耗时（毫秒，未开启时为 0）
+    ticks_per_second: float  # 实际帧率
+    update_ms: float  # 每帧推进所有列车的平均耗时（毫秒）
+    repaint_fraction: float  # 需要重绘的列车帧占比
+    window_moves: int  # 所有列车的窗口移动次数
+    mask_updates: int  # 叠加层点击遮罩更新次数
+    peak_rss_kb: Optional[int]  # 进程峰值常驻内存（KB）
+
+
+def run(count: int, seconds: float, window_mode: str, render_thread: bool = False) -> SwarmResult:
+    """运行指定数量的列车
+
+    Args:
+        count: 列车数量
+        seconds: 运行时长（秒）
+        window_mode: 窗口几何模式
+        render_thread: 是否开启后台渲染线程
+
+    Returns:
+        SwarmResult: 测试结果
+    """
+    from PySide6.QtCore import QTimer
+    from PySide6.QtWidgets import QApplication
+    from train_config import train_config
+    from train_swarm import TrainSwarm
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    quiet_offscreen_warnings()
+    train_config.WINDOW_GEOMETRY_MODE = window_mode
+    train_config.RENDER_THREAD = render_thread
+    swarm = TrainSwarm(count)
+    swarm.show()
+    if not swarm.wait_until_ready():
+        raise RuntimeError('图片加载失败')
+    swarm.renderer.wait_for_atlas()
+    QApplication.sendPostedEvents()
+
+    # 替换共用定时器的回调，只统计推进所有列车的耗时
+    update_time = [0.0]
+
+    def timed_step():
+        start = time.perf_counter()
+        swarm.step()
+        update_time[0] += time.perf_counter() - start
+
+    swarm.scheduler.tick.disconnect(swarm.step)
+    swarm.scheduler.tick.connect(timed_step)
+
+    worker = swarm.renderer.render_worker
+    if worker is not None:
+        worker.reset_stats()
+    ticks_before = swarm.scheduler.stats.ticks
+    cpu_start = time.process_time()
+    gui_cpu_start = time.thread_time()
+    wall_start = time.perf_counter()
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    gui_cpu = time.thread_time() - gui_cpu_start
+    ticks = swarm.scheduler.stats.ticks - ticks_before
+
+    stats = [pet.scheduler.stats for pet in swarm.pets]
+    repaints = sum(s.repaints for s in stats)
+    skipped = sum(s.skipped_repaints for s in stats)
+    moves = sum(pet.geometry_stats.moves for pet in swarm.pets)
+    masks = swarm.compositor.stats.mask_updates if swarm.compositor is not None else 0
+    worker_stats = worker.stats if worker is not None else None
+
+    for pet in swarm.pets:
+        pet.close()
+        pet.deleteLater()
+    swarm.deleteLater()
+    QApplication.sendPostedEvents()
+
+    return SwarmResult(
+        count=count,
+        seconds=wall,
+        cpu_fraction=cpu / wall,
+        gui_cpu_fraction=gui_cpu / wall,
+        render_thread_ms=worker_stats.render_seconds / worker_stats.rendered * 1000
+        if worker_stats is not None and worker_stats.rendered else 0.0,
+        ticks_per_second=ticks / wall,
+        update_ms=update_time[0] / ticks * 1000 if ticks else 0.0,
+        repaint_fraction=repaints / (repaints + skipped) if repaints + skipped else 0.0,
+        window_moves=moves,
+        mask_updates=masks,
+        peak_rss_kb=peak_rss_kb()
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='列车集群基准测试（offscreen）')
+    parser.add_argument('--counts', default='1,50,200', help='逗号分隔的列车数量')
+    parser.add_argument('--seconds', type=float, default=5.0, help='每个数量运行的秒数')
+    parser.add_argument('--width', type=int, default=1920, help='屏幕宽度')
+    parser.add_argument('--height', type=int, default=1080, help='屏幕高度')
+    parser.add_argument('--dpr', type=float, default=1.0, help='设备像素比')
+    parser.add_argument('--window-mode', choices=('fixed', 'fit', 'overlay'), default='fixed',
+                        help='窗口几何模式：fixed 固定尺寸，fit 贴合列车，overlay 全屏叠加层')
+    parser.add_argument('--render-thread', action='store_true',
+                        help='开启后台渲染线程（叠加层模式不使用）')
+    parser.add_argument('--json', help='将结果写入 JSON 文件')
+    args = parser.parse_args(argv)
+
+    config_path = configure_offscreen(args.width, args.height, args.dpr)
+    try:
+        results = [run(int(count), args.seconds, args.window_mode, args.render_thread)
+                   for count in args.counts.split(',') if count.strip()]
+    finally:
+        os.remove(config_path)
+
+    print(f"屏幕 {args.width}x{args.height} @{args.dpr}x, 窗口 {args.window_mode}, "
+          f"渲染线程 {'开' if args.render_thread else '关'}")
+    for r in results:
+        print(f"[{r.count} 列] CPU {r.cpu_fraction:.0%} 单核 (GUI 线程 {r.gui_cpu_fraction:.0%}) | "
+              f"帧率 {r.ticks_per_second:.1f} | 每帧推进 {r.update_ms:.2f} ms | "
+              f"重绘占比 {r.repaint_fraction:.0%} | 渲染线程每帧 {r.render_thread_ms:.2f} ms | "
+              f"窗口移动 {r.window_moves} "
+              f"遮罩 {r.mask_updates} | "
+              f"峰值内存 {r.peak_rss_kb if r.peak_rss_kb is not None else '-'} KB")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'config': vars(args), 'results': [asdict(r) for r in results]},
+                      f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,211 @@
+import math
+from typing import List, Optional, Tuple
+
+# 轨迹采样：(x, y, 旋转角度, 是否镜像)
+TrailSample = Tuple[float, float, float, bool]
+
+
+class CarriageTrail:
+    """车头走过的轨迹（环形缓冲区）
+
+    按固定间距记录车头中心位置和当时的朝向，车厢按与车头的弧长距离
+    在轨迹上取位置，从而跟随车头转过屏幕角落。
+    """
+    # 从上一帧的查找结果向前最多走的步数，超过后改用二分查找
+    HINT_STEPS = 4
+
+    def __init__(self, max_length: float, spacing: float = 4.0):
+        """初始化轨迹
+
+        Args:
+            max_length: 需要保留的最大轨迹长度（像素），通常为整列列车长度
+            spacing: 采样间距（像素）
+        """
+        self._spacing = spacing
+        self._capacity = int(math.ceil(max_length / spacing)) + 4
+
+        # 预分配的环形缓冲区（按逻辑序号 % 容量存放）
+        self._xs = [0.0] * self._capacity
+        self._ys = [0.0] * self._capacity
+        self._distances = [0.0] * self._capacity  # 累计弧长，随逻辑序号单调递增
+        self._angles = [0.0] * self._capacity
+        self._mirrors = [False] * self._capacity
+        self._count = 0  # 已写入的采样总数
+
+        # 每个取样距离上一次查找到的逻辑序号（车头前进时每帧只移动一两个采样）
+        self._hints: List[int] = []
+
+        # 车头当前位置（不一定落在采样点上）
+        self._head: Optional[TrailSample] = None
+        self._head_distance = 0.0
+
+    @property
+    def capacity(self) -> int:
+        """缓冲区容量"""
+        return self._capacity
+
+    def reset(self):
+        """清空轨迹"""
+        self._count = 0
+        self._head = None
+        self._head_distance = 0.0
+
+    def push(self, x: float, y: float, rotation_angle: float, is_mirrored: bool):
+        """记录车头新位置
+
+        Args:
+            x: 车头中心 x
+            y: 车头中心 y
+            rotation_angle: 车头旋转角度
+            is_mirrored: 车头是否镜像
+        """
+        if self._head is None:
+            self._append(x, y, rotation_angle, is_mirrored, 0.0)
+            self._head = (x, y, rotation_angle, is_mirrored)
+            self._head_distance = 0.0
+            return
+
+        last = (self._count - 1) % self._capacity
+        step = math.hypot(x - self._xs[last], y - self._ys[last])
+
+        # 首次移动时沿反方向补齐一段直线轨迹，避免车厢堆叠在车头处
+        if self._count == 1 and step > 0:
+            self._seed_behind(x, y, rotation_angle, is_mirrored)
+            last = (self._count - 1) % self._capacity
+            step = math.hypot(x - self._xs[last], y - self._ys[last])
+
+        self._head = (x, y, rotation_angle, is_mirrored)
+        self._head_distance = self._distances[last] + step
+        if step >= self._spacing:
+            self._append(x, y, rotation_angle, is_mirrored, self._head_distance)
+
+    def translate(self, dx: float, dy: float):
+        """整体平移轨迹（拖拽时保持列车形状）"""
+        for logical in range(max(0, self._count - self._capacity), self._count):
+            index = logical % self._capacity
+            self._xs[index] += dx
+            self._ys[index] += dy
+        if self._head is not None:
+            x, y, angle, mirrored = self._head
+            self._head = (x + dx, y + dy, angle, mirrored)
+
+    def sample(self, distances: List[float]) -> List[TrailSample]:
+        """获取车头后方指定弧长处的位置和朝向
+
+        Args:
+            distances: 与车头的弧长距离列表
+
+        Returns:
+            List[TrailSample]: 对应的 (x, y, 旋转角度, 是否镜像)
+        """
+        if self._head is None:
+            return []
+
+        head_x, head_y, head_angle, head_mirrored = self._head
+        head_distance = self._head_distance
+        capacity = self._capacity
+        xs, ys, sample_distances = self._xs, self._ys, self._distances
+        interpolate = self._interpolate
+        last_logical = self._count - 1
+        last = last_logical % capacity
+        oldest_logical = max(0, self._count - capacity)
+
+        if len(self._hints) != len(distances):
+            self._hints = [-1] * len(distances)
+
+        result: List[TrailSample] = []
+        for slot, distance in enumerate(distances):
+            target = head_distance - distance
+
+            # 落在最后一个采样点和车头之间
+            if target >= sample_distances[last]:
+                result.append(interpolate(
+                    xs[last], ys[last], sample_distances[last],
+                    head_x, head_y, head_distance,
+                    head_angle, head_mirrored, target
+                ))
+                continue
+
+            # 从上一帧的位置向前查找所在的采样区间
+            logical = self._find(slot, oldest_logical, last_logical, target)
+            if logical < oldest_logical:
+                index = oldest_logical % capacity
+                result.append((xs[index], ys[index],
+                               self._angles[index], self._mirrors[index]))
+                continue
+
+            i0 = logical % capacity
+            i1 = (logical + 1) % capacity
+            result.append(interpolate(
+                xs[i0], ys[i0], sample_distances[i0],
+                xs[i1], ys[i1], sample_distances[i1],
+                self._angles[i1], self._mirrors[i1], target
+            ))
+        return result
+
+    def _find(self, slot: int, low: int, high: int, target: float) -> int:
+        """在逻辑序号区间内查找累计弧长不超过目标值的最后一个采样
+
+        先从该取样距离上一帧的结果向前走几步，跳得太远（或轨迹被重置、
+        平移）时回到二分查找。
+        """
+        capacity = self._capacity
+        distances = self._distances
+        logical = self._hints[slot]
+        if low <= logical <= high and distances[logical % capacity] <= target:
+            for _ in range(self.HINT_STEPS):
+                if logical == high or distances[(logical + 1) % capacity] > target:
+                    self._hints[slot] = logical
+                    return logical
+                logical += 1
+        logical = self._search(low, high, target)
+        self._hints[slot] = logical
+        return logical
+
+    def _search(self, low: int, high: int, target: float) -> int:
+        """在逻辑序号区间内查找累计弧长不超过目标值的最后一个采样"""
+        capacity = self._capacity
+        distances = self._distances
+        # bisect 的 key 参数需要 Python 3.10+，这里手写二分
+        lo, hi = low, high + 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if distances[mid % capacity] <= target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo - 1
+
+    @staticmethod
+    def _interpolate(x0: float, y0: float, d0: float, x1: float, y1: float, d1: float,
+                     rotation_angle: float, is_mirrored: bool, target: float) -> TrailSample:
+        """在两个采样点之间按弧长线性插值"""
+        span = d1 - d0
+        t = 0.0 if span <= 0 else (target - d0) / span
+        return x0 + (x1 - x0) * t, y0 + (y1 - y0) * t, rotation_angle, is_mirrored
+
+    def _append(self, x: float, y: float, rotation_angle: float, is_mirrored: bool,
+                distance: float):
+        """写入一个采样点"""
+        index = self._count % self._capacity
+        self._xs[index] = x
+        self._ys[index] = y
+        self._distances[index] = distance
+        self._angles[index] = rotation_angle
+        self._mirrors[index] = is_mirrored
+        self._count += 1
+
+    def _seed_behind(self, x: float, y: float, rotation_angle: float, is_mirrored: bool):
+        """沿首次移动的反方向补齐整段轨迹"""
+        x0, y0 = self._xs[0], self._ys[0]
+        length = math.hypot(x - x0, y - y0)
+        ux, uy = (x0 - x) / length, (y0 - y) / length
+        points = self._capacity - 2
+
+        # 重新从最远处开始写入，使累计弧长保持递增
+        self._count = 0
+        for i in range(points, 0, -1):
+            offset = i * self._spacing
+            self._append(x0 + ux * offset, y0 + uy * offset,
+                         rotation_angle, is_mirrored, (points - i) * self._spacing)
+        self._append(x0, y0, rotation_angle, is_mirrored, points * self._spacing)
@@ -1,15 +1,27 @@
 from PySide6.QtCore import QSize, QPoint, Qt
 from PySide6.QtGui import QPixmap, QTransform
-from typing import Optional
+from typing import Dict, Optional, Tuple
+import math
 
 class TrainComponent:
     """列车组件基类"""
+    # 旋转尺寸缓存的最大条目数
+    ROTATED_SIZE_CACHE_SIZE = 128
+    
     def __init__(self, pixmap: QPixmap, position: QPoint, scale_factor: float = 1.0):
         self._original_pixmap = pixmap
         self._position = position
         self._scale_factor = scale_factor
         self._rotation_angle = 0
         
+        # 图片和缩放比例创建后不变，尺寸只计算一次（每帧布局都会用到）
+        self._scaled_size = QSize(
+            int(pixmap.width() * scale_factor),
+            int(pixmap.height() * scale_factor)
+        )
+        # 旋转后的包围盒尺寸按角度缓存（转弯角度量化后只有几十档）
+        self._rotated_sizes: Dict[float, Tuple[int, int]] = {}
+        
     @property
     def original_pixmap(self) -> QPixmap:
         """获取原始图片"""
@@ -18,10 +30,36 @@ class TrainComponent:
     @property
     def scaled_size(self) -> QSize:
         """获取缩放后的尺寸"""
-        return QSize(
-            int(self._original_pixmap.width() * self._scale_factor),
-            int(self._original_pixmap.height() * self._scale_factor)
-        )
+        return QSize(self._scaled_size)
+        
+    def rotated_size(self, rotation_angle: float) -> Tuple[int, int]:
+        """获取旋转后的包围盒尺寸 (width, height)
+        
+        Args:
+            rotation_angle: 旋转角度
+        """
+        angle = rotation_angle % 180
+        size = self._rotated_sizes.get(angle)
+        if size is not None:
+            return size
+            
+        width, height = self._scaled_size.width(), self._scaled_size.height()
+        if angle == 0:
+            size = (width, height)
+        elif angle == 90:
+            size = (height, width)
+        else:
+            # 转弯时的中间角度
+            radians = math.radians(angle)
+            cos, sin = abs(math.cos(radians)), abs(math.sin(radians))
+            size = (math.ceil(width * cos + height * sin - 1e-6),
+                    math.ceil(width * sin + height * cos - 1e-6))
+                    
+        # 不量化角度时档数不受限制，超出上限后重新缓存
+        if len(self._rotated_sizes) >= self.ROTATED_SIZE_CACHE_SIZE:
+            self._rotated_sizes.clear()
+        self._rotated_sizes[angle] = size
+        return size
         
     @property
     def position(self) -> QPoint:
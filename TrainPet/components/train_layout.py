@@ -0,0 +1,118 @@
+import math
+from dataclasses import dataclass
+from typing import List, Tuple
+from PySide6.QtCore import QRectF
+from .train_component import TrainComponent
+from .carriage_trail import CarriageTrail
+
+
+@dataclass(frozen=True)
+class ComponentPlacement:
+    """单个组件在屏幕上的摆放"""
+    component: TrainComponent  # 列车组件
+    x: float  # 中心点 x（屏幕坐标）
+    y: float  # 中心点 y（屏幕坐标）
+    rotation_angle: float  # 旋转角度
+    is_mirrored: bool  # 是否水平镜像
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """旋转后的组件包围盒尺寸 (width, height)"""
+        return self.component.rotated_size(self.rotation_angle)
+
+    @property
+    def rect(self) -> QRectF:
+        """旋转后的组件区域（屏幕坐标）"""
+        width, height = self.size
+        return QRectF(self.x - width / 2, self.y - height / 2, width, height)
+
+
+class TrainLayout:
+    """整列列车布局：车头、车厢、车尾依次排列在车头走过的轨迹上"""
+    def __init__(self, components: List[TrainComponent], spacing: float = 4.0):
+        """初始化布局
+
+        Args:
+            components: 按车头到车尾顺序排列的组件
+            spacing: 轨迹采样间距（像素）
+        """
+        self._spacing = spacing
+        self.set_components(components)
+
+    def set_components(self, components: List[TrainComponent]):
+        """更换组件列表（例如增减车厢），会清空轨迹
+
+        Args:
+            components: 按车头到车尾顺序排列的组件
+        """
+        self._components = list(components)
+
+        # 每个组件中心与车头中心的弧长距离
+        self._distances: List[float] = []
+        offset = 0.0
+        for i, component in enumerate(self._components):
+            length = component.scaled_size.width()
+            if i == 0:
+                self._distances.append(0.0)
+                offset = length / 2
+            else:
+                self._distances.append(offset + length / 2)
+                offset += length
+        self._length = offset
+        self._covering_size = math.ceil(sum(
+            math.hypot(c.scaled_size.width(), c.scaled_size.height()) for c in self._components
+        ))
+
+        self._trail = CarriageTrail(self._length * 2, self._spacing)
+
+    @property
+    def components(self) -> List[TrainComponent]:
+        """获取组件列表"""
+        return self._components
+
+    @property
+    def length(self) -> float:
+        """整列列车长度（像素）"""
+        return self._length
+
+    def covering_size(self) -> int:
+        """任意朝向（包括转弯时）都能包住整列列车的正方形边长
+
+        沿轨迹相隔的两个组件，中心距离不超过其间的弧长，而任意角度下
+        组件在任一方向上的跨度不超过其对角线，因此包围盒任一边都不超过
+        所有组件对角线长度之和。
+        """
+        return self._covering_size
+
+    @property
+    def trail(self) -> CarriageTrail:
+        """获取车头轨迹"""
+        return self._trail
+
+    def reset(self):
+        """清空轨迹，车厢将从车头下一次移动开始重新排列"""
+        self._trail.reset()
+
+    def update(self, head_x: float, head_y: float, rotation_angle: float,
+               is_mirrored: bool) -> List[ComponentPlacement]:
+        """记录车头位置并计算所有组件的摆放
+
+        Args:
+            head_x: 车头中心 x（屏幕坐标）
+            head_y: 车头中心 y（屏幕坐标）
+            rotation_angle: 车头旋转角度
+            is_mirrored: 车头是否镜像
+
+        Returns:
+            List[ComponentPlacement]: 从车头到车尾的组件摆放
+        """
+        self._trail.push(head_x, head_y, rotation_angle, is_mirrored)
+        return self.placements()
+
+    def placements(self) -> List[ComponentPlacement]:
+        """按当前轨迹计算所有组件的摆放"""
+        samples = self._trail.sample(self._distances)
+        return [
+            ComponentPlacement(component, x, y, angle, mirrored)
+            for component, (x, y, angle, mirrored) in zip(self._components, samples)
+        ]
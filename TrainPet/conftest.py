@@ -0,0 +1,15 @@
+"""pytest 配置：模块按 TrainPet 目录导入，Qt 使用无界面平台"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    """整个测试会话共用的 QApplication（QPixmap 和画笔需要）"""
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
@@ -1,25 +1,46 @@
+import argparse
 import sys
-from PySide6.QtWidgets import QApplication
+from PySide6.QtWidgets import QApplication, QWidget
 from PySide6.QtCore import Qt, QObject, QEvent
 from PySide6.QtGui import QKeyEvent, QKeySequence, QShortcut
 from train_pet import TrainPet
+from train_swarm import TrainSwarm
 
-def main():
-    app = QApplication(sys.argv)
-    
-    # 创建高铁宠物实例
-    pet = TrainPet()
-    
+def add_quit_shortcuts(app: QApplication, window: QWidget):
+    """为列车窗口（或叠加层）添加退出快捷键"""
     # 创建ESC快捷键
-    esc_shortcut = QShortcut(QKeySequence(Qt.Key.Key_Escape), pet)
+    esc_shortcut = QShortcut(QKeySequence(Qt.Key.Key_Escape), window)
     esc_shortcut.activated.connect(app.quit)
     
     # 创建Shift+ESC快捷键
-    shift_esc_shortcut = QShortcut(QKeySequence(Qt.Key.Key_Escape | Qt.KeyboardModifier.ShiftModifier), pet)
+    shift_esc_shortcut = QShortcut(QKeySequence(Qt.Key.Key_Escape | Qt.KeyboardModifier.ShiftModifier), window)
     shift_esc_shortcut.activated.connect(app.quit)
+
+def main():
+    parser = argparse.ArgumentParser(description='高铁桌面宠物')
+    parser.add_argument('--swarm', type=int, default=0, help='集群模式：同时运行的列车数量')
+    args, qt_args = parser.parse_known_args()
+    app = QApplication(sys.argv[:1] + qt_args)
     
-    # 显示窗口
-    pet.show()
+    if args.swarm > 0:
+        # 集群模式：多列列车共用时钟、图片和渲染器
+        swarm = TrainSwarm(args.swarm, app)
+        if swarm.compositor is not None:
+            swarm.compositor.overlay_created.connect(lambda overlay: add_quit_shortcuts(app, overlay))
+        else:
+            swarm.ready.connect(lambda: [add_quit_shortcuts(app, pet) for pet in swarm.pets])
+        swarm.show()
+    else:
+        # 创建高铁宠物实例
+        pet = TrainPet()
+        add_quit_shortcuts(app, pet)
+        
+        # 叠加层模式下列车画在叠加层上，快捷键加在叠加层上
+        if pet.compositor is not None:
+            pet.compositor.overlay_created.connect(lambda overlay: add_quit_shortcuts(app, overlay))
+        
+        # 显示窗口
+        pet.show()
     
     # 启动事件循环
     sys.exit(app.exec())
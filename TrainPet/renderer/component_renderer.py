@@ -1,50 +1,185 @@
+import math
+from typing import Dict, Optional, Tuple
+from PySide6.QtCore import QPoint, QPointF, QRect, QRectF, QSize, Qt
+from PySide6.QtGui import QPixmap, QPainter
+from .pixmap_cache import PixmapCache, CacheStats
+from .sprite_atlas import SpriteAtlas, build_variant_transform
+from train_config import train_config
+
+# 缓存键：(图片缓存键, 缩放因子, 旋转角度, 是否镜像, 设备像素比)
+CacheKey = Tuple[int, float, float, bool, float]
+
+
+def snap_to_pixel(value: float) -> int:
+    """四舍五入到整数像素，对半像素处的浮点误差保持稳定"""
+    return math.floor(value + 0.5 + 1e-6)
+
+
+def is_axis_aligned(rotation_angle: float) -> bool:
+    """旋转角度是否为 90 度的整数倍（图集中有对应的变体）"""
+    return rotation_angle % 90 == 0
 
-from typing import Dict, Optional
-from PySide6.QtCore import QPoint, QSize, Qt
-from PySide6.QtGui import QPixmap, QPainter, QTransform
-from .render_context import RenderContext
 
 class ComponentRenderer:
     """组件渲染器，负责单个组件的渲染"""
-    def __init__(self):
+    def __init__(self, max_bytes: Optional[int] = None,
+                 max_entries: Optional[int] = None):
+        """初始化组件渲染器
+        
+        Args:
+            max_bytes: 变换缓存的字节预算，默认取配置
+            max_entries: 变换缓存的最大条目数，默认取配置
+        """
+        # 缓存变换后的图片（LRU，按字节预算淘汰）
+        self._cache = PixmapCache(
+            train_config.IMAGE_CACHE_MAX_BYTES if max_bytes is None else max_bytes,
+            train_config.IMAGE_CACHE_SIZE if max_entries is None else max_entries
+        )
         
-        # 缓存变换后的图片
-        self._cache: Dict[str, QPixmap] = {}
+        # 按设备像素比存放的预生成朝向图集
+        self._atlases: Dict[float, SpriteAtlas] = {}
         
-    def render_component(self, context: RenderContext, pixmap: QPixmap, 
-                        position: QPoint, scale_factor: float = 1.0,
-                        rotation_angle: float = 0.0, is_mirrored: bool = False) -> None:
-        """渲染单个组件
+        # 图集中查到的变体：缓存键 -> (图集图片, 区域, 逻辑宽, 逻辑高)，只记录命中，
+        # 条目数不超过图集的变体数，图集变化时清空
+        self._sprites: Dict[CacheKey, Tuple[QPixmap, QRect, int, int]] = {}
+        
+    def render_component_centered(self, painter: QPainter, pixmap: QPixmap,
+                                  center: QPointF, scale_factor: float = 1.0,
+                                  rotation_angle: float = 0.0,
+                                  is_mirrored: bool = False,
+                                  device_pixel_ratio: float = 1.0) -> None:
+        """以中心点定位渲染单个组件（不改变画笔状态）
+        
+        90 度整数倍的角度和图集中预生成的角度直接绘制变体；其余转弯时的
+        中间角度不生成新的变体，而是用画笔的世界变换旋转 0 度变体，
+        缓存占用与显示过的角度数无关。
         
         Args:
-            context: 渲染上下文
+            painter: 画笔对象
             pixmap: 原始图片
-            position: 渲染位置
+            center: 组件中心点
             scale_factor: 缩放因子
             rotation_angle: 旋转角度
             is_mirrored: 是否水平镜像
+            device_pixel_ratio: 目标设备像素比
+        """
+        # 列车多时每帧每个组件都会走到这里：图集命中时直接取记住的区域和尺寸
+        cache_key = (pixmap.cacheKey(), scale_factor, rotation_angle, is_mirrored,
+                     device_pixel_ratio)
+        sprite = self._sprites.get(cache_key) or self._atlas_sprite(cache_key)
+        if sprite is not None:
+            source, source_rect, width, height = sprite
+        elif not is_axis_aligned(rotation_angle):
+            self._render_rotated(painter, pixmap, center, scale_factor, rotation_angle,
+                                 is_mirrored, device_pixel_ratio)
+            return
+        else:
+            source, source_rect = self.get_variant(
+                pixmap, scale_factor, rotation_angle, is_mirrored, device_pixel_ratio
+            )
+            size = self.logical_size(source, source_rect)
+            width, height = size.width(), size.height()
+            
+        painter.drawPixmap(
+            QPoint(snap_to_pixel(center.x() - width / 2),
+                   snap_to_pixel(center.y() - height / 2)),
+            source, source_rect
+        )
+        
+    def _atlas_sprite(self, cache_key: CacheKey) -> Optional[Tuple[QPixmap, QRect, int, int]]:
+        """在图集中查找变体，命中时记住结果
+        
+        Args:
+            cache_key: 缓存键（与图集键一致）
+            
+        Returns:
+            Optional[Tuple[QPixmap, QRect, int, int]]: (图集图片, 区域, 逻辑宽, 逻辑高)，
+            图集未就绪或没有该变体时为 None
+        """
+        atlas = self._atlases.get(cache_key[4])
+        if atlas is None:
+            return None
+        source_rect = atlas.source_rect(cache_key)
+        if source_rect is None:
+            return None
+        size = self.logical_size(atlas.pixmap, source_rect)
+        sprite = (atlas.pixmap, source_rect, size.width(), size.height())
+        self._sprites[cache_key] = sprite
+        return sprite
+        
+    def _render_rotated(self, painter: QPainter, pixmap: QPixmap, center: QPointF,
+                        scale_factor: float, rotation_angle: float, is_mirrored: bool,
+                        device_pixel_ratio: float) -> None:
+        """绕取整后的中心点旋转绘制 0 度变体
+        
+        Args:
+            painter: 画笔对象
+            pixmap: 原始图片
+            center: 组件中心点
+            scale_factor: 缩放因子
+            rotation_angle: 旋转角度
+            is_mirrored: 是否水平镜像
+            device_pixel_ratio: 目标设备像素比
+        """
+        source, source_rect = self.get_variant(
+            pixmap, scale_factor, 0.0, is_mirrored, device_pixel_ratio
+        )
+        size = self.logical_size(source, source_rect)
+        painter.save()
+        try:
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+            painter.translate(snap_to_pixel(center.x()), snap_to_pixel(center.y()))
+            painter.rotate(rotation_angle)
+            painter.drawPixmap(
+                QRectF(-size.width() / 2, -size.height() / 2, size.width(), size.height()),
+                source, QRectF(source_rect)
+            )
+        finally:
+            painter.restore()
+        
+    def get_variant(self, pixmap: QPixmap, scale_factor: float,
+                    rotation_angle: float, is_mirrored: bool,
+                    device_pixel_ratio: float = 1.0) -> Tuple[QPixmap, QRect]:
+        """获取组件的朝向变体
+        
+        Args:
+            pixmap: 原始图片
+            scale_factor: 缩放因子
+            rotation_angle: 旋转角度
+            is_mirrored: 是否水平镜像
+            device_pixel_ratio: 目标设备像素比，变体按物理像素生成
+            
+        Returns:
+            Tuple[QPixmap, QRect]: 变体所在的图片及其中的区域（物理像素）
         """
         # 计算缓存键
-        cache_key = f"{pixmap.cacheKey()}_{scale_factor}_{rotation_angle}_{is_mirrored}"
+        cache_key = (pixmap.cacheKey(), scale_factor, rotation_angle, is_mirrored,
+                     device_pixel_ratio)
+        
+        # 图集就绪后直接从图集拷贝
+        atlas = self._atlases.get(device_pixel_ratio)
+        if atlas is not None:
+            source_rect = atlas.source_rect(cache_key)
+            if source_rect is not None:
+                return atlas.pixmap, source_rect
         
         # 获取或创建变换后的图片
         transformed_pixmap = self._get_transformed_pixmap(
-            pixmap, scale_factor, rotation_angle, cache_key, is_mirrored
+            pixmap, scale_factor, rotation_angle, cache_key, is_mirrored,
+            device_pixel_ratio
         )
+        return transformed_pixmap, transformed_pixmap.rect()
         
-        # 计算实际渲染位置
-        render_pos = self._calculate_render_position(
-            context, position, transformed_pixmap.size()
-        )
+    @staticmethod
+    def logical_size(source: QPixmap, source_rect: QRect) -> QSize:
+        """变体在逻辑坐标下的尺寸（物理像素 / 设备像素比）"""
+        ratio = source.devicePixelRatio()
+        return QSize(round(source_rect.width() / ratio), round(source_rect.height() / ratio))
         
-        # 渲染图片
-        with context:
-            context.painter.drawPixmap(render_pos, transformed_pixmap)
-            
-            
     def _get_transformed_pixmap(self, pixmap: QPixmap, scale_factor: float,
-                              rotation_angle: float, cache_key: str,
-                              is_mirrored: bool = False) -> QPixmap:
+                              rotation_angle: float, cache_key: CacheKey,
+                              is_mirrored: bool = False,
+                              device_pixel_ratio: float = 1.0) -> QPixmap:
         """获取变换后的图片
         
         Args:
@@ -53,19 +188,20 @@ class ComponentRenderer:
             rotation_angle: 旋转角度
             cache_key: 缓存键
             is_mirrored: 是否水平镜像
+            device_pixel_ratio: 目标设备像素比
             
         Returns:
             QPixmap: 变换后的图片
         """
         # 检查缓存
-        if cache_key in self._cache:
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
             
-            return self._cache[cache_key]
-            
-        # 计算缩放后的尺寸
+        # 计算缩放后的尺寸（物理像素，绘制时无需再缩放）
         scaled_size = QSize(
-            int(pixmap.width() * scale_factor),
-            int(pixmap.height() * scale_factor)
+            int(pixmap.width() * scale_factor * device_pixel_ratio),
+            int(pixmap.height() * scale_factor * device_pixel_ratio)
         )
         
         # 缩放图片
@@ -75,87 +211,56 @@ class ComponentRenderer:
             Qt.TransformationMode.SmoothTransformation
         )
         
-        # 创建变换矩阵
-        transform = QTransform()
-        
-        # 如果需要镜像
-        if is_mirrored:
-            # 水平镜像
-            transform.scale(-1, 1)
-            transform.translate(-scaled_pixmap.width(), 0)
-            
-        # 如果需要旋转
-        if rotation_angle != 0:
-            # 移动到中心点
-            transform.translate(scaled_pixmap.width() / 2, scaled_pixmap.height() / 2)
-            # 旋转
-            transform.rotate(rotation_angle)
-            # 移回原位
-            transform.translate(-scaled_pixmap.width() / 2, -scaled_pixmap.height() / 2)
+        # 创建变换矩阵（与图集构建使用同一套变换）
+        transform = build_variant_transform(
+            scaled_pixmap.width(), scaled_pixmap.height(), rotation_angle, is_mirrored
+        )
             
         # 应用变换
         transformed = scaled_pixmap.transformed(
             transform,
             Qt.TransformationMode.SmoothTransformation
         )
+        transformed.setDevicePixelRatio(device_pixel_ratio)
             
         # 缓存结果
-        self._cache[cache_key] = transformed
+        self._cache.put(cache_key, transformed)
     
         return transformed
         
-    def _calculate_render_position(self, context: RenderContext,
-                                 position: QPoint, size: QSize) -> QPoint:
-        """计算实际渲染位置
+    def clear_cache(self):
+        """清除图片缓存"""
+        
+        self._cache.clear()
+        
+    def reset_stats(self):
+        """重置变换缓存的统计计数"""
+        self._cache.reset_stats()
+        
+    def set_atlas(self, atlas: SpriteAtlas):
+        """设置朝向图集（按图集的设备像素比存放）
         
         Args:
-            context: 渲染上下文
-            position: 目标位置
-            size: 图片尺寸
-            
-        Returns:
-            QPoint: 实际渲染位置
+            atlas: 朝向图集
         """
-        # 如果位置是相对于窗口中心的
-        if position.x() == 0 and position.y() == 0:
-            return QPoint(
-                (context.window_size.width() - size.width()) // 2,
-                (context.window_size.height() - size.height()) // 2
-            )
-        return position
+        self._atlases[atlas.device_pixel_ratio] = atlas
+        self._sprites.clear()
+        
+    def atlas(self, device_pixel_ratio: float = 1.0) -> Optional[SpriteAtlas]:
+        """获取指定设备像素比的朝向图集，未就绪时返回 None"""
+        return self._atlases.get(device_pixel_ratio)
         
-    def _draw_debug_info(self, context: RenderContext,
-                        position: QPoint, size: QSize) -> None:
-        """绘制调试信息
+    def invalidate_device_pixel_ratio(self, device_pixel_ratio: float):
+        """丢弃指定设备像素比的图集和变换缓存
         
         Args:
-            context: 渲染上下文
-            position: 渲染位置
-            size: 图片尺寸
+            device_pixel_ratio: 设备像素比
         """
-        # 保存当前画笔状态
-        context.save_state()
-        
-        try:
-            # 设置画笔
-            context.painter.setPen(Qt.PenStyle.SolidLine)
-            context.painter.setBrush(Qt.BrushStyle.NoBrush)
-            
-            # 绘制边界框
-            context.painter.drawRect(position.x(), position.y(),
-                                   size.width(), size.height())
-            
-            # 绘制尺寸信息
-            context.painter.drawText(
-                position.x(), position.y() - 5,
-                f"{size.width()}x{size.height()}"
-            )
-            
-        finally:
-            # 恢复画笔状态
-            context.restore_state()
-            
-    def clear_cache(self):
-        """清除图片缓存"""
+        self._atlases.pop(device_pixel_ratio, None)
+        self._sprites.clear()
+        self._cache.discard_where(lambda key: key[4] == device_pixel_ratio)
         
-        self._cache.clear() 
\ No newline at end of file
+    @property
+    def cache_stats(self) -> CacheStats:
+        """获取变换缓存的统计信息（命中、未命中、淘汰次数等）"""
+        return self._cache.stats
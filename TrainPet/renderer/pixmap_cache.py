@@ -0,0 +1,140 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, Optional
+from PySide6.QtGui import QPixmap
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """缓存统计信息快照"""
+    hits: int  # 命中次数
+    misses: int  # 未命中次数
+    evictions: int  # 淘汰次数
+    entries: int  # 当前条目数
+    bytes_used: int  # 当前占用字节数
+    max_bytes: int  # 字节预算
+
+    @property
+    def hit_rate(self) -> float:
+        """命中率"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class PixmapCache:
+    """按字节预算淘汰的 LRU 图片缓存"""
+    def __init__(self, max_bytes: int, max_entries: int = 0):
+        """初始化缓存
+
+        Args:
+            max_bytes: 字节预算，超出后按最近最少使用顺序淘汰
+            max_entries: 最大条目数，0 表示不限制
+        """
+        self._max_bytes = max_bytes
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, QPixmap]" = OrderedDict()
+        self._bytes_used = 0
+
+        # 统计计数
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def pixmap_bytes(pixmap: QPixmap) -> int:
+        """估算图片占用的字节数
+
+        Args:
+            pixmap: 图片
+
+        Returns:
+            int: 字节数
+        """
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def get(self, key: Hashable) -> Optional[QPixmap]:
+        """获取缓存的图片，命中时将其标记为最近使用
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            Optional[QPixmap]: 缓存的图片，未命中时返回 None
+        """
+        pixmap = self._entries.get(key)
+        if pixmap is None:
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return pixmap
+
+    def put(self, key: Hashable, pixmap: QPixmap) -> None:
+        """放入图片，必要时淘汰最久未使用的条目
+
+        Args:
+            key: 缓存键
+            pixmap: 图片
+        """
+        size = self.pixmap_bytes(pixmap)
+
+        # 单张图片超出预算时不缓存
+        if size > self._max_bytes:
+            return
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes_used -= self.pixmap_bytes(old)
+
+        self._entries[key] = pixmap
+        self._bytes_used += size
+
+        while self._bytes_used > self._max_bytes or \
+                (self._max_entries and len(self._entries) > self._max_entries):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes_used -= self.pixmap_bytes(evicted)
+            self._evictions += 1
+
+    def discard_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """移除键满足条件的条目（不计入淘汰次数）
+
+        Args:
+            predicate: 判断键是否需要移除
+
+        Returns:
+            int: 移除的条目数
+        """
+        keys = [key for key in self._entries if predicate(key)]
+        for key in keys:
+            self._bytes_used -= self.pixmap_bytes(self._entries.pop(key))
+        return len(keys)
+
+    def clear(self) -> None:
+        """清空缓存（统计计数保留）"""
+        self._entries.clear()
+        self._bytes_used = 0
+
+    def reset_stats(self) -> None:
+        """重置统计计数"""
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        """获取统计信息"""
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            entries=len(self._entries),
+            bytes_used=self._bytes_used,
+            max_bytes=self._max_bytes
+        )
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,268 @@
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from PySide6.QtCore import QMutex, QMutexLocker, QPoint, QRect, QRectF, Qt, QThread, \
+    QWaitCondition, Signal
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtWidgets import QApplication, QWidget
+from .component_renderer import snap_to_pixel
+from utils.frame_profiler import FrameProfiler
+
+# 一个组件：(图集中的区域, 中心 x, 中心 y, 额外旋转角度)，坐标为窗口逻辑坐标；
+# 90 度整数倍的朝向直接取对应变体（额外旋转为 0），中间角度取 0 度变体再旋转
+Sprite = Tuple[QRect, float, float, float]
+
+
+@dataclass(frozen=True)
+class FrameSnapshot:
+    """渲染一帧所需的全部输入（GUI 线程生成，之后只读）"""
+    target: QWidget  # 显示这一帧的窗口（只作为键，渲染线程不访问）
+    rect: QRect  # 这一帧需要绘制的区域（窗口逻辑坐标，包住所有组件和统计信息）
+    device_pixel_ratio: float  # 窗口的设备像素比
+    atlas: QImage  # 朝向图集（隐式共享，两个线程都只读）
+    sprites: Tuple[Sprite, ...]  # 从车头到车尾的组件
+    overlay_text: Optional[str] = None  # 统计信息，None 表示不显示
+
+
+@dataclass(frozen=True)
+class RenderWorkerStats:
+    """渲染线程统计信息快照"""
+    submitted: int  # 提交的帧数
+    rendered: int  # 实际渲染的帧数
+    superseded: int  # 渲染前被更新的帧取代的帧数
+    render_seconds: float  # 渲染线程绘制耗时合计（秒）
+
+
+class _FrontBuffer:
+    """一个窗口的前缓冲（GUI 线程只在锁内读取）"""
+    __slots__ = ('front', 'front_rect', 'front_source')
+
+    def __init__(self):
+        self.front: Optional[QImage] = None
+        self.front_rect = QRect()  # 前缓冲贴到窗口上的区域（逻辑坐标）
+        self.front_source = QRect()  # 前缓冲中使用的部分（物理像素）
+
+
+class RenderWorker(QThread):
+    """后台渲染线程
+
+    GUI 线程推进状态后提交一帧的快照，渲染线程把整列列车合成到后缓冲
+    （QImage，QPixmap 只能在 GUI 线程使用），完成后在锁内交换前后缓冲并
+    通知窗口重绘，绘制事件只需把前缓冲贴到窗口上。同一窗口尚未渲染的
+    快照只保留最新的一帧。
+
+    多个窗口可以共用一个渲染线程：每个窗口只有自己的前缓冲，线程一次只渲染
+    一帧，后缓冲由所有窗口共用。缓冲只覆盖组件所在的区域（不是整个窗口），
+    够用时沿用，每帧只使用左上角与区域一样大的部分。
+    """
+    # 某个窗口的新一帧已就绪（跨线程信号，在 GUI 线程处理）
+    frame_ready = Signal(object)
+
+    def __init__(self, parent=None):
+        """初始化渲染线程（在 GUI 线程创建，第一次提交时启动）
+
+        Args:
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._mutex = QMutex()
+        self._wake = QWaitCondition()
+        self._idle = QWaitCondition()
+        self._busy = False  # 正在渲染一帧
+        self._pending: Dict[QWidget, FrameSnapshot] = {}  # 等待渲染的快照（每个窗口最新一帧）
+        self._buffers: Dict[QWidget, _FrontBuffer] = {}
+        self._back: Optional[QImage] = None  # 共用的后缓冲，只有渲染线程访问
+        self._stopping = False
+
+        # 统计计数
+        self._submitted = 0
+        self._rendered = 0
+        self._superseded = 0
+        self._render_seconds = 0.0
+
+        self.frame_ready.connect(self._on_frame_ready)
+
+        # 退出事件循环时结束线程（线程对象不能在运行中被销毁）
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+
+    def submit(self, snapshot: FrameSnapshot):
+        """提交一帧快照，取代同一窗口尚未渲染的快照
+
+        Args:
+            snapshot: 帧快照
+        """
+        with QMutexLocker(self._mutex):
+            if snapshot.target in self._pending:
+                self._superseded += 1
+            self._pending[snapshot.target] = snapshot
+            self._buffers.setdefault(snapshot.target, _FrontBuffer())
+            self._submitted += 1
+            self._wake.wakeOne()
+        if not self.isRunning():
+            self._stopping = False
+            self.start()
+
+    def blit(self, painter: QPainter, target: QWidget) -> bool:
+        """把窗口的前缓冲贴到窗口上（GUI 线程）
+
+        Args:
+            painter: 窗口的画笔
+            target: 窗口
+
+        Returns:
+            bool: 是否已有渲染好的帧
+        """
+        with QMutexLocker(self._mutex):
+            buffer = self._buffers.get(target)
+            if buffer is None or buffer.front is None:
+                return False
+            painter.drawImage(buffer.front_rect.topLeft(), buffer.front, buffer.front_source)
+            return True
+
+    def wait_until_idle(self, timeout_ms: int = -1) -> bool:
+        """阻塞等待所有已提交的快照渲染完成（基准测试逐帧测量时使用）
+
+        Args:
+            timeout_ms: 超时时间（毫秒），-1 表示一直等待
+
+        Returns:
+            bool: 是否已全部渲染完成
+        """
+        with QMutexLocker(self._mutex):
+            while (self._pending or self._busy) and self.isRunning():
+                if timeout_ms < 0:
+                    self._idle.wait(self._mutex)
+                elif not self._idle.wait(self._mutex, timeout_ms):
+                    return False
+            return not self._pending
+
+    def discard(self, target: QWidget):
+        """丢弃窗口的快照和前缓冲（窗口关闭时调用）"""
+        with QMutexLocker(self._mutex):
+            self._pending.pop(target, None)
+            self._buffers.pop(target, None)
+
+    def stop(self):
+        """结束渲染线程并等待退出"""
+        with QMutexLocker(self._mutex):
+            self._stopping = True
+            self._pending.clear()
+            self._wake.wakeAll()
+        self.wait()
+
+    @property
+    def stats(self) -> RenderWorkerStats:
+        """获取统计信息"""
+        with QMutexLocker(self._mutex):
+            return RenderWorkerStats(
+                submitted=self._submitted,
+                rendered=self._rendered,
+                superseded=self._superseded,
+                render_seconds=self._render_seconds
+            )
+
+    def reset_stats(self):
+        """重置统计计数"""
+        with QMutexLocker(self._mutex):
+            self._submitted = self._rendered = self._superseded = 0
+            self._render_seconds = 0.0
+
+    def run(self):
+        """依次渲染等待中的快照"""
+        while True:
+            with QMutexLocker(self._mutex):
+                while not self._pending and not self._stopping:
+                    self._wake.wait(self._mutex)
+                if self._stopping:
+                    self._idle.wakeAll()
+                    return
+                target = next(iter(self._pending))
+                snapshot = self._pending.pop(target)
+                buffer = self._buffers[target]
+                self._busy = True
+
+            # 后缓冲只有渲染线程访问，绘制时不持锁
+            start = time.perf_counter()
+            back, source = self._render(snapshot, self._back)
+            elapsed = time.perf_counter() - start
+
+            with QMutexLocker(self._mutex):
+                self._busy = False
+                if not self._pending:
+                    self._idle.wakeAll()
+                # 渲染期间窗口已关闭，后缓冲留给下一帧
+                if self._buffers.get(target) is not buffer:
+                    self._back = back
+                    continue
+                self._back, buffer.front = buffer.front, back
+                buffer.front_rect = snapshot.rect
+                buffer.front_source = source
+                self._rendered += 1
+                self._render_seconds += elapsed
+            self.frame_ready.emit(target)
+
+    @staticmethod
+    def _render(snapshot: FrameSnapshot, image: Optional[QImage]) -> Tuple[QImage, QRect]:
+        """把快照合成到图片左上角，图片尺寸不合适时重新分配
+
+        Args:
+            snapshot: 帧快照
+            image: 上一次使用的后缓冲
+
+        Returns:
+            Tuple[QImage, QRect]: 合成结果（已设置设备像素比）及其中使用的部分（物理像素）
+        """
+        rect = snapshot.rect
+        ratio = snapshot.device_pixel_ratio
+        width = math.ceil(rect.width() * ratio)
+        height = math.ceil(rect.height() * ratio)
+        # 后缓冲太小或远大于需要时按这一帧的尺寸重新分配
+        if image is None or image.width() < width or image.height() < height or \
+           image.width() * image.height() > width * height * 2:
+            image = QImage(max(1, width), max(1, height),
+                           QImage.Format.Format_ARGB32_Premultiplied)
+        image.setDevicePixelRatio(ratio)
+
+        atlas = snapshot.atlas
+        atlas_ratio = atlas.devicePixelRatio()
+        painter = QPainter(image)
+        try:
+            # 只清空这一帧使用的部分
+            painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+            painter.fillRect(QRectF(0, 0, width / ratio, height / ratio), Qt.GlobalColor.transparent)
+            painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.translate(-rect.x(), -rect.y())
+            for source_rect, x, y, rotation_angle in snapshot.sprites:
+                sprite_width = round(source_rect.width() / atlas_ratio)
+                sprite_height = round(source_rect.height() / atlas_ratio)
+                if rotation_angle == 0:
+                    painter.drawImage(
+                        QPoint(snap_to_pixel(x - sprite_width / 2),
+                               snap_to_pixel(y - sprite_height / 2)),
+                        atlas, source_rect
+                    )
+                    continue
+                # 与 ComponentRenderer 一致：绕取整后的中心点旋转 0 度变体
+                painter.save()
+                painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+                painter.translate(snap_to_pixel(x), snap_to_pixel(y))
+                painter.rotate(rotation_angle)
+                painter.drawImage(
+                    QRectF(-sprite_width / 2, -sprite_height / 2, sprite_width, sprite_height),
+                    atlas, QRectF(source_rect)
+                )
+                painter.restore()
+            if snapshot.overlay_text is not None:
+                FrameProfiler.draw_text(painter, snapshot.overlay_text)
+        finally:
+            painter.end()
+        return image, QRect(0, 0, width, height)
+
+    def _on_frame_ready(self, target: QWidget):
+        """新一帧就绪，请求窗口重绘（GUI 线程）"""
+        if target in self._buffers:
+            target.update()
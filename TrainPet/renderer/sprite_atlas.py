@@ -0,0 +1,202 @@
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+from PySide6.QtCore import QThread, QRect, QSize, Qt, Signal
+from PySide6.QtGui import QImage, QPainter, QPixmap, QTransform
+
+# 图集键：(图片缓存键, 缩放因子, 旋转角度, 是否镜像, 设备像素比)，与组件渲染器的缓存键一致
+AtlasKey = Tuple[Hashable, float, float, bool, float]
+
+
+def build_variant_transform(width: int, height: int, rotation_angle: float,
+                            is_mirrored: bool) -> QTransform:
+    """构建先镜像再旋转的变换矩阵
+
+    与画笔世界变换旋转镜像后的 0 度变体（转弯时的中间角度）顺序一致，
+    镜像变体在 89、90、91 度之间车头朝向连续。
+
+    Args:
+        width: 缩放后的图片宽度
+        height: 缩放后的图片高度
+        rotation_angle: 旋转角度
+        is_mirrored: 是否水平镜像
+
+    Returns:
+        QTransform: 变换矩阵
+    """
+    transform = QTransform()
+
+    # QTransform 后调用的操作先作用于坐标：先写旋转，再写镜像
+
+    # 绕中心旋转
+    if rotation_angle != 0:
+        transform.translate(width / 2, height / 2)
+        transform.rotate(rotation_angle)
+        transform.translate(-width / 2, -height / 2)
+
+    # 水平镜像
+    if is_mirrored:
+        transform.scale(-1, 1)
+        transform.translate(-width, 0)
+
+    return transform
+
+
+def make_variant_image(image: QImage, scale_factor: float, rotation_angle: float,
+                       is_mirrored: bool, device_pixel_ratio: float = 1.0) -> QImage:
+    """生成单个朝向变体（可在非 GUI 线程调用）
+
+    Args:
+        image: 原始图片
+        scale_factor: 缩放因子
+        rotation_angle: 旋转角度
+        is_mirrored: 是否水平镜像
+        device_pixel_ratio: 设备像素比，按物理像素生成以避免绘制时再次缩放
+
+    Returns:
+        QImage: 变换后的图片（物理像素，未设置设备像素比）
+    """
+    physical_scale = scale_factor * device_pixel_ratio
+    scaled = image.scaled(
+        QSize(int(image.width() * physical_scale), int(image.height() * physical_scale)),
+        Qt.AspectRatioMode.KeepAspectRatio,
+        Qt.TransformationMode.SmoothTransformation
+    )
+    transform = build_variant_transform(
+        scaled.width(), scaled.height(), rotation_angle, is_mirrored
+    )
+    return scaled.transformed(transform, Qt.TransformationMode.SmoothTransformation)
+
+
+class SpriteAtlas:
+    """朝向精灵图集，所有变体打包在一张图片中（区域为物理像素）"""
+    def __init__(self, pixmap: QPixmap, rects: Dict[AtlasKey, QRect],
+                 image: Optional[QImage] = None):
+        self._pixmap = pixmap
+        self._rects = rects
+        self._image = image
+
+    @classmethod
+    def from_image(cls, image: QImage, rects: Dict[AtlasKey, QRect],
+                   keep_image: bool = False) -> 'SpriteAtlas':
+        """由工作线程生成的图片创建图集（必须在 GUI 线程调用）
+
+        Args:
+            image: 图集图片
+            rects: 变体区域
+            keep_image: 是否保留 QImage（渲染线程只能使用 QImage）
+        """
+        return cls(QPixmap.fromImage(image), rects, image if keep_image else None)
+
+    @property
+    def pixmap(self) -> QPixmap:
+        """获取图集图片"""
+        return self._pixmap
+
+    @property
+    def image(self) -> Optional[QImage]:
+        """获取图集的 QImage（创建时未保留则为 None）"""
+        return self._image
+
+    @property
+    def device_pixel_ratio(self) -> float:
+        """图集对应的设备像素比"""
+        return self._pixmap.devicePixelRatio()
+
+    def source_rect(self, key: AtlasKey) -> Optional[QRect]:
+        """获取变体在图集中的区域，不存在时返回 None"""
+        return self._rects.get(key)
+
+    def __contains__(self, key: AtlasKey) -> bool:
+        return key in self._rects
+
+    def __len__(self) -> int:
+        return len(self._rects)
+
+
+class AtlasBuilder(QThread):
+    """在工作线程中构建朝向图集"""
+    # 构建完成信号：(图集图片, 变体区域字典)，图片已设置设备像素比
+    atlas_ready = Signal(QImage, object)
+
+    # 图集最大宽度和变体间距（像素）
+    MAX_WIDTH = 2048
+    PADDING = 1
+
+    def __init__(self, sources: Sequence[Tuple[Hashable, QImage]], scale_factor: float,
+                 angles: Iterable[float], mirrors: Iterable[bool] = (False, True),
+                 device_pixel_ratio: float = 1.0, parent=None):
+        """初始化构建器
+
+        Args:
+            sources: (图片缓存键, 原始图片) 列表，图片需在 GUI 线程由 QPixmap 转换得到
+            scale_factor: 缩放因子
+            angles: 需要预生成的旋转角度
+            mirrors: 需要预生成的镜像状态
+            device_pixel_ratio: 目标屏幕的设备像素比
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._sources = list(sources)
+        self._scale_factor = scale_factor
+        self._angles = tuple(angles)
+        self._mirrors = tuple(mirrors)
+        self._device_pixel_ratio = device_pixel_ratio
+
+    @property
+    def device_pixel_ratio(self) -> float:
+        """构建的目标设备像素比"""
+        return self._device_pixel_ratio
+
+    def run(self):
+        """生成所有变体并打包"""
+        variants: List[Tuple[AtlasKey, QImage]] = []
+        for source_key, image in self._sources:
+            for angle in self._angles:
+                for mirrored in self._mirrors:
+                    key = (source_key, self._scale_factor, angle, mirrored,
+                           self._device_pixel_ratio)
+                    variants.append((key, make_variant_image(
+                        image, self._scale_factor, angle, mirrored, self._device_pixel_ratio
+                    )))
+
+        atlas, rects = self._pack(variants)
+        atlas.setDevicePixelRatio(self._device_pixel_ratio)
+        self.atlas_ready.emit(atlas, rects)
+
+    def _pack(self, variants: List[Tuple[AtlasKey, QImage]]) -> Tuple[QImage, Dict[AtlasKey, QRect]]:
+        """按行（shelf）打包变体
+
+        Args:
+            variants: (图集键, 变体图片) 列表
+
+        Returns:
+            Tuple[QImage, Dict[AtlasKey, QRect]]: 图集图片和变体区域
+        """
+        pad = self.PADDING
+        width = max([self.MAX_WIDTH] + [image.width() + pad for _, image in variants])
+
+        # 高度从大到小排列，减少每行的空白
+        ordered = sorted(variants, key=lambda item: item[1].height(), reverse=True)
+
+        rects: Dict[AtlasKey, QRect] = {}
+        x = y = row_height = 0
+        for key, image in ordered:
+            if x + image.width() > width:
+                x = 0
+                y += row_height + pad
+                row_height = 0
+            rects[key] = QRect(x, y, image.width(), image.height())
+            x += image.width() + pad
+            row_height = max(row_height, image.height())
+
+        atlas = QImage(width, max(y + row_height, 1), QImage.Format.Format_ARGB32_Premultiplied)
+        atlas.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(atlas)
+        try:
+            painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+            for key, image in ordered:
+                painter.drawImage(rects[key].topLeft(), image)
+        finally:
+            painter.end()
+
+        return atlas, rects
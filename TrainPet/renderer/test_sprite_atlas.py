@@ -0,0 +1,77 @@
+from PySide6.QtCore import QPointF
+from PySide6.QtGui import QColor, QImage, QPainter, QPixmap
+
+from renderer.component_renderer import ComponentRenderer
+from renderer.sprite_atlas import AtlasBuilder, SpriteAtlas
+
+CANVAS = 160
+
+
+def make_source() -> QPixmap:
+    """左半红、右半蓝的长条（原图车头朝左，红色一端代表车头）"""
+    image = QImage(80, 20, QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(QColor('red'))
+    painter = QPainter(image)
+    painter.fillRect(40, 0, 40, 20, QColor('blue'))
+    painter.end()
+    return QPixmap.fromImage(image)
+
+
+def build_atlas(pixmap: QPixmap, angles) -> SpriteAtlas:
+    """在当前线程同步构建图集"""
+    result = []
+    builder = AtlasBuilder([(pixmap.cacheKey(), pixmap.toImage())], 1.0, angles)
+    builder.atlas_ready.connect(lambda image, rects: result.append((image, rects)))
+    builder.run()
+    image, rects = result[0]
+    return SpriteAtlas.from_image(image, rects)
+
+
+def render(renderer: ComponentRenderer, pixmap: QPixmap, angle: float) -> QImage:
+    """以画布中心为组件中心绘制镜像组件"""
+    canvas = QImage(CANVAS, CANVAS, QImage.Format.Format_ARGB32_Premultiplied)
+    canvas.fill(0)
+    painter = QPainter(canvas)
+    renderer.render_component_centered(painter, pixmap, QPointF(CANVAS / 2, CANVAS / 2),
+                                       rotation_angle=angle, is_mirrored=True)
+    painter.end()
+    return canvas
+
+
+def end_colors(canvas: QImage) -> tuple:
+    """竖直方向两端的颜色 (上端, 下端)"""
+    center = CANVAS // 2
+    return canvas.pixelColor(center, center - 30).name(), canvas.pixelColor(center, center + 30).name()
+
+
+def test_mirrored_atlas_variant_matches_painter_rotation(qapp):
+    """图集中的镜像 90/270 度变体与画笔旋转镜像 0 度变体朝向一致"""
+    pixmap = make_source()
+    renderer = ComponentRenderer()
+    renderer.set_atlas(build_atlas(pixmap, (0.0, 90.0, 270.0)))
+
+    # 镜像后红色车头朝右，顺时针转 90 度朝下；89、91 度由画笔旋转，90 度取自图集
+    for angle in (89.0, 90.0, 91.0):
+        assert end_colors(render(renderer, pixmap, angle)) == ('#0000ff', '#ff0000'), angle
+    for angle in (269.0, 270.0, 271.0):
+        assert end_colors(render(renderer, pixmap, angle)) == ('#ff0000', '#0000ff'), angle
+
+
+def test_mirrored_atlas_variant_is_pixel_identical_to_painter_rotation(qapp):
+    """90 度时图集变体和画笔旋转 0 度变体逐像素一致"""
+    pixmap = make_source()
+    with_atlas = ComponentRenderer()
+    with_atlas.set_atlas(build_atlas(pixmap, (0.0, 90.0)))
+    atlas_canvas = render(with_atlas, pixmap, 90.0)
+
+    rotated = ComponentRenderer()
+    canvas = QImage(CANVAS, CANVAS, QImage.Format.Format_ARGB32_Premultiplied)
+    canvas.fill(0)
+    painter = QPainter(canvas)
+    rotated._render_rotated(painter, pixmap, QPointF(CANVAS / 2, CANVAS / 2), 1.0, 90.0, True, 1.0)
+    painter.end()
+
+    # 旋转路径开启平滑变换，只比较远离边缘的像素
+    for x in range(CANVAS // 2 - 5, CANVAS // 2 + 5):
+        for y in range(CANVAS // 2 - 35, CANVAS // 2 + 35):
+            assert atlas_canvas.pixelColor(x, y) == canvas.pixelColor(x, y), (x, y)
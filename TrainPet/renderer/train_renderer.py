@@ -1,149 +1,352 @@
+import math
 
-from typing import List, Optional
-from PySide6.QtCore import QPoint, QSize, Qt
-from PySide6.QtGui import QPainter, QColor
-from .render_context import RenderContext
-from .component_renderer import ComponentRenderer
-from components.train_component import TrainComponent
+from typing import Dict, List, Optional, Sequence, Tuple
+from PySide6.QtCore import QPoint, QPointF, Qt, QRect
+from PySide6.QtWidgets import QWidget
+from PySide6.QtGui import QPainter, QColor, QPixmap, QImage
+from .component_renderer import ComponentRenderer, is_axis_aligned, snap_to_pixel
+from .pixmap_cache import CacheStats, PixmapCache
+from .render_worker import FrameSnapshot, RenderWorker
+from .sprite_atlas import AtlasBuilder, SpriteAtlas
+from components.train_layout import ComponentPlacement
+from train_config import train_config
+from utils.frame_profiler import FrameProfiler
 
 class TrainRenderer:
     """列车渲染器，负责整体渲染流程"""
-    def __init__(self, debug_mode: bool = False):
+    def __init__(self, debug_mode: bool = False, render_thread: bool = False):
+        """初始化渲染器
+        
+        Args:
+            debug_mode: 是否绘制调试信息
+            render_thread: 是否在后台渲染线程中合成整帧（所有使用该渲染器的窗口共用一个线程）
+        """
         self._debug_mode = debug_mode
 
         # 创建组件渲染器
         self._component_renderer = ComponentRenderer()
         
-      
+        # 图集构建参数：(原始图片, 缩放因子, 旋转角度)，按需为新的设备像素比构建
+        self._atlas_request: Optional[Tuple[List[QPixmap], float, Tuple[float, ...]]] = None
         
-    def render(self, painter: QPainter, components: List[TrainComponent],
-              window_size: QSize, scale_factor: float = 1.0,
-              rotation_angle: float = 0.0, center_point: Optional[QPoint] = None,
-              is_mirrored: bool = False) -> None:
-        """渲染列车
+        # 正在运行的图集构建线程（按设备像素比）
+        self._atlas_builders: Dict[float, AtlasBuilder] = {}
+        
+        # 直线行驶时整列列车合成后的长条图片
+        self._strip_cache = PixmapCache(
+            train_config.STRIP_CACHE_MAX_BYTES, train_config.STRIP_CACHE_SIZE
+        )
+        
+        # 后台渲染线程（QPixmap 只能在 GUI 线程使用，图集需同时保留 QImage）
+        self._render_worker: Optional[RenderWorker] = RenderWorker() if render_thread else None
+        
+    def prepare_atlas(self, pixmaps: Sequence[QPixmap], scale_factor: float,
+                      angles: Sequence[float], device_pixel_ratio: float = 1.0) -> None:
+        """在工作线程中预生成所有朝向变体，完成前渲染回退到实时变换
         
         Args:
-            painter: 画笔对象
-            components: 列车组件列表
-            window_size: 窗口大小
+            pixmaps: 需要预生成的原始图片（车头、车厢、车尾）
             scale_factor: 缩放因子
-            rotation_angle: 旋转角度
-            center_point: 旋转中心点
-            is_mirrored: 是否水平镜像
+            angles: 需要预生成的旋转角度
+            device_pixel_ratio: 首先构建的设备像素比
         """
-        if not components:
-            
+        self._atlas_request = (list(pixmaps), scale_factor, tuple(angles))
+        self.ensure_atlas(device_pixel_ratio)
+        
+    def ensure_atlas(self, device_pixel_ratio: float) -> None:
+        """确保指定设备像素比的图集已构建或正在构建
+        
+        Args:
+            device_pixel_ratio: 设备像素比
+        """
+        if self._atlas_request is None or \
+           device_pixel_ratio in self._atlas_builders or \
+           self._component_renderer.atlas(device_pixel_ratio) is not None:
             return
             
-        # 创建渲染上下文
-        context = RenderContext(
-            painter=painter,
-            window_size=window_size,
-            scale_factor=scale_factor,
-            rotation_angle=rotation_angle,
-            center_point=center_point,
-            debug_mode=self._debug_mode
-        )
+        pixmaps, scale_factor, angles = self._atlas_request
         
-        # 计算组件位置
-        positions = self._calculate_component_positions(
-            context, components
-        )
+        # QPixmap 只能在 GUI 线程使用，先转换为 QImage 再交给工作线程
+        sources = [(pixmap.cacheKey(), pixmap.toImage()) for pixmap in pixmaps]
         
-        # 渲染每个组件
-        for i, (component, position) in enumerate(zip(components, positions)):
-            self._component_renderer.render_component(
-                context=context,
-                pixmap=component.original_pixmap,
-                position=position,
-                scale_factor=scale_factor,
-                rotation_angle=rotation_angle,
-                is_mirrored=is_mirrored
-            )
-            
-        # 绘制调试信息
-        if self._debug_mode:
-            self._draw_debug_info(context, components, positions)
+        builder = AtlasBuilder(sources, scale_factor, angles,
+                               device_pixel_ratio=device_pixel_ratio)
+        builder.atlas_ready.connect(self._on_atlas_ready)
+        builder.finished.connect(
+            lambda ratio=device_pixel_ratio: self._on_atlas_builder_finished(ratio)
+        )
+        self._atlas_builders[device_pixel_ratio] = builder
+        builder.start(AtlasBuilder.Priority.LowPriority)
         
-    def _calculate_component_positions(self, context: RenderContext,
-                                    components: List[TrainComponent]) -> List[QPoint]:
-        """计算组件位置
+    def wait_for_atlas(self, timeout_ms: int = -1) -> bool:
+        """阻塞等待所有图集构建线程结束
         
         Args:
-            context: 渲染上下文
-            components: 组件列表
+            timeout_ms: 每个线程的超时时间（毫秒），-1 表示一直等待
             
         Returns:
-            List[QPoint]: 组件位置列表
+            bool: 构建线程是否均已结束
         """
-        positions = []
-        current_x = 0
+        finished = True
+        for builder in list(self._atlas_builders.values()):
+            if timeout_ms < 0:
+                finished = builder.wait() and finished
+            else:
+                finished = builder.wait(timeout_ms) and finished
+        return finished
         
-        # 计算总宽度
-        total_width = sum(
-            int(comp.original_pixmap.width() * context.scale_factor)
-            for comp in components
-        )
+    def invalidate_device_pixel_ratio(self, device_pixel_ratio: float):
+        """丢弃某个设备像素比的全部缓存（该像素比的屏幕已不存在）
+        
+        Args:
+            device_pixel_ratio: 设备像素比
+        """
+        self._component_renderer.invalidate_device_pixel_ratio(device_pixel_ratio)
+        self._strip_cache.discard_where(lambda key: key[4] == device_pixel_ratio)
+        
+    def _on_atlas_ready(self, image: QImage, rects: Dict[object, QRect]):
+        """图集构建完成（GUI 线程）"""
+        self._component_renderer.set_atlas(SpriteAtlas.from_image(
+            image, rects, keep_image=self._render_worker is not None
+        ))
+        
+    def _on_atlas_builder_finished(self, device_pixel_ratio: float):
+        """释放构建线程"""
+        builder = self._atlas_builders.pop(device_pixel_ratio, None)
+        if builder is not None:
+            builder.deleteLater()
+        
+    def render_placements(self, painter: QPainter,
+                          placements: Sequence[ComponentPlacement],
+                          origin: QPoint, scale_factor: float,
+                          device_pixel_ratio: float = 1.0) -> None:
+        """按屏幕摆放渲染整列列车
         
-        # 计算起始位置（水平居中）
-        start_x = (context.window_size.width() - total_width) // 2
+        直线行驶时所有组件朝向相同且共线，直接绘制缓存的合成长条；
+        转弯时逐个组件绘制，中间角度用画笔的世界变换旋转 0 度变体。
+        
+        Args:
+            painter: 画笔对象
+            placements: 从车头到车尾的组件摆放（屏幕坐标）
+            origin: 窗口左上角的屏幕坐标
+            scale_factor: 缩放因子
+            device_pixel_ratio: 窗口所在屏幕的设备像素比
+        """
+        if not placements:
+            return
+            
+        strip = None
+        if len(placements) > 1 and self._is_straight(placements):
+            # 取每个组件的朝向变体和左上角位置（窗口逻辑坐标）
+            variants = []
+            for placement in placements:
+                source, source_rect = self._component_renderer.get_variant(
+                    placement.component.original_pixmap, scale_factor,
+                    placement.rotation_angle, placement.is_mirrored, device_pixel_ratio
+                )
+                size = ComponentRenderer.logical_size(source, source_rect)
+                top_left = QPoint(
+                    snap_to_pixel(placement.x - size.width() / 2) - origin.x(),
+                    snap_to_pixel(placement.y - size.height() / 2) - origin.y()
+                )
+                variants.append((source, source_rect, top_left))
+            strip = self._get_strip(placements, variants, scale_factor, device_pixel_ratio)
+            
+        if strip is not None:
+            pixmap, offset = strip
+            painter.drawPixmap(variants[0][2] + offset, pixmap)
+        else:
+            # 转弯时逐个组件绘制（中间角度由画笔旋转）
+            render = self._component_renderer.render_component_centered
+            origin_x, origin_y = origin.x(), origin.y()
+            for placement in placements:
+                render(
+                    painter, placement.component.original_pixmap,
+                    QPointF(placement.x - origin_x, placement.y - origin_y),
+                    scale_factor, placement.rotation_angle, placement.is_mirrored,
+                    device_pixel_ratio
+                )
+                
+        # 绘制调试信息
+        if self._debug_mode:
+            painter.save()
+            try:
+                painter.setPen(QColor(255, 0, 0))  # 红色
+                painter.drawText(10, 20, f"旋转角度: {placements[0].rotation_angle}°")
+            finally:
+                painter.restore()
+                
+    def frame_snapshot(self, target: QWidget,
+                       placements: Sequence[ComponentPlacement], origin: QPoint,
+                       scale_factor: float, device_pixel_ratio: float = 1.0,
+                       overlay_text: Optional[str] = None) -> Optional[FrameSnapshot]:
+        """生成交给渲染线程的帧快照（GUI 线程），只查找各组件在图集中的区域
         
-        # 计算每个组件的位置
-        for component in components:
-            # 计算组件宽度
-            width = int(component.original_pixmap.width() * context.scale_factor)
+        Args:
+            target: 显示这一帧的窗口
+            placements: 从车头到车尾的组件摆放（屏幕坐标）
+            origin: 窗口左上角的屏幕坐标
+            scale_factor: 缩放因子
+            device_pixel_ratio: 窗口所在屏幕的设备像素比
+            overlay_text: 统计信息，None 表示不显示
             
-            # 计算垂直位置（垂直居中）
-            y = (context.window_size.height() - 
-                 int(component.original_pixmap.height() * context.scale_factor)) // 2
+        Returns:
+            Optional[FrameSnapshot]: 帧快照，图集未就绪或缺少变体时为 None
+        """
+        atlas = self._component_renderer.atlas(device_pixel_ratio)
+        if atlas is None or atlas.image is None:
+            return None
             
-            # 添加位置
-            positions.append(QPoint(start_x + current_x, y))
-            current_x += width
+        # 只合成组件（和统计信息）所在的区域：按变体尺寸（旋转时按对角线）求
+        # 包围盒，多留 1 像素容纳取整误差
+        origin_x, origin_y = origin.x(), origin.y()
+        ratio = atlas.device_pixel_ratio
+        left = top = float('inf')
+        right = bottom = float('-inf')
+        sprites = []
+        for placement in placements:
+            # 图集中没有的中间角度取 0 度变体，由渲染线程旋转
+            angle = placement.rotation_angle
+            cache_key = placement.component.original_pixmap.cacheKey()
+            source_rect = atlas.source_rect((
+                cache_key, scale_factor, angle, placement.is_mirrored, device_pixel_ratio
+            ))
+            baked = source_rect is not None
+            if not baked and not is_axis_aligned(angle):
+                source_rect = atlas.source_rect((
+                    cache_key, scale_factor, 0.0, placement.is_mirrored, device_pixel_ratio
+                ))
+            if source_rect is None:
+                return None
+            x, y = placement.x - origin_x, placement.y - origin_y
+            sprites.append((source_rect, x, y, 0.0 if baked else angle))
+            if baked:
+                half_width = source_rect.width() / ratio / 2
+                half_height = source_rect.height() / ratio / 2
+            else:
+                half_width = half_height = math.hypot(source_rect.width(),
+                                                      source_rect.height()) / ratio / 2
+            if x - half_width < left:
+                left = x - half_width
+            if y - half_height < top:
+                top = y - half_height
+            if x + half_width > right:
+                right = x + half_width
+            if y + half_height > bottom:
+                bottom = y + half_height
+        if not sprites:
+            return None
+        rect = QRect(math.floor(left) - 1, math.floor(top) - 1,
+                     math.ceil(right) - math.floor(left) + 2,
+                     math.ceil(bottom) - math.floor(top) + 2)
+        if overlay_text is not None:
+            rect = rect.united(FrameProfiler.text_rect(overlay_text))
             
-        return positions
+        return FrameSnapshot(
+            target=target, rect=rect, device_pixel_ratio=device_pixel_ratio,
+            atlas=atlas.image, sprites=tuple(sprites), overlay_text=overlay_text
+        )
+        
+    @property
+    def render_worker(self) -> Optional[RenderWorker]:
+        """后台渲染线程（未开启时为 None）"""
+        return self._render_worker
+        
+    @staticmethod
+    def _is_straight(placements: Sequence[ComponentPlacement]) -> bool:
+        """所有组件朝向相同（且为 90 度整数倍）、中心共线时视为直线行驶"""
+        head, last = placements[0], placements[-1]
+        if not is_axis_aligned(head.rotation_angle):
+            return False
+        dx, dy = last.x - head.x, last.y - head.y
+        length = (dx * dx + dy * dy) ** 0.5
+        if length == 0:
+            return False
+        for placement in placements:
+            if placement.rotation_angle != head.rotation_angle or \
+               placement.is_mirrored != head.is_mirrored:
+                return False
+            # 到车头-车尾连线的垂直距离
+            if abs((placement.x - head.x) * dy - (placement.y - head.y) * dx) / length > 0.5:
+                return False
+        return True
         
-    def _draw_debug_info(self, context: RenderContext,
-                        components: List[TrainComponent],
-                        positions: List[QPoint]) -> None:
-        """绘制调试信息
+    def _get_strip(self, placements: Sequence[ComponentPlacement],
+                   variants: List[Tuple[QPixmap, QRect, QPoint]],
+                   scale_factor: float,
+                   device_pixel_ratio: float = 1.0) -> Optional[Tuple[QPixmap, QPoint]]:
+        """获取（或合成）整列列车的长条图片
         
         Args:
-            context: 渲染上下文
-            components: 组件列表
-            positions: 位置列表
+            placements: 组件摆放
+            variants: 每个组件的 (图片, 区域, 左上角)
+            scale_factor: 缩放因子
+            device_pixel_ratio: 设备像素比，长条按物理像素合成
+            
+        Returns:
+            Optional[Tuple[QPixmap, QPoint]]: 长条图片及其相对车头左上角的偏移
         """
-        with context:
-            # 设置画笔
-            context.painter.setPen(QColor(255, 0, 0))  # 红色
-            context.painter.setBrush(Qt.BrushStyle.NoBrush)
+        anchor = variants[0][2]
+        relative = tuple(
+            (top_left.x() - anchor.x(), top_left.y() - anchor.y())
+            for _, _, top_left in variants
+        )
+        head = placements[0]
+        key = (
+            tuple(p.component.original_pixmap.cacheKey() for p in placements),
+            scale_factor, head.rotation_angle, head.is_mirrored, device_pixel_ratio, relative
+        )
+        
+        # 计算长条包围盒（相对车头左上角）
+        left = min(x for x, _ in relative)
+        top = min(y for _, y in relative)
+        offset = QPoint(left, top)
+        
+        cached = self._strip_cache.get(key)
+        if cached is not None:
+            return cached, offset
             
-            # 绘制旋转角度
-            context.painter.drawText(
-                10, 20,
-                f"旋转角度: {context.rotation_angle}°"
-            )
+        sizes = [ComponentRenderer.logical_size(source, rect) for source, rect, _ in variants]
+        right = max(x + size.width() for (x, _), size in zip(relative, sizes))
+        bottom = max(y + size.height() for (_, y), size in zip(relative, sizes))
+        
+        pixmap = QPixmap(math.ceil((right - left) * device_pixel_ratio),
+                         math.ceil((bottom - top) * device_pixel_ratio))
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        try:
+            for (x, y), (source, source_rect, _) in zip(relative, variants):
+                painter.drawPixmap(QPoint(x - left, y - top), source, source_rect)
+        finally:
+            painter.end()
             
-            # 绘制旋转中心点
-            if context.center_point:
-                context.painter.setBrush(Qt.BrushStyle.SolidPattern)
-                context.painter.drawEllipse(context.center_point, 5, 5)
-                
-            # 绘制组件信息
-            for i, (component, position) in enumerate(zip(components, positions)):
-                # 计算组件尺寸
-                width = int(component.original_pixmap.width() * context.scale_factor)
-                height = int(component.original_pixmap.height() * context.scale_factor)
-                
-                # 绘制组件信息
-                context.painter.drawText(
-                    position.x(), position.y() - 20,
-                    f"组件 {i+1}: {width}x{height}"
-                )
-                
+        self._strip_cache.put(key, pixmap)
+        return pixmap, offset
+        
     def clear_cache(self):
         """清除渲染缓存"""
         self._component_renderer.clear_cache()
+        self._strip_cache.clear()
+        
+    def reset_stats(self):
+        """重置所有缓存的统计计数"""
+        self._component_renderer.reset_stats()
+        self._strip_cache.reset_stats()
+        
+    def has_atlas(self, device_pixel_ratio: float = 1.0) -> bool:
+        """指定设备像素比的朝向图集是否已就绪"""
+        return self._component_renderer.atlas(device_pixel_ratio) is not None
+        
+    @property
+    def cache_stats(self) -> CacheStats:
+        """获取变换缓存的统计信息"""
+        return self._component_renderer.cache_stats
+        
+    @property
+    def strip_cache_stats(self) -> CacheStats:
+        """获取合成长条缓存的统计信息"""
+        return self._strip_cache.stats
         
     @property
     def debug_mode(self) -> bool:
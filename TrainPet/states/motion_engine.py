@@ -0,0 +1,351 @@
+from typing import List, Optional, Tuple
+
+from train_config import train_config
+from .route_path import RoutePath, quantize_angle
+
+# 运动模式
+MODE_BORDER = 0  # 沿屏幕边框巡游
+MODE_SCAN = 1  # 水平扫描，到边缘后换行掉头（割草机式）
+
+# 运动阶段（扫描模式的垂直阶段记住到达目标行后的水平方向）
+PHASE_BORDER = 0  # 沿边框行驶
+PHASE_RIGHT = 1  # 向右扫描
+PHASE_LEFT = 2  # 向左扫描
+PHASE_DOWN_THEN_LEFT = 3  # 向下换行，之后向左
+PHASE_UP_THEN_LEFT = 4  # 向上换行，之后向左
+PHASE_DOWN_THEN_RIGHT = 5  # 向下换行，之后向右
+PHASE_UP_THEN_RIGHT = 6  # 向上换行，之后向右
+
+# 阶段切换事件
+EVENT_EDGE_BELOW = 0  # 水平到达屏幕边缘，下一行在下方
+EVENT_EDGE_ABOVE = 1  # 水平到达屏幕边缘，下一行在上方（回到第一行）
+EVENT_EDGE_LEVEL = 2  # 水平到达屏幕边缘，下一行就是当前行
+EVENT_OFF_BELOW = 3  # 车头不在目标行上（被拖拽），目标行在下方
+EVENT_OFF_ABOVE = 4  # 车头不在目标行上（被拖拽），目标行在上方
+EVENT_ARRIVED = 5  # 垂直到达目标行
+
+_ = -1  # 不切换
+
+# 一次推进中连续不消耗时间的阶段切换上限（可行驶区域退化成一个点时避免死循环）
+_MAX_IDLE_TRANSITIONS = 4
+
+# 阶段切换表：_TRANSITIONS[阶段][事件] -> 下一阶段
+_TRANSITIONS: Tuple[Tuple[int, ...], ...] = (
+    # EDGE_BELOW             EDGE_ABOVE           EDGE_LEVEL    OFF_BELOW              OFF_ABOVE            ARRIVED
+    (_,                      _,                   _,            _,                     _,                   _),            # BORDER
+    (PHASE_DOWN_THEN_LEFT,   PHASE_UP_THEN_LEFT,  PHASE_LEFT,   PHASE_DOWN_THEN_RIGHT, PHASE_UP_THEN_RIGHT, _),            # RIGHT
+    (PHASE_DOWN_THEN_RIGHT,  PHASE_UP_THEN_RIGHT, PHASE_RIGHT,  PHASE_DOWN_THEN_LEFT,  PHASE_UP_THEN_LEFT,  _),            # LEFT
+    (_,                      _,                   _,            PHASE_DOWN_THEN_LEFT,  PHASE_UP_THEN_LEFT,  PHASE_LEFT),   # DOWN_THEN_LEFT
+    (_,                      _,                   _,            PHASE_DOWN_THEN_LEFT,  PHASE_UP_THEN_LEFT,  PHASE_LEFT),   # UP_THEN_LEFT
+    (_,                      _,                   _,            PHASE_DOWN_THEN_RIGHT, PHASE_UP_THEN_RIGHT, PHASE_RIGHT),  # DOWN_THEN_RIGHT
+    (_,                      _,                   _,            PHASE_DOWN_THEN_RIGHT, PHASE_UP_THEN_RIGHT, PHASE_RIGHT),  # UP_THEN_RIGHT
+)
+
+# 各阶段的移动方向
+_DIRECTION_X = (0, 1, -1, 0, 0, 0, 0)
+_DIRECTION_Y = (0, 0, 0, 1, -1, 1, -1)
+
+# 各阶段的朝向（边框阶段的角度随路线变化，表中的值只是初始值）
+_ANGLES = (0.0, train_config.ROTATION_ANGLE_HORIZONTAL, train_config.ROTATION_ANGLE_HORIZONTAL,
+           train_config.ROTATION_ANGLE_DOWN, train_config.ROTATION_ANGLE_UP,
+           train_config.ROTATION_ANGLE_DOWN, train_config.ROTATION_ANGLE_UP)
+
+# 各阶段图片是否镜像（原图车头朝左）：向右扫描时镜像；边框上始终镜像，
+# 旋转角度即行驶方向，车头朝前、车轮朝外贴着边框
+_MIRRORED = (True, True, False, False, False, False, False)
+
+
+class MotionEngine:
+    """表驱动的车头运动引擎（不依赖 Qt）
+
+    所有运动阶段都是预先编号的整数，每个阶段的推进函数、移动方向、朝向
+    和镜像都放在按编号索引的表里，阶段之间的切换查 _TRANSITIONS 表，只是
+    修改一个整数；step(dt) 只做浮点运算，不分配对象，可以脱离界面大量
+    模拟。切换边框/扫描模式同样只是修改阶段编号。
+
+    推进函数返回没有用完的时间：到达边缘或目标行时切换阶段，剩余时间接着
+    在下一阶段推进，因此一步推进和拆成多步推进的结果相同（可以跳帧）。
+
+    位置是车头方框（任意朝向都能放下车头的正方形）左上角的屏幕坐标。
+    """
+    def __init__(self, speed: Optional[float] = None, vertical_step: Optional[int] = None,
+                 margin: Optional[int] = None):
+        """初始化引擎
+
+        Args:
+            speed: 移动速度（像素/秒），默认取配置
+            vertical_step: 扫描模式的行距（像素），默认取配置
+            margin: 边框路线角落的边距（像素），默认取配置
+        """
+        self._speed = train_config.MOVE_SPEED if speed is None else speed
+        self._vertical_step = train_config.VERTICAL_STEP if vertical_step is None else vertical_step
+        self._margin = train_config.WINDOW_MARGIN if margin is None else margin
+        self._turn_distance = train_config.CORNER_TURN_DISTANCE
+        self._angle_steps = train_config.ROTATION_ANGLE_STEPS
+
+        # 按阶段编号索引的推进函数（预先绑定，推进时不创建对象）
+        self._steppers = (
+            self._step_border,
+            self._step_horizontal, self._step_horizontal,
+            self._step_vertical, self._step_vertical,
+            self._step_vertical, self._step_vertical,
+        )
+
+        # 可行驶区域：屏幕左上角、尺寸和车头方框边长
+        self._left = self._top = 0.0
+        self._width = self._height = 0.0
+        self._head_size = 0.0
+        self._max_x = 0.0
+
+        # 当前状态
+        self._phase = PHASE_BORDER
+        self._x = self._y = 0.0
+        self._angle = _ANGLES[PHASE_BORDER]
+
+        # 边框路线和路线上的弧长，弧长为 None 时从当前位置重新投影
+        self._path: Optional[RoutePath] = None
+        self._distance: Optional[float] = None
+        self._corner = 0  # 边框上的目标角落（0:右下, 1:右上, 2:左上, 3:左下）
+
+        # 当前所在直线部分（弧长区间、起点和方向），在其中推进时朝向不变，不必查路线
+        self._run_start = self._run_end = 0.0
+        self._run_x = self._run_y = 0.0
+        self._run_dx = self._run_dy = 0.0
+
+        # 扫描模式的行号和目标行（相对屏幕顶部）
+        self._row = 0
+        self._target_y = 0
+
+    def set_bounds(self, left: float, top: float, width: float, height: float,
+                   head_size: float):
+        """设置可行驶的屏幕区域，变化时重建边框路线并从当前位置重新接入
+
+        Args:
+            left: 屏幕左上角 x（虚拟桌面坐标）
+            top: 屏幕左上角 y
+            width: 屏幕宽度
+            height: 屏幕高度
+            head_size: 车头方框边长
+        """
+        bounds = (left, top, width, height, head_size)
+        if self._path is not None and bounds == (self._left, self._top, self._width,
+                                                 self._height, self._head_size):
+            return
+        self._left, self._top, self._width, self._height, self._head_size = bounds
+        self._max_x = left + width - head_size
+        self._path = RoutePath(self._corner_positions(), closed=True)
+        self._distance = None
+        self._run_start = self._run_end = 0.0
+
+    def _corner_positions(self) -> List[Tuple[float, float]]:
+        """四个角落的车头方框位置，确保图片底部（车轮）贴着边框
+
+        Returns:
+            List[Tuple[float, float]]: 角落位置（顺时针顺序：右下->右上->左上->左下）
+        """
+        margin = self._margin
+        size = self._head_size
+        corners = [
+            (self._width - size - margin, self._height - size),  # 右下 (0)
+            (self._width - size, margin),  # 右上 (1)
+            (margin, 0),  # 左上 (2)
+            (0, self._height - size - margin)  # 左下 (3)
+        ]
+        return [(self._left + x, self._top + y) for x, y in corners]
+
+    def set_mode(self, mode: int):
+        """切换运动模式，从当前位置开始
+
+        扫描模式从第一行开始向右扫描（车头不在第一行时先垂直移动过去）。
+
+        Args:
+            mode: MODE_BORDER 或 MODE_SCAN
+        """
+        if mode == MODE_BORDER:
+            self._phase = PHASE_BORDER
+            self._distance = None
+        elif mode == MODE_SCAN:
+            self._phase = PHASE_RIGHT
+            self._row = 0
+            self._target_y = 0
+            self._angle = _ANGLES[PHASE_RIGHT]
+        else:
+            raise ValueError(f'未知的运动模式: {mode}')
+
+    def place(self, x: float, y: float):
+        """车头被外部移动（如拖拽）后，从新位置继续运动
+
+        Args:
+            x: 车头方框左上角 x
+            y: 车头方框左上角 y
+        """
+        self._x = x
+        self._y = y
+        self._distance = None
+        if _DIRECTION_Y[self._phase]:
+            # 垂直移动中被拖拽：按新位置重新判断向上还是向下
+            target = self._top + self._target_y
+            self._fire(EVENT_OFF_BELOW if y < target else
+                       EVENT_OFF_ABOVE if y > target else EVENT_ARRIVED)
+
+    def start_at(self, fraction: float):
+        """沿边框路线从指定位置出发（多列列车错开时使用）
+
+        Args:
+            fraction: 路线上的位置占一圈的比例（0~1）
+        """
+        self._phase = PHASE_BORDER
+        self._distance = self._path.wrap(fraction * self._path.length)
+        self._run_start = self._run_end = 0.0
+        self._step_border(0.0)
+
+    def step(self, dt: float):
+        """推进 dt 秒（需要先调用 set_bounds）
+
+        Args:
+            dt: 经过的时间（秒）
+        """
+        remaining = self._steppers[self._phase](dt)
+        idle = 0
+        while remaining > 0.0:
+            # 切换了阶段，剩余时间在新阶段继续推进
+            idle = idle + 1 if remaining >= dt else 0
+            if idle > _MAX_IDLE_TRANSITIONS:
+                return
+            dt = remaining
+            remaining = self._steppers[self._phase](dt)
+
+    def _fire(self, event: int):
+        """按切换表处理事件"""
+        phase = _TRANSITIONS[self._phase][event]
+        if phase != _:
+            self._phase = phase
+            self._angle = _ANGLES[phase]
+
+    def _step_border(self, dt: float) -> float:
+        """沿边框路线推进，位置和朝向由路线上的弧长决定（总是用完全部时间）"""
+        path = self._path
+        if self._distance is None:
+            self._distance = path.project((self._x, self._y))
+            self._run_start = self._run_end = 0.0
+        distance = self._distance + dt * self._speed
+
+        # 仍在当前直线部分上：位置线性变化，朝向不变
+        if self._run_start <= distance < self._run_end:
+            offset = distance - self._run_start
+            self._x = self._run_x + self._run_dx * offset
+            self._y = self._run_y + self._run_dy * offset
+            self._distance = distance
+            return 0.0
+
+        self._distance = distance = path.wrap(distance)
+        x, y, heading, segment = path.sample(distance, self._turn_distance)
+        self._x = x
+        self._y = y
+        # 第 i 段从角落 i 驶向角落 i+1
+        self._corner = (segment + 1) % 4
+        # 朝向量化到固定档数：边框略有倾斜的直线段仍取 90 度整数倍（使用图集和合成长条），
+        # 转弯时逐档过渡
+        self._angle = quantize_angle(heading, self._angle_steps)
+
+        # 进入直线部分时记住它，之后的推进走上面的快速路径
+        start, end, run_x, run_y, run_dx, run_dy = path.straight_run(segment, self._turn_distance)
+        if start <= distance < end:
+            self._run_start, self._run_end = start, end
+            self._run_x, self._run_y = run_x, run_y
+            self._run_dx, self._run_dy = run_dx, run_dy
+        else:
+            self._run_start = self._run_end = 0.0
+        return 0.0
+
+    def _step_horizontal(self, dt: float) -> float:
+        """水平扫描，到达边缘时掉头并换到下一行，返回剩余时间"""
+        target = self._top + self._target_y
+        if self._y != target:
+            # 车头不在目标行上（被拖拽），先垂直移动过去，方向不变，不消耗时间
+            self._fire(EVENT_OFF_BELOW if self._y < target else EVENT_OFF_ABOVE)
+            return dt
+
+        direction = _DIRECTION_X[self._phase]
+        x = self._x + direction * dt * self._speed
+        if direction > 0 and x >= self._max_x:
+            edge = self._max_x
+        elif direction < 0 and x <= self._left:
+            edge = self._left
+        else:
+            self._x = x
+            return 0.0
+        # 越过边缘的距离换算成剩余时间
+        remaining = abs(x - edge) / self._speed
+        self._x = edge
+
+        # 到达边缘：换到下一行，超出屏幕时回到第一行
+        self._row += 1
+        self._target_y = self._row * self._vertical_step
+        if self._target_y >= self._height - self._head_size:
+            self._row = 0
+            self._target_y = 0
+        target = self._top + self._target_y
+        self._fire(EVENT_EDGE_BELOW if self._y < target else
+                   EVENT_EDGE_ABOVE if self._y > target else EVENT_EDGE_LEVEL)
+        return remaining
+
+    def _step_vertical(self, dt: float) -> float:
+        """垂直移动到目标行，返回剩余时间"""
+        target = self._top + self._target_y
+        direction = _DIRECTION_Y[self._phase]
+        y = self._y + direction * dt * self._speed
+        if (direction > 0 and y >= target) or (direction < 0 and y <= target):
+            remaining = abs(y - target) / self._speed
+            self._y = target
+            self._fire(EVENT_ARRIVED)
+            return remaining
+        self._y = y
+        return 0.0
+
+    @property
+    def x(self) -> float:
+        """车头方框左上角 x"""
+        return self._x
+
+    @property
+    def y(self) -> float:
+        """车头方框左上角 y"""
+        return self._y
+
+    @property
+    def rotation_angle(self) -> float:
+        """车头旋转角度"""
+        return self._angle
+
+    @property
+    def is_mirrored(self) -> bool:
+        """图片是否水平镜像（原图车头朝左）"""
+        return _MIRRORED[self._phase]
+
+    @property
+    def is_moving_right(self) -> bool:
+        """是否向右移动（边框上驶向右下角时）"""
+        if self._phase == PHASE_BORDER:
+            return self._corner == 0
+        return _DIRECTION_X[self._phase] > 0
+
+    @property
+    def mode(self) -> int:
+        """当前运动模式"""
+        return MODE_BORDER if self._phase == PHASE_BORDER else MODE_SCAN
+
+    @property
+    def phase(self) -> int:
+        """当前运动阶段"""
+        return self._phase
+
+    @property
+    def row(self) -> int:
+        """扫描模式的当前行号"""
+        return self._row
+
+    @property
+    def path_length(self) -> float:
+        """边框路线一圈的长度（像素）"""
+        return self._path.length if self._path is not None else 0.0
@@ -0,0 +1,257 @@
+import bisect
+import math
+from typing import List, Sequence, Tuple
+
+Point = Tuple[float, float]
+
+
+def quantize_angle(angle: float, steps: int) -> float:
+    """将角度量化到一圈 steps 档中最近的一档
+
+    Args:
+        angle: 角度（度）
+        steps: 一圈的档数，0 表示不量化
+
+    Returns:
+        float: 量化后的角度（0~360）
+    """
+    if steps <= 0:
+        return angle % 360
+    step = 360 / steps
+    return (round(angle / step) % steps) * step
+
+
+def quantized_angles(steps: int) -> Tuple[float, ...]:
+    """量化后一圈所有可能的角度（与 quantize_angle 的结果逐位相等）
+
+    Args:
+        steps: 一圈的档数，0 表示不量化（返回空元组）
+
+    Returns:
+        Tuple[float, ...]: 从 0 度开始的各档角度
+    """
+    if steps <= 0:
+        return ()
+    step = 360 / steps
+    return tuple(index * step for index in range(steps))
+
+
+class RoutePath:
+    """按弧长参数化的折线路径
+
+    预先计算每段的累计长度，任意弧长处的位置都可以直接求出，
+    因此位置是经过时间的纯函数。
+    """
+    def __init__(self, points: Sequence[Point], closed: bool = True):
+        """初始化路径
+
+        Args:
+            points: 路径顶点
+            closed: 是否首尾相连
+        """
+        if len(points) < 2:
+            raise ValueError("路径至少需要两个顶点")
+
+        self._points: List[Point] = [(float(x), float(y)) for x, y in points]
+        if closed:
+            self._points.append(self._points[0])
+        self._closed = closed
+
+        # 每个顶点处的累计弧长
+        self._cumulative: List[float] = [0.0]
+        for (x0, y0), (x1, y1) in zip(self._points, self._points[1:]):
+            self._cumulative.append(self._cumulative[-1] + math.hypot(x1 - x0, y1 - y0))
+
+        self._segment_count = len(self._points) - 1
+        self._seg_lengths: List[float] = [
+            end - start for start, end in zip(self._cumulative, self._cumulative[1:])
+        ]
+
+        # 每段的行驶方向（度，屏幕坐标下顺时针为正，0 为向右）
+        self._headings: List[float] = [
+            math.degrees(math.atan2(y1 - y0, x1 - x0)) % 360
+            for (x0, y0), (x1, y1) in zip(self._points, self._points[1:])
+        ]
+
+        # 按过渡弧长预先算出的每段段首、段尾过渡区半长
+        self._turn_length = 0.0
+        self._start_halves: List[float] = [0.0] * self._segment_count
+        self._end_halves: List[float] = [0.0] * self._segment_count
+
+    @property
+    def length(self) -> float:
+        """路径总长度"""
+        return self._cumulative[-1]
+
+    @property
+    def segment_count(self) -> int:
+        """路径段数"""
+        return self._segment_count
+
+    def wrap(self, distance: float) -> float:
+        """将弧长规整到路径范围内（闭合路径取模，开放路径截断）"""
+        length = self._cumulative[-1]
+        if self._closed and length > 0:
+            return distance % length
+        return min(max(distance, 0.0), length)
+
+    def segment_at(self, distance: float) -> int:
+        """获取弧长所在的路径段序号
+
+        Args:
+            distance: 弧长
+
+        Returns:
+            int: 路径段序号（从 0 开始）
+        """
+        distance = self.wrap(distance)
+        index = bisect.bisect_right(self._cumulative, distance) - 1
+        return min(max(index, 0), self._segment_count - 1)
+
+    def point_at(self, distance: float) -> Point:
+        """获取弧长处的位置
+
+        Args:
+            distance: 弧长
+
+        Returns:
+            Point: 位置 (x, y)
+        """
+        distance = self.wrap(distance)
+        index = self.segment_at(distance)
+        start = self._cumulative[index]
+        seg_length = self._cumulative[index + 1] - start
+        (x0, y0), (x1, y1) = self._points[index], self._points[index + 1]
+        if seg_length <= 0:
+            return x0, y0
+        t = (distance - start) / seg_length
+        return x0 + (x1 - x0) * t, y0 + (y1 - y0) * t
+
+    def heading_at(self, distance: float, turn_length: float = 0.0) -> float:
+        """获取弧长处的行驶方向
+
+        turn_length 大于 0 时，方向在每个顶点前后共 turn_length 的弧长内从
+        上一段的方向线性过渡到下一段的方向（过渡区最多占相邻两段各一半），
+        因此方向是弧长的连续函数。
+
+        Args:
+            distance: 弧长
+            turn_length: 顶点处的转向过渡弧长
+
+        Returns:
+            float: 方向（度，0~360，屏幕坐标下顺时针为正，0 为向右）
+        """
+        distance = self.wrap(distance)
+        index = self.segment_at(distance)
+        return self._heading_in(index, distance - self._cumulative[index], turn_length)
+
+    def sample(self, distance: float, turn_length: float = 0.0) -> Tuple[float, float, float, int]:
+        """一次求出弧长处的位置、行驶方向和路径段序号（每帧推进时使用）
+
+        Args:
+            distance: 弧长
+            turn_length: 顶点处的转向过渡弧长
+
+        Returns:
+            Tuple[float, float, float, int]: (x, y, 方向, 路径段序号)
+        """
+        distance = self.wrap(distance)
+        index = self.segment_at(distance)
+        offset = distance - self._cumulative[index]
+        seg_length = self._seg_lengths[index]
+        (x0, y0), (x1, y1) = self._points[index], self._points[index + 1]
+        t = offset / seg_length if seg_length > 0 else 0.0
+        return (x0 + (x1 - x0) * t, y0 + (y1 - y0) * t,
+                self._heading_in(index, offset, turn_length), index)
+
+    def straight_run(self, index: int, turn_length: float = 0.0) -> Tuple[float, float, float, float, float, float]:
+        """第 index 段去掉两端转向过渡区后的直线部分（其上方向不变、位置随弧长线性变化）
+
+        Args:
+            index: 路径段序号
+            turn_length: 顶点处的转向过渡弧长
+
+        Returns:
+            Tuple[float, float, float, float, float, float]:
+                (起点弧长, 终点弧长, 起点 x, 起点 y, 每单位弧长的 x 增量, y 增量)
+        """
+        if turn_length > 0 and turn_length != self._turn_length:
+            self._prepare_turns(turn_length)
+        start_half = self._start_halves[index] if turn_length > 0 else 0.0
+        end_half = self._end_halves[index] if turn_length > 0 else 0.0
+        seg_length = self._seg_lengths[index]
+        (x0, y0), (x1, y1) = self._points[index], self._points[index + 1]
+        if seg_length <= 0:
+            return 0.0, 0.0, x0, y0, 0.0, 0.0
+        ux, uy = (x1 - x0) / seg_length, (y1 - y0) / seg_length
+        start = self._cumulative[index]
+        return (start + start_half, start + seg_length - end_half,
+                x0 + ux * start_half, y0 + uy * start_half, ux, uy)
+
+    def _heading_in(self, index: int, offset: float, turn_length: float) -> float:
+        """第 index 段上距段首 offset 处的行驶方向（含顶点处的过渡）"""
+        heading = self._headings[index]
+        if turn_length <= 0:
+            return heading
+        if turn_length != self._turn_length:
+            self._prepare_turns(turn_length)
+
+        # 靠近段首时与上一段过渡
+        half = self._start_halves[index]
+        if offset < half:
+            start = self._headings[index - 1]  # 闭合路径的第 0 段取最后一段
+            u = (offset + half) / (2 * half)
+            return (start + self._angle_delta(start, heading) * u) % 360
+
+        # 靠近段尾时与下一段过渡
+        half = self._end_halves[index]
+        remaining = self._seg_lengths[index] - offset
+        if remaining < half:
+            end = self._headings[(index + 1) % self._segment_count]
+            u = (half - remaining) / (2 * half)
+            return (heading + self._angle_delta(heading, end) * u) % 360
+
+        return heading
+
+    def _prepare_turns(self, turn_length: float):
+        """按过渡弧长计算每个顶点处过渡区的半长（不超过相邻两段各自的一半）"""
+        count = self._segment_count
+        lengths = self._seg_lengths
+        self._turn_length = turn_length
+        self._start_halves = [0.0] * count
+        self._end_halves = [0.0] * count
+        for index in range(count):
+            if index + 1 < count or self._closed:
+                following = (index + 1) % count
+                half = min(turn_length / 2, lengths[index] / 2, lengths[following] / 2)
+                self._end_halves[index] = half
+                self._start_halves[following] = half
+
+    @staticmethod
+    def _angle_delta(start: float, end: float) -> float:
+        """从 start 转到 end 的最小角度差（-180~180）"""
+        return (end - start + 180) % 360 - 180
+
+    def project(self, point: Point) -> float:
+        """求路径上离指定点最近处的弧长
+
+        Args:
+            point: 位置 (x, y)
+
+        Returns:
+            float: 弧长
+        """
+        px, py = point
+        best_distance = 0.0
+        best_sq = math.inf
+        for index in range(self.segment_count):
+            (x0, y0), (x1, y1) = self._points[index], self._points[index + 1]
+            dx, dy = x1 - x0, y1 - y0
+            seg_sq = dx * dx + dy * dy
+            t = 0.0 if seg_sq == 0 else max(0.0, min(1.0, ((px - x0) * dx + (py - y0) * dy) / seg_sq))
+            cx, cy = x0 + dx * t, y0 + dy * t
+            dist_sq = (px - cx) ** 2 + (py - cy) ** 2
+            if dist_sq < best_sq:
+                best_sq = dist_sq
+                best_distance = self._cumulative[index] + math.sqrt(seg_sq) * t
+        return self.wrap(best_distance)
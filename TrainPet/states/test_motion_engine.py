@@ -0,0 +1,158 @@
+import math
+import tracemalloc
+
+import pytest
+
+from states.motion_engine import (
+    MODE_BORDER, MODE_SCAN, PHASE_BORDER, PHASE_DOWN_THEN_LEFT, PHASE_DOWN_THEN_RIGHT,
+    PHASE_LEFT, PHASE_RIGHT, PHASE_UP_THEN_RIGHT, MotionEngine
+)
+
+WIDTH, HEIGHT, HEAD = 800, 600, 100
+SPEED = 100.0
+
+
+def make_engine(mode: int, x: float, y: float) -> MotionEngine:
+    """800x600 屏幕上从指定位置出发的引擎（不依赖 Qt）"""
+    engine = MotionEngine(speed=SPEED, vertical_step=50, margin=10)
+    engine.set_bounds(0, 0, WIDTH, HEIGHT, HEAD)
+    engine.place(x, y)
+    engine.set_mode(mode)
+    return engine
+
+
+def test_border_heading_follows_direction_of_travel():
+    """边框上始终镜像，直线部分的朝向就是行驶方向"""
+    engine = make_engine(MODE_BORDER, WIDTH - HEAD, HEIGHT - HEAD)
+    engine.step(1.0)
+    assert engine.phase == PHASE_BORDER
+    assert engine.is_mirrored
+    assert engine.rotation_angle == 270.0  # 沿右边向上
+    for _ in range(6):
+        engine.step(1.0)
+    assert engine.rotation_angle == 180.0  # 沿上边向左
+
+
+def test_border_lap_returns_to_start():
+    """走完一圈回到出发点"""
+    engine = make_engine(MODE_BORDER, WIDTH - HEAD, HEIGHT - HEAD)
+    engine.step(0.0)
+    start = (engine.x, engine.y)
+    lap = engine.path_length / SPEED
+    for _ in range(100):
+        engine.step(lap / 100)
+    assert engine.x == pytest.approx(start[0], abs=1e-6)
+    assert engine.y == pytest.approx(start[1], abs=1e-6)
+
+
+@pytest.mark.parametrize('mode, x, y', [
+    (MODE_BORDER, WIDTH - HEAD, HEIGHT - HEAD),
+    (MODE_SCAN, 0, 0),
+])
+def test_step_is_frame_rate_independent(mode, x, y):
+    """同样的时长一步推进和按 60 帧推进，位置相同"""
+    coarse = make_engine(mode, x, y)
+    fine = make_engine(mode, x, y)
+    coarse.step(2.5)
+    for _ in range(150):
+        fine.step(1 / 60)
+    assert fine.x == pytest.approx(coarse.x, abs=1e-6)
+    assert fine.y == pytest.approx(coarse.y, abs=1e-6)
+
+
+@pytest.mark.parametrize('dt', [1 / 15, 0.375, 63.0])
+def test_scan_is_frame_rate_independent_across_turns(dt):
+    """扫描跨越多次掉头和换行，大步长（步长不落在转弯处）和 60 帧推进的位置相同"""
+    duration = 63.0  # 结束时不在转弯处
+    coarse = make_engine(MODE_SCAN, 0, 0)
+    fine = make_engine(MODE_SCAN, 0, 0)
+    for _ in range(round(duration / dt)):
+        coarse.step(dt)
+    for _ in range(round(duration * 60)):
+        fine.step(1 / 60)
+    assert fine.row > 3
+    assert (coarse.row, coarse.phase) == (fine.row, fine.phase)
+    assert coarse.x == pytest.approx(fine.x, abs=1e-6)
+    assert coarse.y == pytest.approx(fine.y, abs=1e-6)
+
+
+def test_scan_turns_at_edge_and_changes_row():
+    """扫描到右边缘后向下换行，到达后向左扫描，图片不再镜像"""
+    engine = make_engine(MODE_SCAN, 0, 0)
+    assert engine.phase == PHASE_RIGHT and engine.is_mirrored
+    engine.step((WIDTH - HEAD) / SPEED)
+    assert engine.x == WIDTH - HEAD
+    assert engine.phase == PHASE_DOWN_THEN_LEFT
+    assert engine.rotation_angle == 90.0
+    engine.step(0.5)
+    assert (engine.y, engine.row) == (50, 1)
+    assert engine.phase == PHASE_LEFT and not engine.is_mirrored
+    engine.step((WIDTH - HEAD) / SPEED)
+    assert engine.x == 0
+    assert engine.phase == PHASE_DOWN_THEN_RIGHT
+
+
+def test_scan_wraps_to_first_row():
+    """最后一行扫描完后回到第一行"""
+    engine = make_engine(MODE_SCAN, 0, 0)
+    rows = set()
+    for _ in range(20000):
+        engine.step(0.05)
+        rows.add(engine.row)
+    assert max(rows) == math.ceil((HEIGHT - HEAD) / 50) - 1
+    assert 0 in rows
+
+
+def test_drag_off_row_moves_back_vertically():
+    """扫描时被拖离目标行，先垂直回到目标行，方向不变"""
+    engine = make_engine(MODE_SCAN, 0, 0)
+    engine.step(1.0)
+    engine.place(engine.x, 200)
+    engine.step(0.0)
+    assert engine.phase == PHASE_UP_THEN_RIGHT
+    engine.step(2.0)
+    assert engine.y == 0
+    assert engine.phase == PHASE_RIGHT
+
+
+def test_mode_switch_continues_from_same_point():
+    """切换运动模式后从车头所在位置继续行驶，未知模式报错"""
+    engine = make_engine(MODE_BORDER, WIDTH - HEAD, HEIGHT - HEAD)
+    engine.step(1.0)
+    x, y = engine.x, engine.y
+
+    # 扫描模式：车头不在第一行，沿原来的 x 垂直向上驶向第一行
+    engine.set_mode(MODE_SCAN)
+    assert engine.mode == MODE_SCAN
+    engine.step(0.1)
+    assert engine.phase == PHASE_UP_THEN_RIGHT
+    assert engine.x == x
+    assert engine.y == pytest.approx(y - SPEED * 0.1)
+
+    # 回到边框：从当前位置接入路线，继续沿右边向上
+    x, y = engine.x, engine.y
+    engine.set_mode(MODE_BORDER)
+    assert engine.mode == MODE_BORDER
+    engine.step(0.1)
+    assert engine.rotation_angle == 270.0
+    assert math.hypot(engine.x - x, engine.y - y) == pytest.approx(SPEED * 0.1, abs=1.0)
+    assert engine.y < y
+
+    with pytest.raises(ValueError):
+        engine.set_mode(2)
+
+
+def test_step_does_not_accumulate_allocations():
+    """推进不保留任何新分配的对象"""
+    engine = make_engine(MODE_BORDER, WIDTH - HEAD, HEIGHT - HEAD)
+    for _ in range(1000):
+        engine.step(1 / 60)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(50000):
+            engine.step(1 / 60)
+        growth = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    assert growth < 1024
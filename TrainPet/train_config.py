@@ -17,21 +17,34 @@ class TrainImageConfig:
     MAX_CARRIAGES: int = 3  # 最大车厢数
     DEFAULT_CARRIAGES: int = 2  # 默认车厢数
     
+    # 轨迹配置
+    TRAIL_SAMPLE_SPACING: float = 4.0  # 车头轨迹采样间距（像素）
+    
     # 移动配置
-    MOVE_SPEED: int = 3  # 移动速度
+    MOVE_SPEED: float = 180.0  # 移动速度（像素/秒，与帧率无关）
     VERTICAL_STEP: int = 50  # 垂直移动步长
     
     # 调试配置
     DEBUG_MODE: bool = False  # 是否启用调试模式
+    PROFILER_ENV_VAR: str = 'TRAINPET_PROFILE'  # 启动时开启帧耗时记录的环境变量（1：记录并显示，record：只记录）
+    PROFILER_CAPACITY: int = 600  # 帧耗时记录的环形缓冲区容量（帧）
+    PROFILER_DUMP_DIR: str = ''  # 帧耗时记录的导出目录（空表示当前目录）
     
     # 旋转配置
     ROTATION_ANGLE_UP: float = 270.0    # 向上移动时的旋转角度
     ROTATION_ANGLE_DOWN: float = 90.0   # 向下移动时的旋转角度
     ROTATION_ANGLE_HORIZONTAL: float = 0.0  # 水平移动时的旋转角度
+    CORNER_TURN_DISTANCE: float = 120.0  # 沿边框转弯时朝向渐变的弧长（像素，0 表示在角落直接切换）
+    ROTATION_ANGLE_STEPS: int = 64  # 转弯时朝向角度一圈的量化档数（需为 4 的倍数，0 表示不量化）
+    ATLAS_ROTATION_ANGLES: Tuple[float, ...] = (0.0, 90.0, 180.0, 270.0)  # 朝向图集预生成的角度
+    SWARM_ATLAS_TURN_ANGLES: bool = True  # 多列车共享的图集是否预生成转弯的全部量化角度（64 档约 46 MB），转弯时直接贴图而不是实时旋转
     
     # 窗口配置
     WINDOW_MARGIN: int = 20  # 窗口边距
     WINDOW_OPACITY: float = 0.9  # 窗口透明度
+    WINDOW_GEOMETRY_MODE: str = 'fixed'  # fixed：固定尺寸只移动窗口；fit：窗口刚好包住列车；overlay：全屏叠加层只重绘脏区域
+    WINDOW_GEOMETRY_PADDING: int = 4  # 固定尺寸窗口（和叠加层重绘区域）的额外边距（变体实际尺寸和取整误差）
+    OVERLAY_MASK_MARGIN: int = 16  # 叠加层点击遮罩比列车多留的边距，列车移出边距才更新遮罩
     
     # 动画配置
     ANIMATION_FPS: int = 60  # 动画帧率
@@ -39,7 +52,12 @@ class TrainImageConfig:
     
     # 图片配置
     IMAGE_FORMATS: List[str] = field(default_factory=lambda: ['.png', '.jpg', '.jpeg'])  # 支持的图片格式
-    IMAGE_CACHE_SIZE: int = 10  # 图片缓存大小
+    IMAGE_CACHE_SIZE: int = 32  # 变换图片缓存最大条目数（0 表示不限制）
+    IMAGE_CACHE_MAX_BYTES: int = 16 * 1024 * 1024  # 变换图片缓存字节预算
+    STRIP_CACHE_SIZE: int = 8  # 整列列车合成长条缓存最大条目数
+    STRIP_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # 整列列车合成长条缓存字节预算
+    IMAGE_SOURCE: str = 'train_all.png'  # 车头、车厢、车尾所在的原始图片
+    CROP_CACHE_DIR: str = ''  # 裁剪结果的磁盘缓存目录（空表示系统缓存目录下的 TrainPet/crops）
     
     # 日志配置
     LOG_LEVEL: str = 'ERROR'  # 日志级别
@@ -55,6 +73,7 @@ class TrainImageConfig:
     RENDER_SMOOTH_TRANSFORM: bool = True  # 是否启用平滑变换
     RENDER_DEBUG_BOX: bool = True  # 是否显示调试边界框
     RENDER_DEBUG_INFO: bool = True  # 是否显示调试信息
+    RENDER_THREAD: bool = False  # 是否在后台渲染线程合成整帧，绘制事件只贴图（叠加层模式不使用）
     
     # 事件配置
     MOUSE_DRAG_THRESHOLD: int = 5  # 鼠标拖拽阈值（像素）
@@ -0,0 +1,361 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional
+from PySide6.QtCore import QObject, QPoint, QRect, Qt, QTimer, Signal
+from PySide6.QtGui import QKeyEvent, QMouseEvent, QPainter, QRegion
+from PySide6.QtWidgets import QWidget
+
+from train_config import train_config
+from utils.screen_tracker import ScreenInfo, ScreenTracker
+
+if TYPE_CHECKING:
+    from train_pet import TrainPet
+
+
+@dataclass(frozen=True)
+class OverlayStats:
+    """叠加层统计信息快照"""
+    paints: int  # 绘制次数
+    damaged_pixels: int  # 实际重绘的区域面积之和（逻辑像素）
+    mask_updates: int  # 点击遮罩更新次数（原生调用）
+
+
+@dataclass
+class _TrainSlot:
+    """一列列车在叠加层上的区域（窗口坐标）"""
+    content: List[QRect] = field(default_factory=list)  # 这一帧各组件占据的区域（点击检测）
+    bounds: QRect = field(default_factory=QRect)  # 这一帧占据区域的包围盒
+    painted: QRect = field(default_factory=QRect)  # 上一次重绘时占据区域的包围盒
+    mask: QRect = field(default_factory=QRect)  # 点击遮罩区域（比占据区域稍大）
+    damage: QRect = field(default_factory=QRect)  # 这一帧需要重绘的区域
+
+
+class TrainOverlay(QWidget):
+    """覆盖整个屏幕的透明叠加层
+
+    窗口本身从不移动，列车移动时只重绘上一帧和这一帧占据的区域；
+    点击遮罩只覆盖列车附近，其余区域的鼠标事件穿透到下面的窗口。
+    一个叠加层可以承载同一屏幕上的多列列车。
+
+    绘制时的裁剪区域必须保持为单个矩形：多个矩形组成的裁剪区域（控件
+    遮罩、多处重绘区域的并集）会让每次贴图都走按扫描线裁剪的通用混合，
+    Qt 还会把它拆到线程池里执行，列车多时开销成倍增加。因此遮罩只设置
+    在原生窗口上，一帧内的重绘区域合并为一个包围盒。
+    """
+    def __init__(self, screen: ScreenInfo):
+        """初始化叠加层
+
+        Args:
+            screen: 覆盖的屏幕
+        """
+        super().__init__()
+        self._slots: Dict['TrainPet', _TrainSlot] = {}
+        self._mouse_pet: Optional['TrainPet'] = None  # 正在接收鼠标事件的列车
+        self._focus_pet: Optional['TrainPet'] = None  # 接收键盘事件的列车
+        self._pending_damage: List[QRect] = []  # 尚未绘制的重绘区域
+        self._frame_damage = QRect()  # 这一帧已请求重绘的包围盒（绘制后清空）
+
+        self.setWindowFlags(
+            Qt.WindowType.FramelessWindowHint |
+            Qt.WindowType.WindowStaysOnTopHint |
+            Qt.WindowType.Tool
+        )
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self.setGeometry(screen.geometry)
+
+        # 一帧内多列列车的遮罩变化合并为一次原生调用
+        self._mask_dirty = False
+        self._mask_timer = QTimer(self)
+        self._mask_timer.setSingleShot(True)
+        self._mask_timer.setInterval(0)
+        self._mask_timer.timeout.connect(self.flush_mask)
+
+        # 统计计数
+        self._paints = 0
+        self._damaged_pixels = 0
+        self._mask_updates = 0
+
+    @property
+    def pets(self) -> List['TrainPet']:
+        """叠加层上的列车（按绘制顺序）"""
+        return list(self._slots)
+
+    def set_screen(self, screen: ScreenInfo):
+        """覆盖的屏幕几何变化，整个叠加层重绘
+
+        Args:
+            screen: 屏幕信息
+        """
+        self.setGeometry(screen.geometry)
+        for slot in self._slots.values():
+            slot.painted = QRect()
+            slot.mask = QRect()
+        self._schedule_mask()
+        self.update()
+
+    def attach(self, pet: 'TrainPet'):
+        """加入一列列车，列车确定位置后叠加层才显示
+
+        Args:
+            pet: 列车
+        """
+        if pet not in self._slots:
+            self._slots[pet] = _TrainSlot()
+            if self._focus_pet is None:
+                self._focus_pet = pet
+
+    def detach(self, pet: 'TrainPet'):
+        """移除一列列车，没有列车时隐藏叠加层
+
+        Args:
+            pet: 列车
+        """
+        slot = self._slots.pop(pet, None)
+        if slot is None:
+            return
+        if not slot.painted.isEmpty():
+            self.update(self._add_damage(slot.painted))
+        if self._mouse_pet is pet:
+            self._mouse_pet = None
+        if self._focus_pet is pet:
+            self._focus_pet = next(iter(self._slots), None)
+        if self._slots:
+            self._schedule_mask()
+        else:
+            self._mask_timer.stop()
+            self._mask_dirty = False
+            self.hide()
+
+    def place(self, pet: 'TrainPet', rects: List[QRect], bounds: QRect):
+        """记录列车这一帧占据的区域，超出点击遮罩时扩大遮罩
+
+        遮罩是比列车包围盒多留出 OVERLAY_MASK_MARGIN 边距的矩形，列车在
+        边距内移动时不更新遮罩，减少原生调用。
+
+        Args:
+            pet: 列车
+            rects: 各组件（和统计信息）占据的区域（窗口坐标）
+            bounds: 这些区域的包围盒（窗口坐标）
+        """
+        slot = self._slots.get(pet)
+        if slot is None:
+            return
+        slot.content = rects
+        slot.bounds = bounds
+        if not slot.mask.contains(slot.bounds):
+            margin = train_config.OVERLAY_MASK_MARGIN
+            slot.mask = slot.bounds.adjusted(-margin, -margin, margin, margin)
+            self._schedule_mask()
+
+    def damage(self, pet: 'TrainPet') -> QRect:
+        """这一帧需要重绘的区域（窗口坐标）
+
+        列车自身的重绘区域是上一次重绘和这一帧占据区域的包围盒；返回的是
+        这一帧所有列车重绘区域的包围盒，逐列请求重绘后待绘制的区域仍是
+        单个矩形。
+        """
+        slot = self._slots.get(pet)
+        if slot is None:
+            return QRect()
+        slot.damage = slot.painted.united(slot.bounds)
+        return self._add_damage(slot.damage)
+
+    def _add_damage(self, rect: QRect) -> QRect:
+        """并入这一帧的重绘区域，返回合并后的包围盒"""
+        self._frame_damage = self._frame_damage.united(rect)
+        return self._frame_damage
+
+    def mark_painted(self, pet: 'TrainPet'):
+        """已按 damage 的结果请求重绘，记录本次占据的区域"""
+        slot = self._slots.get(pet)
+        if slot is None:
+            return
+        self._pending_damage.append(slot.damage)
+        slot.painted = slot.bounds
+
+    def take_pending_damage(self) -> QRegion:
+        """取出尚未绘制的重绘区域（无界面基准测试自行绘制时使用）"""
+        region = QRegion()
+        for damage in self._pending_damage:
+            region += damage
+        self._pending_damage.clear()
+        self._frame_damage = QRect()
+        self._damaged_pixels += self._region_area(region)
+        return region
+
+    @staticmethod
+    def _region_area(region: QRegion) -> int:
+        """区域面积（逻辑像素）"""
+        return sum(rect.width() * rect.height() for rect in region)
+
+    def flush_mask(self):
+        """应用合并后的点击遮罩，首次有遮罩时显示叠加层"""
+        self._mask_timer.stop()
+        if not self._mask_dirty:
+            return
+        self._mask_dirty = False
+
+        region = QRegion()
+        for slot in self._slots.values():
+            if not slot.mask.isEmpty():
+                region += slot.mask
+        # 空遮罩等于取消遮罩（整个屏幕都会拦截鼠标），此时不显示
+        if region.isEmpty():
+            return
+        # 只设置原生窗口的遮罩（决定哪里拦截鼠标），不用 QWidget.setMask：
+        # 控件遮罩会并入每次绘制的裁剪区域
+        self.create()
+        self.windowHandle().setMask(region)
+        self._mask_updates += 1
+        if not self.isVisible():
+            self.show()
+
+    def _schedule_mask(self):
+        """遮罩需要更新，在下一次事件循环时应用"""
+        self._mask_dirty = True
+        if not self._mask_timer.isActive():
+            self._mask_timer.start()
+
+    def pet_at(self, pos: QPoint) -> Optional['TrainPet']:
+        """获取指定位置（窗口坐标）最上层的列车"""
+        for pet in reversed(self._slots):
+            slot = self._slots[pet]
+            if slot.bounds.contains(pos) and any(rect.contains(pos) for rect in slot.content):
+                return pet
+        return None
+
+    def render_trains(self, painter: QPainter, region: QRegion):
+        """绘制与指定区域相交的列车（后加入的列车在上层）
+
+        Args:
+            painter: 画笔对象（已按区域裁剪）
+            region: 需要重绘的区域（窗口坐标）
+        """
+        origin = self.pos()
+        device_pixel_ratio = self.devicePixelRatioF()
+        for pet, slot in self._slots.items():
+            if region.intersects(slot.bounds):
+                pet.paint_train(painter, origin, device_pixel_ratio)
+
+    def reset_stats(self):
+        """重置统计计数"""
+        self._paints = 0
+        self._damaged_pixels = 0
+        self._mask_updates = 0
+
+    @property
+    def stats(self) -> OverlayStats:
+        """获取统计信息"""
+        return OverlayStats(
+            paints=self._paints,
+            damaged_pixels=self._damaged_pixels,
+            mask_updates=self._mask_updates
+        )
+
+    def paintEvent(self, event):
+        """绘制事件：只重绘脏区域内的列车"""
+        self._paints += 1
+        self._damaged_pixels += self._region_area(event.region())
+        self._pending_damage.clear()
+        self._frame_damage = QRect()
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        try:
+            self.render_trains(painter, event.region())
+        finally:
+            painter.end()
+
+    def keyPressEvent(self, event: QKeyEvent):
+        """键盘事件交给最近点击的列车"""
+        if self._focus_pet is not None:
+            self._focus_pet.keyPressEvent(event)
+        else:
+            super().keyPressEvent(event)
+
+    def mousePressEvent(self, event: QMouseEvent):
+        """鼠标按下：交给点中的列车，遮罩边距内没有点中列车时忽略"""
+        pet = self.pet_at(event.position().toPoint())
+        if pet is None:
+            event.ignore()
+            return
+        self._mouse_pet = pet
+        self._focus_pet = pet
+        pet.mousePressEvent(event)
+
+    def mouseMoveEvent(self, event: QMouseEvent):
+        """鼠标移动：交给按下时点中的列车"""
+        if self._mouse_pet is not None:
+            self._mouse_pet.mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event: QMouseEvent):
+        """鼠标释放：交给按下时点中的列车"""
+        pet, self._mouse_pet = self._mouse_pet, None
+        if pet is not None:
+            pet.mouseReleaseEvent(event)
+
+    def mouseDoubleClickEvent(self, event: QMouseEvent):
+        """鼠标双击：交给点中的列车"""
+        pet = self.pet_at(event.position().toPoint())
+        if pet is not None:
+            pet.mouseDoubleClickEvent(event)
+
+
+class OverlayCompositor(QObject):
+    """按屏幕管理叠加层，列车换屏时换到对应屏幕的叠加层"""
+    # 新建了叠加层（TrainOverlay）
+    overlay_created = Signal(object)
+
+    def __init__(self, screens: ScreenTracker, parent: Optional[QObject] = None):
+        """初始化管理器
+
+        Args:
+            screens: 屏幕监视器
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._screens = screens
+        self._overlays: Dict[str, TrainOverlay] = {}
+        screens.screen_changed.connect(self._on_screen_changed)
+        screens.screen_removed.connect(self._on_screen_removed)
+
+    def overlay_for(self, screen: ScreenInfo) -> TrainOverlay:
+        """获取屏幕的叠加层，不存在时创建
+
+        Args:
+            screen: 屏幕信息
+
+        Returns:
+            TrainOverlay: 叠加层
+        """
+        overlay = self._overlays.get(screen.name)
+        if overlay is None:
+            overlay = TrainOverlay(screen)
+            self._overlays[screen.name] = overlay
+            self.overlay_created.emit(overlay)
+        return overlay
+
+    @property
+    def overlays(self) -> List[TrainOverlay]:
+        """所有叠加层"""
+        return list(self._overlays.values())
+
+    @property
+    def stats(self) -> OverlayStats:
+        """所有叠加层的统计信息之和"""
+        stats = [overlay.stats for overlay in self._overlays.values()]
+        return OverlayStats(
+            paints=sum(s.paints for s in stats),
+            damaged_pixels=sum(s.damaged_pixels for s in stats),
+            mask_updates=sum(s.mask_updates for s in stats)
+        )
+
+    def _on_screen_changed(self, name: str):
+        """屏幕几何变化时叠加层跟随"""
+        overlay = self._overlays.get(name)
+        info = self._screens.info(name)
+        if overlay is not None and info is not None:
+            overlay.set_screen(info)
+
+    def _on_screen_removed(self, name: str):
+        """屏幕被移除，列车会各自移到主屏幕的叠加层，原叠加层随之隐藏"""
+        self._overlays.pop(name, None)
@@ -1,81 +1,265 @@
 from PySide6.QtWidgets import QWidget, QApplication
-from PySide6.QtCore import Qt, QPropertyAnimation, QPoint, QTimer, QSize
-from PySide6.QtGui import QPainter, QKeyEvent, QMouseEvent
+from PySide6.QtCore import Qt, QPropertyAnimation, QPoint, QSize, QEvent, QRect, QRectF
+from PySide6.QtGui import QPainter, QKeyEvent, QMouseEvent, QImage, QPixmap
+from typing import Dict, List, Optional
 import os
+import time
 
 from train_config import train_config
 from components.train_component import TrainComponent
-from states.train_state import TrainState
-from states.border_state import BorderState
+from components.train_layout import TrainLayout, ComponentPlacement
+from states.motion_engine import MODE_BORDER, MotionEngine
 from renderer.train_renderer import TrainRenderer
-from utils.image_loader import ImageLoader
+from renderer.component_renderer import snap_to_pixel
+from utils.image_loader import CropLoader, ImageLoader
+from utils.frame_scheduler import FrameScheduler
+from utils.frame_profiler import FrameProfiler
+from utils.motion_clock import MotionClock
+from utils.screen_tracker import ScreenInfo, ScreenTracker
+from utils.session_lock import SessionLockMonitor
+from utils.window_geometry import GeometryStats, WindowGeometry
+from train_overlay import OverlayCompositor, TrainOverlay
+from train_resources import SharedTrainResources, crop_regions, image_scales
 
 
 class TrainPet(QWidget):
     """高铁宠物主窗口"""
-    def __init__(self):
+    def __init__(self, motion_clock: Optional[MotionClock] = None,
+                 shared: Optional[SharedTrainResources] = None):
+        """初始化窗口
+        
+        Args:
+            motion_clock: 运动时钟，None 时使用系统单调时钟（基准测试可传入模拟时钟）
+            shared: 多列列车共用的资源（集群模式），此时不加载图片、不启动自己的
+                定时器，由集群统一调用 scheduler.drive 推进
+        """
         super().__init__()
+        self._shared = shared
+        
+        # 初始化图片加载器（集群模式下由集群统一加载）
+        self._image_loader: Optional[ImageLoader] = None
+        if shared is None:
+            self._image_loader = ImageLoader(
+                os.path.join(os.path.dirname(__file__), 'images'),
+                train_config.CROP_CACHE_DIR
+            )
+        self._crop_loader: Optional[CropLoader] = None
+        self._ready = False  # 图片加载完成、列车初始化后为 True
         
-        # 初始化图片加载器
-        self._image_loader = ImageLoader(
-            os.path.join(os.path.dirname(__file__), 'images')
-        )
+        # 初始化渲染器
+        if shared is not None:
+            self._renderer = shared.renderer
+        else:
+            self._renderer = TrainRenderer(debug_mode=train_config.DEBUG_MODE,
+                                           render_thread=train_config.RENDER_THREAD)
         
-       
+        # 初始化帧调度器：定时推进状态，只在渲染输入变化时重绘
+        self._scheduler = FrameScheduler(
+            train_config.ANIMATION_INTERVAL, self, use_timer=shared is None
+        )
         
-        # 初始化渲染器
-        self._renderer = TrainRenderer(debug_mode=True)
+        # 帧耗时记录，由环境变量或 F12 开启；关闭时不接入任何记录代码
+        self._profiler = FrameProfiler(
+            train_config.ANIMATION_INTERVAL, train_config.PROFILER_CAPACITY,
+            self._profiler_cache_stats
+        )
+        self._profiler_overlay = False
+        self._tick_slot = None  # 当前接入调度器的帧更新函数
+        profile_mode = os.environ.get(train_config.PROFILER_ENV_VAR, '').strip().lower()
+        if profile_mode and profile_mode != '0':
+            self._profiler.enabled = True
+            self._profiler_overlay = profile_mode != 'record'
+        
+        # 初始化运动时钟，调度器暂停期间时钟也暂停
+        self._motion_clock = motion_clock or MotionClock()
+        self._scheduler.active_changed.connect(self._on_scheduler_active_changed)
+        
+        # 锁屏判断：应用挂起或隐藏（移动平台），或平台的会话锁定通知（桌面平台）
+        self._app_suspended = False
+        self._session_lock: Optional[SessionLockMonitor] = None
+        if shared is None:
+            self._session_lock = SessionLockMonitor(self)
+        
+        # 监视屏幕插拔和几何变化，只让受影响屏幕的缓存失效
+        if shared is not None:
+            self._screens = shared.screens
+        else:
+            self._screens = ScreenTracker(self)
+            self._screens.device_pixel_ratio_released.connect(
+                self._renderer.invalidate_device_pixel_ratio
+            )
+        self._screens.screen_changed.connect(self._on_screen_changed)
+        self._screens.screen_removed.connect(self._on_screen_removed)
+        self._screen: ScreenInfo = self._screens.primary()  # 列车当前行驶的屏幕
+        self._window_screen_connected = False
+        
+        # 叠加层模式：列车画在所在屏幕的全屏叠加层上，自身窗口不显示
+        self._compositor: Optional[OverlayCompositor] = None
+        self._overlay: Optional[TrainOverlay] = None  # 当前所在的叠加层
+        self._overlay_visible = False  # 叠加层模式下列车是否显示
+        self._overlay_text_pos = QPoint(0, 0)  # 叠加层模式下统计信息的位置（屏幕坐标）
+        if train_config.WINDOW_GEOMETRY_MODE == 'overlay':
+            if shared is not None and shared.compositor is not None:
+                self._compositor = shared.compositor
+            else:
+                self._compositor = OverlayCompositor(self._screens, self)
+                
+        # 后台渲染线程：GUI 线程只提交快照，绘制事件只贴图（叠加层模式按脏区域绘制，不使用）
+        self._render_worker = self._renderer.render_worker if self._compositor is None else None
         
         # 初始化位置相关属性
-        self._current_row = 0  # 当前行号
-        self._vertical_target = 0  # 垂直目标位置
+        self._motion = MotionEngine()  # 车头运动（不依赖 Qt 的表驱动状态机）
+        self._motion_time = 0.0  # 上一次推进运动时的运动时钟时间
+        self._head_pos = QPoint(0, 0)  # 车头方框左上角（屏幕坐标），由状态驱动
+        self._placements: List[ComponentPlacement] = []  # 当前各组件的摆放
+        self._layout_input: Optional[tuple] = None  # 上一次布局时取整后的车头位置和朝向
         
-        # 加载图片资源
-        try:
+        # 窗口几何管理：合并每帧的移动请求
+        self._geometry = WindowGeometry(self)
+        
+        # 初始化窗口
+        self._init_window()
+        
+        if shared is not None:
+            # 共用已加载的图片，直接初始化列车
+            self._render_scale = shared.render_scale
+            self._head_image = shared.head_image
+            self._body_image = shared.body_image
+            self._tail_image = shared.tail_image
+            self._init_train()
+        else:
+            # 后台加载图片，完成后再初始化组件、状态和动画
             self._load_images()
-        except FileNotFoundError as e:
-            
-            QApplication.quit()
-            return
+        
+    def _load_images(self):
+        """在工作线程中按目标尺寸读取车头、车厢和车尾图片"""
+        decode_scale, self._render_scale = image_scales(self._screens)
+        self._crop_loader = CropLoader(
+            self._image_loader, train_config.IMAGE_SOURCE, crop_regions(), decode_scale
+        )
+        self._crop_loader.crops_ready.connect(self._on_images_loaded)
+        self._crop_loader.failed.connect(self._on_images_failed)
+        self._crop_loader.finished.connect(self._crop_loader.deleteLater)
+        self._crop_loader.finished.connect(self._on_crop_loader_finished)
+        self._crop_loader.start()
+        
+    def wait_for_images(self, timeout_ms: int = -1) -> bool:
+        """阻塞等待图片加载完成并初始化列车
+        
+        Args:
+            timeout_ms: 超时时间（毫秒），-1 表示一直等待
             
+        Returns:
+            bool: 列车是否已初始化
+        """
+        if not self._ready and self._crop_loader is not None:
+            if timeout_ms < 0:
+                self._crop_loader.wait()
+            else:
+                self._crop_loader.wait(timeout_ms)
+            QApplication.sendPostedEvents(self, QEvent.Type.MetaCall)
+        return self._ready
+        
+    def _on_images_loaded(self, crops: Dict[str, QImage]):
+        """图片加载完成（GUI 线程）"""
+        self._head_image = QPixmap.fromImage(crops['head'])
+        self._body_image = QPixmap.fromImage(crops['body'])
+        self._tail_image = QPixmap.fromImage(crops['tail'])
+        
+        # 后台预生成所有朝向变体
+        self._renderer.prepare_atlas(
+            [self._head_image, self._body_image, self._tail_image],
+            self._render_scale,
+            train_config.ATLAS_ROTATION_ANGLES,
+            self.device_pixel_ratio
+        )
+        self._init_train()
+        
+    def _init_train(self):
+        """图片就绪后初始化组件、状态、初始位置和动画"""
         # 初始化组件
         self._init_components()
         
-        # 初始化状态（使用边框状态）
-        self._current_state: TrainState = BorderState(self)
-        
-        # 初始化窗口
-        self._init_window()
+        # 设置车头初始位置（主屏幕右下角），沿边框行驶
+        screen = self._screen.geometry
+        self._head_pos = QPoint(
+            screen.right() + 1 - self.head_size - train_config.WINDOW_MARGIN,
+            screen.bottom() + 1 - self.head_size - train_config.WINDOW_MARGIN
+        )
+        self._update_motion_bounds()
+        self._motion.set_mode(MODE_BORDER)
+        self._resync_motion()
+        self._motion_time = self._motion_clock.now()
+        self._layout_train()
+        self._geometry.flush()
+        self._ready = True
+        if self._overlay_visible:
+            self._attach_overlay()
         
         # 初始化动画
         self._init_animation()
         
-    def _load_images(self):
-        """加载图片资源"""
-        # 加载完整图片
-        try:
-            self._full_image = self._image_loader.load_image('train_all.png')
-        except FileNotFoundError as e:
-           
-            raise
-            
-        # 只裁剪车头图片
-        try:
-            self._head_image = self._image_loader.crop_image(
-                self._full_image, train_config.HEAD_POS
-            )
-        except Exception as e:
-           
-            raise
-            
+    def start_at(self, fraction: float):
+        """从边框路线上的指定位置出发（集群模式下错开各列列车）
+        
+        Args:
+            fraction: 路线上的位置占一圈的比例（0~1）
+        """
+        if not self._ready:
+            return
+        self._motion.start_at(fraction)
+        self._apply_motion()
+        self._layout.reset()
+        self._layout_train()
+        self._geometry.flush()
+        
+    def _on_crop_loader_finished(self):
+        """释放加载线程（线程结束后才能丢弃引用，否则会在运行中被销毁）"""
+        self._crop_loader = None
+        
+    def _on_images_failed(self, message: str):
+        """图片加载失败"""
+        QApplication.quit()
+        
     def _init_components(self):
         """初始化列车组件"""
-        # 只创建车头组件
+        # 创建车头组件
         self._head = TrainComponent(
             self._head_image,
-            QPoint(0, 0),  # 位置将由渲染器计算
-            train_config.SCALE_FACTOR
+            QPoint(0, 0),  # 位置将由布局计算
+            self._render_scale
         )
+        self._carriage_count = train_config.DEFAULT_CARRIAGES
+        self._layout = TrainLayout(self._build_components(), train_config.TRAIL_SAMPLE_SPACING)
+        
+    def _build_components(self) -> List[TrainComponent]:
+        """按车厢数构建车头到车尾的组件列表"""
+        bodies = [
+            TrainComponent(self._body_image, QPoint(0, 0), self._render_scale)
+            for _ in range(self._carriage_count)
+        ]
+        tail = TrainComponent(self._tail_image, QPoint(0, 0), self._render_scale)
+        return [self._head] + bodies + [tail]
+        
+    def set_carriage_count(self, count: int):
+        """设置车厢数（限制在配置范围内）
+        
+        Args:
+            count: 车厢数
+        """
+        count = max(train_config.MIN_CARRIAGES, min(train_config.MAX_CARRIAGES, count))
+        if not self._ready or count == self._carriage_count:
+            return
+        self._carriage_count = count
+        self._layout.set_components(self._build_components())
+        self._layout_train()
+        self._geometry.flush()
+        self._request_repaint()
+        
+    @property
+    def carriage_count(self) -> int:
+        """获取车厢数"""
+        return self._carriage_count
         
     def _init_window(self):
         """初始化窗口"""
@@ -88,116 +272,602 @@ class TrainPet(QWidget):
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)  # 透明背景
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)  # 允许接收键盘事件
         
-        # 获取屏幕尺寸
-        screen = QApplication.primaryScreen().geometry()
-        self._screen_width = screen.width()
-        self._screen_height = screen.height()
+        # 图片加载完成前窗口不占据屏幕区域
+        self.setFixedSize(1, 1)
         
-        # 设置初始窗口大小（水平方向）
-        self.adjust_window_size(is_vertical=True)
+    def _set_screen(self, info: ScreenInfo):
+        """切换列车行驶的屏幕
         
-        # 设置初始位置（屏幕右下角）
-        self.move(
-            self._screen_width - self.width() - train_config.WINDOW_MARGIN,
-            self._screen_height - self.height() - train_config.WINDOW_MARGIN
+        Args:
+            info: 屏幕信息
+        """
+        self._screen = info
+        self._renderer.ensure_atlas(self.device_pixel_ratio)
+        self._scheduler.invalidate()
+        if self._ready:
+            self._update_motion_bounds()
+        if self._overlay is not None:
+            self._attach_overlay()
+        
+    def _on_screen_changed(self, name: str):
+        """某块屏幕插入或几何、DPI 发生变化"""
+        if not self._ready:
+            info = self._screens.info(name)
+            if info is not None and name == self._screen.name:
+                self._screen = info
+            return
+        if name != self._screen.name:
+            return
+        info = self._screens.info(name)
+        if info is not None:
+            self._set_screen(info)
+            self._resync_motion()
+            
+    def _on_screen_removed(self, name: str):
+        """某块屏幕被移除，列车所在屏幕被移除时移到主屏幕"""
+        if not self._ready:
+            if name == self._screen.name:
+                self._screen = self._screens.primary()
+            return
+        if name != self._screen.name:
+            return
+        self._set_screen(self._screens.primary())
+        
+        # 车头放回新屏幕内，重新铺设轨迹
+        screen = self._screen.geometry
+        size = self.head_size
+        self._head_pos = QPoint(
+            max(screen.left(), min(self._head_pos.x(), screen.right() + 1 - size)),
+            max(screen.top(), min(self._head_pos.y(), screen.bottom() + 1 - size))
         )
+        self._layout.reset()
+        self._resync_motion()
+        self._layout_train()
+        self._geometry.flush()
+        
+    def _on_window_screen_changed(self, screen):
+        """窗口移到另一块屏幕，强制重绘"""
+        self._renderer.ensure_atlas(self.device_pixel_ratio)
+        self._scheduler.invalidate()
+        self.update()
+        
+    @property
+    def head_size(self) -> int:
+        """车头方框边长（车头任意朝向都能放下的正方形）"""
+        return int(max(self._head_image.width(), self._head_image.height())
+                   * self._render_scale)
+        
+    def head_pos(self) -> QPoint:
+        """获取车头方框左上角（屏幕坐标）"""
+        return self._head_pos
         
-    def adjust_window_size(self, is_vertical: bool):
-        """调整窗口大小
+    def move_head(self, pos: QPoint):
+        """移动车头方框，窗口在布局更新时随之调整
         
         Args:
-            is_vertical: 是否垂直移动
+            pos: 车头方框左上角（屏幕坐标）
         """
-        # 获取图片原始尺寸
-        original_width = self._head_image.width()
-        original_height = self._head_image.height()
-
-        if original_width > original_height:
-            width = int(original_width * train_config.SCALE_FACTOR)
-            height = int(original_width * train_config.SCALE_FACTOR)
-        else:
-            width = int(original_height * train_config.SCALE_FACTOR)
-            height = int(original_height * train_config.SCALE_FACTOR)
-
-        # 记录当前位置
-        current_pos = self.pos()
+        self._head_pos = pos
+        
+    def _update_motion_bounds(self):
+        """把当前屏幕和车头尺寸交给运动引擎"""
+        screen = self._screen.geometry
+        self._motion.set_bounds(screen.x(), screen.y(), screen.width(), screen.height(),
+                                self.head_size)
+        
+    def _resync_motion(self):
+        """车头被外部移动（拖拽、换屏）后，运动从当前车头位置继续"""
+        self._motion.place(self._head_pos.x(), self._head_pos.y())
+        
+    def _apply_motion(self):
+        """按运动引擎的结果更新车头位置和朝向"""
+        motion = self._motion
+        self._head_pos = QPoint(round(motion.x), round(motion.y))
+        self._head.rotation_angle = motion.rotation_angle
+        
+    def _layout_train(self):
+        """记录车头位置，计算整列列车的摆放并调整窗口"""
+        half = self.head_size / 2
+        x, y = self._head_pos.x(), self._head_pos.y()
+        angle, mirrored = self._head.rotation_angle, self._motion.is_mirrored
+        self._layout_input = (x, y, angle, mirrored)
+        self._placements = self._layout.update(x + half, y + half, angle, mirrored)
+        self.adjust_window_size()
+        
+    def adjust_window_size(self):
+        """请求调整窗口位置和大小（每帧合并为最多一次原生变更）
+        
+        固定模式下窗口尺寸只取决于列车组成，转弯时只移动不改尺寸；
+        贴合模式下窗口刚好包住整列列车。
+        """
+        if not self._placements:
+            return
+            
+        if self._compositor is not None:
+            self._place_on_overlay()
+            return
+            
+        # 用浮点数求包围盒，避免每帧为每个组件创建 QRectF（列车多时逐帧累加）
+        left = top = float('inf')
+        right = bottom = float('-inf')
+        for placement in self._placements:
+            width, height = placement.component.rotated_size(placement.rotation_angle)
+            x, y = placement.x, placement.y
+            if x - width / 2 < left:
+                left = x - width / 2
+            if x + width / 2 > right:
+                right = x + width / 2
+            if y - height / 2 < top:
+                top = y - height / 2
+            if y + height / 2 > bottom:
+                bottom = y + height / 2
+            
+        if train_config.WINDOW_GEOMETRY_MODE == 'fixed':
+            side = self._layout.covering_size() + train_config.WINDOW_GEOMETRY_PADDING * 2
+            # 以取整后的车头位置为锚点，直行时窗口和列车同步移动整像素，
+            # 各部件在窗口内的相对位置不变，可以跳过重绘
+            head = self._placements[0]
+            self._geometry.request(
+                QPoint(snap_to_pixel(head.x) + round((left + right) / 2 - head.x - side / 2),
+                       snap_to_pixel(head.y) + round((top + bottom) / 2 - head.y - side / 2)),
+                QSize(side, side)
+            )
+            return
+            
+        rect = QRectF(left, top, right - left, bottom - top).toAlignedRect().adjusted(-1, -1, 1, 1)
+        self._geometry.request(rect.topLeft(), rect.size())
         
-        # 设置新的窗口大小
-        self.setFixedSize(width, height)
+    def _place_on_overlay(self):
+        """计算各组件在叠加层上占据的区域（按取整后的位置，与渲染输入一致）"""
+        if self._overlay is None:
+            return
+        # 直接按叠加层窗口坐标计算，包围盒用整数求，不逐个合并 QRect
+        padding = train_config.WINDOW_GEOMETRY_PADDING
+        origin = self._overlay.pos()
+        origin_x, origin_y = origin.x() + padding, origin.y() + padding
+        rects = []
+        left = top = right = bottom = None
+        for placement in self._placements:
+            width, height = placement.component.rotated_size(placement.rotation_angle)
+            x = snap_to_pixel(placement.x) - width // 2 - origin_x
+            y = snap_to_pixel(placement.y) - height // 2 - origin_y
+            width += padding * 2
+            height += padding * 2
+            rects.append(QRect(x, y, width, height))
+            if left is None:
+                left, top, right, bottom = x, y, x + width, y + height
+                continue
+            if x < left:
+                left = x
+            if y < top:
+                top = y
+            if x + width > right:
+                right = x + width
+            if y + height > bottom:
+                bottom = y + height
+        bounds = QRect(left, top, right - left, bottom - top)
+            
+        # 统计信息画在列车左上角
+        self._overlay_text_pos = bounds.topLeft() + origin
+        if self._profiler_overlay:
+            text_rect = self._profiler.overlay_rect(self._overlay_text_pos).translated(-origin)
+            rects.append(text_rect)
+            bounds = bounds.united(text_rect)
+        self._overlay.place(self, rects, bounds)
+            
+    def _attach_overlay(self):
+        """挂到当前屏幕的叠加层上（换屏时从原叠加层移到新叠加层）"""
+        overlay = self._compositor.overlay_for(self._screen)
+        if overlay is self._overlay:
+            return
+        previous, self._overlay = self._overlay, overlay
+        overlay.attach(self)
+        if previous is not None:
+            previous.detach(self)
+        self._scheduler.invalidate()
+        self._layout_train()
+        self._request_repaint()
+        
+    def _detach_overlay(self):
+        """从叠加层上移除"""
+        if self._overlay is not None:
+            self._overlay.detach(self)
+            self._overlay = None
+            
+    @property
+    def overlay(self) -> Optional[TrainOverlay]:
+        """列车所在的叠加层（非叠加层模式或未显示时为 None）"""
+        return self._overlay
         
-        # 保持窗口中心点不变 TODO:后面还需要调整
-        center_x = current_pos.x() + self.width() // 2
-        center_y = current_pos.y() + self.height() // 2
-        new_x = center_x - width // 2
-        new_y = center_y - height // 2
+    @property
+    def compositor(self) -> Optional[OverlayCompositor]:
+        """叠加层管理器（非叠加层模式为 None）"""
+        return self._compositor
         
-        # 移动到新位置
-        self.move(new_x, new_y)
+    @property
+    def surface(self) -> QWidget:
+        """显示列车的窗口（叠加层模式下为所在屏幕的叠加层）"""
+        return self._overlay if self._overlay is not None else self
+        
+    @property
+    def device_pixel_ratio(self) -> float:
+        """列车所在屏幕的设备像素比
+
+        朝向图集按它构建，渲染线程的快照和 GUI 线程的绘制也按它查找图集，
+        三者必须一致，否则查不到图集（窗口自身的设备像素比不一定跟随屏幕）。
+        """
+        return self._screen.device_pixel_ratio
+        
+    @property
+    def geometry_stats(self) -> GeometryStats:
+        """获取原生窗口几何变更统计"""
+        return self._geometry.stats
         
     def _init_animation(self):
         """初始化动画"""
-        # 创建定时器
-        self._timer = QTimer(self)
-        self._timer.timeout.connect(self._update)
-        self._timer.start(16)  # 约60FPS
+        # 启动帧调度器
+        self._connect_tick()
+        self._scheduler.start()
+        
+        # 屏幕锁定或应用挂起时暂停（集群模式下由集群暂停共用定时器和共用时钟）
+        if self._shared is None:
+            QApplication.instance().applicationStateChanged.connect(
+                self._on_application_state_changed
+            )
+            self._session_lock.locked_changed.connect(self._update_locked_pause)
+            self._update_locked_pause()
+        
+    def update_frame(self):
+        """推进一帧：更新状态和布局，必要时请求重绘"""
+        # 按运动时钟经过的时间推进车头（阶段切换在引擎内部查表完成）
+        now = self._motion_clock.now()
+        self._motion.step(now - self._motion_time)
+        self._motion_time = now
+        self._apply_motion()
+            
+        # 车厢沿轨迹跟随，窗口随列车移动（只移动窗口，不触发重绘）；
+        # 布局只取决于取整后的车头位置和朝向，没有跨过整像素时摆放和窗口都不变
+        if (self._head_pos.x(), self._head_pos.y(), self._head.rotation_angle,
+                self._motion.is_mirrored) != self._layout_input:
+            self._layout_train()
+            self._geometry.flush()
+        
+        # 窗口内像素只取决于各组件相对窗口的位置和朝向
+        self._request_repaint()
         
-    def _update(self):
-        """更新状态"""
-        # 更新位置
-        self._current_state.update_position()
+    def _request_repaint(self):
+        """渲染输入变化时请求重绘
         
-        # 更新旋转角度
-        rotation_angle = self._current_state.get_rotation_angle()
-        if rotation_angle != self._head.rotation_angle:
-            old_angle = self._head.rotation_angle
-            self._head.rotation_angle = rotation_angle
+        叠加层模式下只重绘上一次和这一次占据的区域；开启渲染线程时提交快照，
+        渲染线程准备好这一帧后再重绘。
+        """
+        key = self._render_key()
+        if self._overlay is not None:
+            if self._scheduler.request_repaint(self._overlay, key, self._overlay.damage(self)):
+                self._overlay.mark_painted(self)
+        elif self._render_worker is None or not self._ready:
+            self._scheduler.request_repaint(self, key)
+        elif self._scheduler.take_render_key(key) and not self._submit_frame():
+            # 图集尚未就绪，这一帧在 GUI 线程绘制
+            self.update()
             
+    def _submit_frame(self) -> bool:
+        """把当前帧的快照交给渲染线程
+        
+        Returns:
+            bool: 是否已提交
+        """
+        snapshot = self._renderer.frame_snapshot(
+            self, self._placements, self.pos(), self._render_scale,
+            self.device_pixel_ratio,
+            self._profiler.overlay_text() if self._profiler_overlay else None
+        )
+        if snapshot is None:
+            return False
+        self._render_worker.submit(snapshot)
+        return True
+        
+    def _profiled_update_frame(self):
+        """记录耗时的帧更新（仅在开启记录时接入）"""
+        start = time.perf_counter()
+        self.update_frame()
+        self._profiler.record_update(start, time.perf_counter())
+        
+    def _connect_tick(self):
+        """按记录开关接入帧更新，关闭记录时直接调用 update_frame"""
+        slot = self._profiled_update_frame if self._profiler.enabled else self.update_frame
+        if slot == self._tick_slot:
+            return
+        if self._tick_slot is not None:
+            self._scheduler.tick.disconnect(self._tick_slot)
+        self._scheduler.tick.connect(slot)
+        self._tick_slot = slot
             
-        # 强制重绘
-        self.update()
+    def _profiler_cache_stats(self) -> tuple:
+        """记录用的缓存统计：(变换命中, 变换未命中, 长条命中, 长条未命中)"""
+        cache = self._renderer.cache_stats
+        strip = self._renderer.strip_cache_stats
+        return cache.hits, cache.misses, strip.hits, strip.misses
         
-    def paintEvent(self, event):
-        """绘制事件"""
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    def set_profiling(self, enabled: bool, overlay: bool = True):
+        """开启或关闭帧耗时记录
         
-        try:
-            # 只渲染车头组件
-            components = [self._head]
+        Args:
+            enabled: 是否记录
+            overlay: 记录时是否在窗口上显示统计信息
+        """
+        self._profiler.enabled = enabled
+        self._profiler_overlay = enabled and overlay
+        self._scheduler.invalidate()
+        if self._ready:
+            self._connect_tick()
+            self._layout_train()
+            self._request_repaint()
+        else:
+            self.update()
+        
+    def dump_profile(self, directory: Optional[str] = None) -> List[str]:
+        """将帧耗时记录导出为 CSV 和 JSON
+        
+        Args:
+            directory: 导出目录，None 时使用配置的目录
             
-            # 计算旋转中心点
-            center_point = QPoint(self.width() / 2, self.height() / 2)
+        Returns:
+            List[str]: 导出的文件路径
+        """
+        directory = directory or train_config.PROFILER_DUMP_DIR or os.getcwd()
+        stem = os.path.join(directory, time.strftime('trainpet-frames-%Y%m%d-%H%M%S'))
+        self._profiler.dump_csv(stem + '.csv')
+        self._profiler.dump_json(stem + '.json')
+        return [stem + '.csv', stem + '.json']
+        
+    @property
+    def profiler(self) -> FrameProfiler:
+        """获取帧耗时记录器"""
+        return self._profiler
+        
+    def _render_key(self) -> tuple:
+        """决定窗口内像素的全部渲染输入"""
+        surface = self.surface
+        origin_x, origin_y = surface.x(), surface.y()
+        overlay = self._profiler.overlay_text() if self._profiler_overlay else None
+        key = [surface.width(), surface.height(), self.device_pixel_ratio, overlay]
+        snap = snap_to_pixel
+        for p in self._placements:
+            key += (snap(p.x) - origin_x, snap(p.y) - origin_y, p.rotation_angle, p.is_mirrored)
+        return tuple(key)
+        
+    def _on_scheduler_active_changed(self, active: bool):
+        """调度器启停时同步运动时钟"""
+        if active:
+            self._profiler.reset_tick()
+            self._motion_clock.resume()
+        else:
+            self._motion_clock.pause()
             
-            # 渲染列车
-            self._renderer.render(
+    def _on_application_state_changed(self, state: Qt.ApplicationState):
+        """应用状态变化（移动平台锁屏、挂起）"""
+        self._app_suspended = state in (Qt.ApplicationState.ApplicationSuspended,
+                                        Qt.ApplicationState.ApplicationHidden)
+        self._update_locked_pause()
+        
+    def _update_locked_pause(self):
+        """应用挂起或会话锁定时暂停，两者都解除后恢复"""
+        locked = self._session_lock is not None and self._session_lock.is_locked
+        if self._app_suspended or locked:
+            self._scheduler.pause(FrameScheduler.PAUSE_LOCKED)
+        else:
+            self._scheduler.resume(FrameScheduler.PAUSE_LOCKED)
+            
+    def toggle_parked(self):
+        """停靠或继续行驶"""
+        if self._scheduler.is_paused_by(FrameScheduler.PAUSE_PARKED):
+            self._scheduler.resume(FrameScheduler.PAUSE_PARKED)
+        else:
+            self._scheduler.pause(FrameScheduler.PAUSE_PARKED)
+            
+    @property
+    def scheduler(self) -> FrameScheduler:
+        """获取帧调度器"""
+        return self._scheduler
+        
+    @property
+    def motion(self) -> MotionEngine:
+        """获取车头运动引擎"""
+        return self._motion
+        
+    def set_motion_mode(self, mode: int):
+        """切换运动模式（MODE_BORDER 沿边框，MODE_SCAN 水平扫描），从当前车头位置开始
+        
+        Args:
+            mode: 运动模式
+        """
+        self._motion.set_mode(mode)
+        self._resync_motion()
+        self._scheduler.invalidate()
+        
+    @property
+    def renderer(self) -> TrainRenderer:
+        """获取列车渲染器"""
+        return self._renderer
+        
+    @property
+    def placements(self) -> List[ComponentPlacement]:
+        """获取当前各组件的摆放（屏幕坐标）"""
+        return self._placements
+        
+    @property
+    def render_scale(self) -> float:
+        """获取绘制时相对已解码图片的缩放因子"""
+        return self._render_scale
+        
+    def paint_train(self, painter: QPainter, origin: QPoint, device_pixel_ratio: float):
+        """绘制整列列车和统计信息（自身窗口和叠加层共用）
+        
+        Args:
+            painter: 画笔对象
+            origin: 绘制目标窗口左上角的屏幕坐标
+            device_pixel_ratio: 绘制目标窗口的设备像素比
+        """
+        profiling = self._profiler.enabled
+        if profiling:
+            start = time.perf_counter()
+            
+        if self._ready:
+            # 渲染整列列车（直线行驶时绘制合成长条）
+            self._renderer.render_placements(
                 painter=painter,
-                components=components,
-                window_size=QSize(self.width(), self.height()),
-                scale_factor=train_config.SCALE_FACTOR,
-                rotation_angle=self._current_state.get_rotation_angle(),
-                center_point=center_point,
-                is_mirrored=self.is_moving_right  # 向右移动时进行镜像
+                placements=self._placements,
+                origin=origin,
+                scale_factor=self._render_scale,
+                device_pixel_ratio=device_pixel_ratio
             )
             
+        if profiling:
+            self._profiler.record_paint(start, time.perf_counter())
+            if self._profiler_overlay:
+                text_pos = self._overlay_text_pos - origin if self._overlay is not None \
+                    else QPoint(0, 0)
+                self._profiler.draw_overlay(painter, text_pos)
+                
+    def paintEvent(self, event):
+        """绘制事件（开启渲染线程时只贴上渲染好的一帧）"""
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        try:
+            if self._render_worker is None or not self._blit_frame(painter):
+                self.paint_train(painter, self.pos(), self.device_pixel_ratio)
         finally:
             # 确保画笔正确结束
             painter.end()
         
+    def _blit_frame(self, painter: QPainter) -> bool:
+        """贴上渲染线程准备好的一帧，记录时只统计 GUI 线程的贴图耗时
+        
+        Args:
+            painter: 画笔对象
+            
+        Returns:
+            bool: 是否已有渲染好的帧
+        """
+        if not self._profiler.enabled:
+            return self._render_worker.blit(painter, self)
+        start = time.perf_counter()
+        blitted = self._render_worker.blit(painter, self)
+        if blitted:
+            self._profiler.record_paint(start, time.perf_counter())
+        return blitted
+        
     def keyPressEvent(self, event: QKeyEvent):
         """键盘按下事件"""
+        if not self._ready:
+            super().keyPressEvent(event)
+            return
+        # F12 开关帧耗时记录，Shift+F12 导出记录
+        if event.key() == Qt.Key.Key_F12:
+            if event.modifiers() & Qt.KeyboardModifier.ShiftModifier:
+                self.dump_profile()
+            else:
+                self.set_profiling(not self._profiler.enabled)
+            event.accept()
+            return
+        # 空格键停靠/继续
+        if event.key() == Qt.Key.Key_Space:
+            self.toggle_parked()
+            event.accept()
+            return
+        # 加减号增减车厢
+        if event.key() in (Qt.Key.Key_Plus, Qt.Key.Key_Equal):
+            self.set_carriage_count(self._carriage_count + 1)
+            event.accept()
+            return
+        if event.key() == Qt.Key.Key_Minus:
+            self.set_carriage_count(self._carriage_count - 1)
+            event.accept()
+            return
         super().keyPressEvent(event)
         
+    def setVisible(self, visible: bool):
+        """显示或隐藏列车（叠加层模式下自身窗口不显示，列车画在叠加层上）"""
+        if self._compositor is None:
+            super().setVisible(visible)
+            return
+        self._overlay_visible = visible
+        if visible:
+            self._scheduler.resume(FrameScheduler.PAUSE_HIDDEN)
+            if self._ready:
+                self._attach_overlay()
+        else:
+            self._scheduler.pause(FrameScheduler.PAUSE_HIDDEN)
+            self._detach_overlay()
+            
+    def closeEvent(self, event):
+        """关闭事件"""
+        super().closeEvent(event)
+        if self._render_worker is not None:
+            self._render_worker.discard(self)
+        if self._compositor is None:
+            return
+        # 叠加层上的最后一列列车关闭时关闭叠加层（没有其他窗口时程序退出，与窗口模式一致）
+        if self._overlay is not None and self._overlay.pets == [self]:
+            self._overlay.close()
+        self.setVisible(False)
+        
+    def showEvent(self, event):
+        """显示事件"""
+        super().showEvent(event)
+        if not self._window_screen_connected and self.windowHandle() is not None:
+            self.windowHandle().screenChanged.connect(self._on_window_screen_changed)
+            self._window_screen_connected = True
+        self._scheduler.resume(FrameScheduler.PAUSE_HIDDEN)
+        
+    def hideEvent(self, event):
+        """隐藏事件"""
+        super().hideEvent(event)
+        self._scheduler.pause(FrameScheduler.PAUSE_HIDDEN)
+        
+    def changeEvent(self, event):
+        """窗口状态变化事件（最小化时暂停）"""
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange:
+            if self.isMinimized():
+                self._scheduler.pause(FrameScheduler.PAUSE_HIDDEN)
+            else:
+                self._scheduler.resume(FrameScheduler.PAUSE_HIDDEN)
+        
     def mousePressEvent(self, event: QMouseEvent):
         """鼠标按下事件"""
-        if event.button() == Qt.MouseButton.LeftButton:
-            self._drag_position = event.globalPosition().toPoint() - \
-                                 self.frameGeometry().topLeft()
+        if self._ready and event.button() == Qt.MouseButton.LeftButton:
+            self._drag_position = event.globalPosition().toPoint() - self._head_pos
+            # 拖拽期间暂停动画
+            self._scheduler.pause(FrameScheduler.PAUSE_DRAGGING)
+            event.accept()
+            
+    def mouseReleaseEvent(self, event: QMouseEvent):
+        """鼠标释放事件"""
+        if self._ready and event.button() == Qt.MouseButton.LeftButton:
+            # 拖到另一块屏幕时在该屏幕上行驶
+            half = self.head_size // 2
+            info = self._screens.screen_at(self._head_pos + QPoint(half, half))
+            if info.name != self._screen.name:
+                self._set_screen(info)
+                
+            # 从拖拽后的位置继续运动
+            self._resync_motion()
+            self._scheduler.resume(FrameScheduler.PAUSE_DRAGGING)
             event.accept()
             
     def mouseMoveEvent(self, event: QMouseEvent):
         """鼠标移动事件"""
-        if event.buttons() == Qt.MouseButton.LeftButton:
-            self.move(event.globalPosition().toPoint() - self._drag_position)
+        if self._ready and event.buttons() == Qt.MouseButton.LeftButton:
+            # 整列列车随鼠标平移，保持当前形状
+            new_pos = event.globalPosition().toPoint() - self._drag_position
+            delta = new_pos - self._head_pos
+            self._layout.trail.translate(delta.x(), delta.y())
+            self.move_head(new_pos)
+            self._layout_train()
+            self._request_repaint()
             event.accept()
             
     def mouseDoubleClickEvent(self, event: QMouseEvent):
@@ -206,47 +876,41 @@ class TrainPet(QWidget):
             self.close()
             
     @property
-    def move_speed(self) -> int:
-        """获取移动速度"""
+    def move_speed(self) -> float:
+        """获取移动速度（像素/秒）"""
         return train_config.MOVE_SPEED
         
     @property
-    def vertical_step(self) -> int:
-        """获取垂直步长"""
-        return train_config.VERTICAL_STEP
+    def motion_clock(self) -> MotionClock:
+        """获取运动时钟"""
+        return self._motion_clock
+        
+    @property
+    def screen_name(self) -> str:
+        """获取列车当前行驶的屏幕名称"""
+        return self._screen.name
+        
+    @property
+    def screen_geometry(self) -> QRect:
+        """获取列车当前行驶的屏幕区域（虚拟桌面坐标）"""
+        return self._screen.geometry
         
     @property
     def screen_width(self) -> int:
         """获取屏幕宽度"""
-        return self._screen_width
+        return self._screen.geometry.width()
         
     @property
     def screen_height(self) -> int:
         """获取屏幕高度"""
-        return self._screen_height
+        return self._screen.geometry.height()
         
     @property
     def current_row(self) -> int:
-        """获取当前行"""
-        return self._current_row
-        
-    @current_row.setter
-    def current_row(self, value: int):
-        """设置当前行"""
-        self._current_row = value
-        
-    @property
-    def vertical_target(self) -> int:
-        """获取垂直目标位置"""
-        return self._vertical_target
-        
-    @vertical_target.setter
-    def vertical_target(self, value: int):
-        """设置垂直目标位置"""
-        self._vertical_target = value
+        """获取扫描模式的当前行"""
+        return self._motion.row
         
     @property
     def is_moving_right(self) -> bool:
         """是否向右移动"""
-        # 使用当前状态的移动方向判断
-        return self._current_state.is_moving_right if hasattr(self._current_state, 'is_moving_right') else False 
\ No newline at end of file
+        return self._motion.is_moving_right
@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from PySide6.QtGui import QPixmap
+from train_config import train_config
+from renderer.train_renderer import TrainRenderer
+from train_overlay import OverlayCompositor
+from utils.screen_tracker import ScreenTracker
+
+
+@dataclass
+class SharedTrainResources:
+    """多列列车共用的资源
+
+    所有列车共用一份解码后的图片和一个渲染器（变换缓存、朝向图集、
+    合成长条），图片的 cacheKey 相同，缓存条目也就只有一份。
+    """
+    renderer: TrainRenderer  # 共用的渲染器
+    screens: ScreenTracker  # 共用的屏幕监视器
+    head_image: QPixmap  # 车头图片（已按解码缩放裁剪）
+    body_image: QPixmap  # 车厢图片
+    tail_image: QPixmap  # 车尾图片
+    render_scale: float  # 绘制时相对已解码图片的缩放因子
+    compositor: Optional[OverlayCompositor] = None  # 叠加层模式下共用的叠加层
+
+
+def image_scales(screens: ScreenTracker) -> Tuple[float, float]:
+    """计算图片的解码缩放和绘制缩放
+
+    按最高的设备像素比解码，渲染时只需缩小，不会放大。
+
+    Args:
+        screens: 屏幕监视器
+
+    Returns:
+        Tuple[float, float]: (解码缩放因子, 绘制时相对解码图片的缩放因子)
+    """
+    max_ratio = max(screens.device_pixel_ratios | {1.0})
+    decode_scale = min(1.0, train_config.SCALE_FACTOR * max_ratio)
+    return decode_scale, train_config.SCALE_FACTOR / decode_scale
+
+
+def crop_regions() -> Dict[str, Tuple[int, int, int, int]]:
+    """车头、车厢和车尾在原始图片中的区域"""
+    return {
+        'head': train_config.HEAD_POS,
+        'body': train_config.BODY_POS,
+        'tail': train_config.TAIL_POS
+    }
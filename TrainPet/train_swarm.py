@@ -0,0 +1,204 @@
+import os
+from typing import Dict, List, Optional, Tuple
+from PySide6.QtCore import QObject, Qt, Signal
+from PySide6.QtGui import QImage, QPixmap
+from PySide6.QtWidgets import QApplication
+
+from train_config import train_config
+from train_overlay import OverlayCompositor
+from train_pet import TrainPet
+from train_resources import SharedTrainResources, crop_regions, image_scales
+from renderer.train_renderer import TrainRenderer
+from states.route_path import quantized_angles
+from utils.frame_scheduler import FrameScheduler
+from utils.image_loader import CropLoader, ImageLoader
+from utils.motion_clock import MotionClock
+from utils.screen_tracker import ScreenTracker
+from utils.session_lock import SessionLockMonitor
+
+
+class TrainSwarm(QObject):
+    """列车集群
+
+    在一个进程中运行多列列车：共用一个定时器，每帧统一读取一次时间并
+    依次推进所有列车；共用一份解码后的图片和一个渲染器（变换缓存、
+    朝向图集、合成长条）。每列列车只保留自己的状态、轨迹和窗口。
+    """
+    # 所有列车创建完成
+    ready = Signal()
+
+    def __init__(self, count: int, parent: Optional[QObject] = None):
+        """初始化集群
+
+        Args:
+            count: 列车数量
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._count = count
+        self._pets: List[TrainPet] = []
+        self._shown = False
+
+        # 共用的渲染器和屏幕监视器
+        self._renderer = TrainRenderer(debug_mode=train_config.DEBUG_MODE,
+                                       render_thread=train_config.RENDER_THREAD)
+        self._screens = ScreenTracker(self)
+        self._screens.device_pixel_ratio_released.connect(
+            self._renderer.invalidate_device_pixel_ratio
+        )
+
+        # 叠加层模式下所有列车画在同一个叠加层上
+        self._compositor: Optional[OverlayCompositor] = None
+        if train_config.WINDOW_GEOMETRY_MODE == 'overlay':
+            self._compositor = OverlayCompositor(self._screens, self)
+
+        # 共用的时钟：每帧读取一次时间，所有列车的运动时钟都从这里取时间；
+        # 集群暂停（锁屏等）期间时钟也暂停，恢复后列车不会跳过暂停的时长
+        self._clock = MotionClock()
+        self._now = self._clock.now()
+
+        # 共用的定时器
+        self._scheduler = FrameScheduler(train_config.ANIMATION_INTERVAL, self)
+        self._scheduler.tick.connect(self.step)
+        self._scheduler.active_changed.connect(self._on_scheduler_active_changed)
+        self._app_suspended = False
+        QApplication.instance().applicationStateChanged.connect(
+            self._on_application_state_changed
+        )
+        self._session_lock = SessionLockMonitor(self)
+        self._session_lock.locked_changed.connect(self._update_locked_pause)
+
+        # 只解码一份图片
+        decode_scale, self._render_scale = image_scales(self._screens)
+        self._crop_loader: Optional[CropLoader] = CropLoader(
+            ImageLoader(os.path.join(os.path.dirname(__file__), 'images'),
+                        train_config.CROP_CACHE_DIR),
+            train_config.IMAGE_SOURCE, crop_regions(), decode_scale
+        )
+        self._crop_loader.crops_ready.connect(self._on_images_loaded)
+        self._crop_loader.failed.connect(self._on_images_failed)
+        self._crop_loader.finished.connect(self._crop_loader.deleteLater)
+        self._crop_loader.finished.connect(self._on_crop_loader_finished)
+        self._crop_loader.start()
+
+    def now(self) -> float:
+        """当前帧的时间（秒）"""
+        return self._now
+
+    def show(self):
+        """显示所有列车（图片加载完成前调用时，在创建后显示）"""
+        self._shown = True
+        for pet in self._pets:
+            pet.show()
+
+    def wait_until_ready(self, timeout_ms: int = -1) -> bool:
+        """阻塞等待图片加载完成并创建所有列车
+
+        Args:
+            timeout_ms: 超时时间（毫秒），-1 表示一直等待
+
+        Returns:
+            bool: 列车是否已创建
+        """
+        if self._crop_loader is not None:
+            if timeout_ms < 0:
+                self._crop_loader.wait()
+            else:
+                self._crop_loader.wait(timeout_ms)
+            QApplication.sendPostedEvents(self)
+        return bool(self._pets)
+
+    @staticmethod
+    def _atlas_angles() -> Tuple[float, ...]:
+        """共享图集预生成的角度
+
+        列车多时实时旋转（平滑变换绘制）是主要开销，图集只构建一次，
+        预生成转弯的全部量化角度后每个组件每帧只是一次贴图。
+        """
+        angles = tuple(train_config.ATLAS_ROTATION_ANGLES)
+        if train_config.SWARM_ATLAS_TURN_ANGLES:
+            turn_angles = quantized_angles(train_config.ROTATION_ANGLE_STEPS)
+            angles += tuple(angle for angle in turn_angles if angle not in angles)
+        return angles
+
+    def _on_images_loaded(self, crops: Dict[str, QImage]):
+        """图片加载完成，创建所有列车（GUI 线程）"""
+        head = QPixmap.fromImage(crops['head'])
+        body = QPixmap.fromImage(crops['body'])
+        tail = QPixmap.fromImage(crops['tail'])
+        self._renderer.prepare_atlas(
+            [head, body, tail], self._render_scale,
+            self._atlas_angles(), self._screens.primary().device_pixel_ratio
+        )
+        shared = SharedTrainResources(
+            renderer=self._renderer, screens=self._screens,
+            head_image=head, body_image=body, tail_image=tail,
+            render_scale=self._render_scale,
+            compositor=self._compositor
+        )
+
+        # 沿边框路线均匀错开
+        for i in range(self._count):
+            pet = TrainPet(MotionClock(self.now), shared)
+            pet.start_at(i / self._count)
+            self._pets.append(pet)
+            if self._shown:
+                pet.show()
+
+        self._scheduler.start()
+        self.ready.emit()
+
+    def _on_crop_loader_finished(self):
+        """释放加载线程（线程结束后才能丢弃引用，否则会在运行中被销毁）"""
+        self._crop_loader = None
+
+    def _on_images_failed(self, message: str):
+        """图片加载失败"""
+        QApplication.quit()
+
+    def step(self):
+        """推进所有列车一帧（暂停中的列车跳过），由共用定时器调用"""
+        self._now = self._clock.now()
+        for pet in self._pets:
+            pet.scheduler.drive()
+
+    def _on_scheduler_active_changed(self, active: bool):
+        """共用定时器启停时同步共用时钟"""
+        if active:
+            self._clock.resume()
+        else:
+            self._clock.pause()
+        self._now = self._clock.now()
+
+    def _on_application_state_changed(self, state: Qt.ApplicationState):
+        """应用状态变化（移动平台锁屏、挂起）"""
+        self._app_suspended = state in (Qt.ApplicationState.ApplicationSuspended,
+                                        Qt.ApplicationState.ApplicationHidden)
+        self._update_locked_pause()
+
+    def _update_locked_pause(self):
+        """应用挂起或会话锁定时暂停，两者都解除后恢复"""
+        if self._app_suspended or self._session_lock.is_locked:
+            self._scheduler.pause(FrameScheduler.PAUSE_LOCKED)
+        else:
+            self._scheduler.resume(FrameScheduler.PAUSE_LOCKED)
+
+    @property
+    def pets(self) -> List[TrainPet]:
+        """获取所有列车"""
+        return self._pets
+
+    @property
+    def compositor(self) -> Optional[OverlayCompositor]:
+        """获取共用的叠加层管理器（非叠加层模式为 None）"""
+        return self._compositor
+
+    @property
+    def renderer(self) -> TrainRenderer:
+        """获取共用的渲染器"""
+        return self._renderer
+
+    @property
+    def scheduler(self) -> FrameScheduler:
+        """获取共用的帧调度器"""
+        return self._scheduler
@@ -0,0 +1,286 @@
+import csv
+import json
+import math
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+from PySide6.QtCore import QPoint, QRect, Qt
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter
+
+# 每帧记录的列（与导出的 CSV 表头一致）
+COLUMNS = (
+    'time',  # 距开始记录的时间（秒）
+    'interval_ms',  # 与上一帧的间隔
+    'jitter_ms',  # 间隔与定时器周期之差
+    'missed',  # 本帧之前错过的帧数
+    'update_ms',  # 状态推进和布局耗时
+    'paint_ms',  # 绘制耗时，本帧未重绘时为 NaN
+    'cache_hits',  # 变换缓存累计命中次数
+    'cache_misses',  # 变换缓存累计未命中次数
+    'strip_hits',  # 长条缓存累计命中次数
+    'strip_misses',  # 长条缓存累计未命中次数
+)
+
+
+@dataclass(frozen=True)
+class FrameSummary:
+    """记录窗口内的统计摘要"""
+    frames: int  # 记录的帧数
+    update_p50_ms: float
+    update_p99_ms: float
+    paint_p50_ms: float
+    paint_p99_ms: float
+    jitter_p99_ms: float  # 定时器抖动（绝对值）的 99 分位
+    missed_frames: int  # 错过的帧数合计
+    cache_hit_rate: float  # 窗口内变换缓存命中率
+
+
+class FrameProfiler:
+    """帧耗时记录器
+
+    用环形缓冲区记录最近若干帧的定时器抖动、更新耗时、绘制耗时、
+    掉帧数和缓存统计。关闭时调用方不接入任何记录代码，开销为零。
+    """
+    def __init__(self, interval_ms: int, capacity: int = 600,
+                 cache_stats: Optional[Callable[[], tuple]] = None):
+        """初始化记录器
+
+        Args:
+            interval_ms: 定时器周期（毫秒）
+            capacity: 环形缓冲区容量（帧）
+            cache_stats: 返回 (缓存命中, 缓存未命中, 长条命中, 长条未命中) 的函数
+        """
+        self._interval_ms = interval_ms
+        self._capacity = capacity
+        self._cache_stats = cache_stats
+        self._enabled = False
+
+        # 预分配的环形缓冲区（按列存放）
+        self._columns: Dict[str, List[float]] = {
+            name: [0.0] * capacity for name in COLUMNS
+        }
+        self._count = 0
+        self._start_time = 0.0
+        self._last_tick: Optional[float] = None
+
+        # 悬浮信息按固定间隔刷新，避免每帧排序
+        self._overlay_text = ''
+        self._overlay_time = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        """是否正在记录"""
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled: bool):
+        """开始或停止记录，重新开始时清空缓冲区"""
+        if enabled and not self._enabled:
+            self.clear()
+        self._enabled = enabled
+
+    @property
+    def interval_ms(self) -> int:
+        """定时器周期（毫秒）"""
+        return self._interval_ms
+
+    @interval_ms.setter
+    def interval_ms(self, interval_ms: int):
+        self._interval_ms = interval_ms
+
+    def clear(self):
+        """清空记录"""
+        self._count = 0
+        self._start_time = time.perf_counter()
+        self._last_tick = None
+        self._overlay_text = ''
+        self._overlay_time = 0.0
+
+    def reset_tick(self):
+        """定时器暂停后重新启动时调用，下一帧不计算间隔"""
+        self._last_tick = None
+
+    def record_update(self, start: float, end: float):
+        """记录一帧的更新
+
+        Args:
+            start: 更新开始时间（time.perf_counter）
+            end: 更新结束时间
+        """
+        index = self._count % self._capacity
+        columns = self._columns
+
+        if self._last_tick is None:
+            interval = float(self._interval_ms)
+        else:
+            interval = (start - self._last_tick) * 1000
+        self._last_tick = start
+
+        columns['time'][index] = start - self._start_time
+        columns['interval_ms'][index] = interval
+        columns['jitter_ms'][index] = interval - self._interval_ms
+        columns['missed'][index] = max(0, round(interval / self._interval_ms) - 1) \
+            if self._interval_ms > 0 else 0
+        columns['update_ms'][index] = (end - start) * 1000
+        columns['paint_ms'][index] = math.nan
+
+        if self._cache_stats is not None:
+            hits, misses, strip_hits, strip_misses = self._cache_stats()
+            columns['cache_hits'][index] = hits
+            columns['cache_misses'][index] = misses
+            columns['strip_hits'][index] = strip_hits
+            columns['strip_misses'][index] = strip_misses
+        self._count += 1
+
+    def record_paint(self, start: float, end: float):
+        """记录最近一帧的绘制耗时
+
+        Args:
+            start: 绘制开始时间（time.perf_counter）
+            end: 绘制结束时间
+        """
+        if self._count == 0:
+            return
+        self._columns['paint_ms'][(self._count - 1) % self._capacity] = (end - start) * 1000
+
+    def rows(self) -> List[Dict[str, float]]:
+        """按时间顺序返回缓冲区中的所有帧"""
+        first = max(0, self._count - self._capacity)
+        return [
+            {name: self._columns[name][logical % self._capacity] for name in COLUMNS}
+            for logical in range(first, self._count)
+        ]
+
+    def summary(self) -> FrameSummary:
+        """计算缓冲区内的统计摘要"""
+        rows = self.rows()
+        updates = sorted(row['update_ms'] for row in rows)
+        paints = sorted(row['paint_ms'] for row in rows if not math.isnan(row['paint_ms']))
+        jitters = sorted(abs(row['jitter_ms']) for row in rows)
+
+        hit_rate = 0.0
+        if len(rows) > 1:
+            hits = rows[-1]['cache_hits'] - rows[0]['cache_hits']
+            misses = rows[-1]['cache_misses'] - rows[0]['cache_misses']
+            hit_rate = hits / (hits + misses) if hits + misses else 1.0
+
+        return FrameSummary(
+            frames=len(rows),
+            update_p50_ms=self._percentile(updates, 0.5),
+            update_p99_ms=self._percentile(updates, 0.99),
+            paint_p50_ms=self._percentile(paints, 0.5),
+            paint_p99_ms=self._percentile(paints, 0.99),
+            jitter_p99_ms=self._percentile(jitters, 0.99),
+            missed_frames=int(sum(row['missed'] for row in rows)),
+            cache_hit_rate=hit_rate
+        )
+
+    @staticmethod
+    def _percentile(values: List[float], fraction: float) -> float:
+        """已排序列表的分位数"""
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(len(values) * fraction))]
+
+    def dump_csv(self, path: str):
+        """导出为 CSV
+
+        Args:
+            path: 文件路径
+        """
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(self.rows())
+
+    def dump_json(self, path: str):
+        """导出为 JSON（包含摘要和逐帧记录）
+
+        Args:
+            path: 文件路径
+        """
+        rows = [
+            {name: (None if isinstance(value, float) and math.isnan(value) else value)
+             for name, value in row.items()}
+            for row in self.rows()
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'interval_ms': self._interval_ms,
+                'summary': asdict(self.summary()),
+                'frames': rows
+            }, f, ensure_ascii=False, indent=2)
+
+    def overlay_text(self, refresh_s: float = 0.5) -> str:
+        """悬浮显示的统计信息，按刷新间隔重新计算
+
+        Args:
+            refresh_s: 刷新间隔（秒）
+
+        Returns:
+            str: 统计信息
+        """
+        now = time.perf_counter()
+        if not self._overlay_text or now - self._overlay_time >= refresh_s:
+            s = self.summary()
+            self._overlay_text = (
+                f"upd {s.update_p50_ms:.2f}/{s.update_p99_ms:.2f} "
+                f"paint {s.paint_p50_ms:.2f}/{s.paint_p99_ms:.2f} ms "
+                f"jit {s.jitter_p99_ms:.1f} miss {s.missed_frames} "
+                f"hit {s.cache_hit_rate:.0%}"
+            )
+            self._overlay_time = now
+        return self._overlay_text
+
+    @staticmethod
+    def _overlay_font() -> QFont:
+        """悬浮信息使用的字体"""
+        font = QFont()
+        font.setPixelSize(10)
+        return font
+
+    def overlay_rect(self, top_left: QPoint = QPoint(0, 0)) -> QRect:
+        """悬浮信息占据的区域（叠加层模式下用于计算重绘区域）
+
+        Args:
+            top_left: 悬浮信息左上角
+
+        Returns:
+            QRect: 区域
+        """
+        return self.text_rect(self.overlay_text(), top_left)
+
+    @classmethod
+    def text_rect(cls, text: str, top_left: QPoint = QPoint(0, 0)) -> QRect:
+        """统计信息文字占据的区域"""
+        rect = QFontMetrics(cls._overlay_font()).boundingRect(text).adjusted(-2, -1, 2, 1)
+        rect.moveTopLeft(top_left)
+        return rect
+
+    def draw_overlay(self, painter: QPainter, top_left: QPoint = QPoint(0, 0)):
+        """在窗口左上角（或指定位置）绘制紧凑的统计信息
+
+        Args:
+            painter: 画笔对象
+            top_left: 悬浮信息左上角
+        """
+        self.draw_text(painter, self.overlay_text(), top_left)
+
+    @classmethod
+    def draw_text(cls, painter: QPainter, text: str, top_left: QPoint = QPoint(0, 0)):
+        """绘制已生成的统计信息（不读取记录，可在渲染线程调用）
+
+        Args:
+            painter: 画笔对象
+            text: 统计信息
+            top_left: 悬浮信息左上角
+        """
+        rect = cls.text_rect(text, top_left)
+        painter.save()
+        try:
+            painter.setFont(cls._overlay_font())
+            painter.fillRect(rect, QColor(0, 0, 0, 160))
+            painter.setPen(QColor(0, 255, 0))
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+        finally:
+            painter.restore()
@@ -0,0 +1,189 @@
+from dataclasses import dataclass
+from typing import Hashable, Optional, Set, Union
+from PySide6.QtCore import QObject, QRect, QTimer, Signal
+from PySide6.QtGui import QRegion
+from PySide6.QtWidgets import QWidget
+
+
+@dataclass(frozen=True)
+class SchedulerStats:
+    """调度统计信息快照"""
+    ticks: int  # 定时器触发次数
+    repaints: int  # 请求重绘次数
+    skipped_repaints: int  # 渲染输入未变化而跳过的重绘次数
+
+
+class FrameScheduler(QObject):
+    """帧调度器
+
+    定时器只负责推进状态（移动窗口），只有渲染输入变化时才请求重绘；
+    存在任意暂停原因（拖拽、停靠、锁屏等）时停止定时器，不产生唤醒。
+    """
+    # 每帧触发的信号
+    tick = Signal()
+
+    # 定时器启停信号（True 表示开始运行）
+    active_changed = Signal(bool)
+
+    # 常用暂停原因
+    PAUSE_DRAGGING = 'dragging'  # 用户正在拖拽
+    PAUSE_PARKED = 'parked'  # 列车已停靠
+    PAUSE_LOCKED = 'locked'  # 屏幕锁定或应用被挂起
+    PAUSE_HIDDEN = 'hidden'  # 窗口被隐藏或最小化
+
+    def __init__(self, interval_ms: int, parent: Optional[QObject] = None,
+                 use_timer: bool = True):
+        """初始化调度器
+
+        Args:
+            interval_ms: 帧间隔（毫秒）
+            parent: 父对象
+            use_timer: 是否使用自己的定时器；为 False 时由外部调用 drive 推进
+        """
+        super().__init__(parent)
+        self._interval_ms = interval_ms
+        self._use_timer = use_timer
+        self._running = False
+        self._active = False
+        self._pause_reasons: Set[str] = set()
+
+        # 上一次重绘时的渲染输入
+        self._last_render_key: Optional[Hashable] = None
+        self._has_render_key = False
+
+        # 统计计数
+        self._ticks = 0
+        self._repaints = 0
+        self._skipped_repaints = 0
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def start(self):
+        """启动调度"""
+        self._running = True
+        self._apply_timer_state()
+
+    def stop(self):
+        """停止调度"""
+        self._running = False
+        self._apply_timer_state()
+
+    def pause(self, reason: str):
+        """因指定原因暂停，所有原因解除后才会恢复
+
+        Args:
+            reason: 暂停原因
+        """
+        self._pause_reasons.add(reason)
+        self._apply_timer_state()
+
+    def resume(self, reason: str):
+        """解除指定的暂停原因
+
+        Args:
+            reason: 暂停原因
+        """
+        self._pause_reasons.discard(reason)
+        self._apply_timer_state()
+
+    def is_paused_by(self, reason: str) -> bool:
+        """是否因指定原因暂停"""
+        return reason in self._pause_reasons
+
+    @property
+    def is_active(self) -> bool:
+        """是否正在运行（已启动且没有暂停原因）"""
+        return self._active
+
+    def drive(self) -> bool:
+        """由外部时钟推进一帧（共用定时器时使用），暂停期间不推进
+
+        Returns:
+            bool: 是否推进了这一帧
+        """
+        if not self._active:
+            return False
+        self._on_timeout()
+        return True
+
+    @property
+    def interval(self) -> int:
+        """获取帧间隔（毫秒）"""
+        return self._interval_ms
+
+    @interval.setter
+    def interval(self, interval_ms: int):
+        """设置帧间隔（毫秒）"""
+        self._interval_ms = interval_ms
+        if self._timer.isActive():
+            self._timer.setInterval(interval_ms)
+
+    def request_repaint(self, widget: QWidget, render_key: Hashable,
+                        region: Optional[Union[QRect, QRegion]] = None) -> bool:
+        """仅当渲染输入变化时请求重绘
+
+        Args:
+            widget: 需要重绘的窗口
+            render_key: 决定窗口内像素的全部渲染输入
+            region: 需要重绘的区域（窗口坐标），None 表示整个窗口
+
+        Returns:
+            bool: 是否请求了重绘
+        """
+        if not self.take_render_key(render_key):
+            return False
+        if region is None:
+            widget.update()
+        else:
+            widget.update(region)
+        return True
+
+    def take_render_key(self, render_key: Hashable) -> bool:
+        """记录渲染输入，不请求重绘（由渲染线程准备好这一帧后再重绘）
+
+        Args:
+            render_key: 决定窗口内像素的全部渲染输入
+
+        Returns:
+            bool: 渲染输入是否变化（变化时计入重绘次数）
+        """
+        if self._has_render_key and render_key == self._last_render_key:
+            self._skipped_repaints += 1
+            return False
+
+        self._last_render_key = render_key
+        self._has_render_key = True
+        self._repaints += 1
+        return True
+
+    def invalidate(self):
+        """使上一次的渲染输入失效，下一次请求必定重绘"""
+        self._has_render_key = False
+
+    @property
+    def stats(self) -> SchedulerStats:
+        """获取统计信息"""
+        return SchedulerStats(
+            ticks=self._ticks,
+            repaints=self._repaints,
+            skipped_repaints=self._skipped_repaints
+        )
+
+    def _apply_timer_state(self):
+        """根据运行状态和暂停原因启停定时器"""
+        should_run = self._running and not self._pause_reasons
+        if should_run == self._active:
+            return
+        self._active = should_run
+        if self._use_timer:
+            if should_run:
+                self._timer.start(self._interval_ms)
+            else:
+                self._timer.stop()
+        self.active_changed.emit(should_run)
+
+    def _on_timeout(self):
+        """定时器回调"""
+        self._ticks += 1
+        self.tick.emit()
@@ -1,13 +1,33 @@
 import os
+import shutil
 
-from PySide6.QtGui import QPixmap
+from PySide6.QtCore import QRect, QSize, QStandardPaths, QThread, Qt, Signal
+from PySide6.QtGui import QImage, QImageIOHandler, QImageReader, QPixmap
 from typing import Dict, Tuple, Optional
 
+# 裁剪区域：(x, y, width, height)
+CropRect = Tuple[int, int, int, int]
+
+
 class ImageLoader:
     """图片加载工具类"""
-    def __init__(self, image_dir: str):
+    def __init__(self, image_dir: str, cache_dir: Optional[str] = None):
+        """初始化加载器
+        
+        Args:
+            image_dir: 图片目录
+            cache_dir: 裁剪结果的磁盘缓存目录，None 表示系统缓存目录
+        """
         self._image_dir = image_dir
         self._images: Dict[str, QPixmap] = {}
+        if not cache_dir:
+            cache_dir = os.path.join(
+                QStandardPaths.writableLocation(
+                    QStandardPaths.StandardLocation.GenericCacheLocation
+                ),
+                'TrainPet', 'crops'
+            )
+        self._cache_dir = cache_dir
         
        
         
@@ -84,6 +104,118 @@ class ImageLoader:
             
             raise
             
+    def load_crops(self, filename: str, regions: Dict[str, CropRect],
+                   scale_factor: float) -> Dict[str, QImage]:
+        """按目标缩放读取多个裁剪区域（可在非 GUI 线程调用）
+        
+        先查磁盘缓存（按文件修改时间和缩放因子区分），缺失的区域才解码原图；
+        格式支持裁剪读取时只解码需要的区域，否则解码一次后逐个裁剪，
+        原图在返回前释放，不会常驻内存。
+        
+        Args:
+            filename: 图片文件名
+            regions: 区域名称 -> 原图中的裁剪区域 (x, y, width, height)
+            scale_factor: 裁剪结果的缩放因子
+            
+        Returns:
+            Dict[str, QImage]: 区域名称 -> 缩放后的裁剪图片
+            
+        Raises:
+            FileNotFoundError: 图片文件不存在
+            ValueError: 图片解码失败或裁剪区域超出图片范围
+        """
+        filepath = os.path.join(self._image_dir, filename)
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"图片文件不存在: {filepath}")
+            
+        cache_dir = self._crop_cache_dir(filepath)
+        crops: Dict[str, QImage] = {}
+        missing: Dict[str, CropRect] = {}
+        for name, rect in regions.items():
+            image = QImage(self._crop_cache_path(cache_dir, rect, scale_factor))
+            if image.isNull():
+                missing[name] = rect
+            else:
+                crops[name] = image
+                
+        if missing:
+            decoded = self._decode_crops(filepath, missing, scale_factor)
+            for name, image in decoded.items():
+                self._save_crop(cache_dir, missing[name], scale_factor, image)
+            crops.update(decoded)
+        return crops
+        
+    def _decode_crops(self, filepath: str, regions: Dict[str, CropRect],
+                      scale_factor: float) -> Dict[str, QImage]:
+        """从原图解码裁剪区域并缩放"""
+        reader = QImageReader(filepath)
+        source_size = reader.size()
+        for rect in regions.values():
+            if not QRect(0, 0, source_size.width(), source_size.height()).contains(QRect(*rect)):
+                raise ValueError(f"裁剪区域超出图片范围: {rect}")
+                
+        crops: Dict[str, QImage] = {}
+        if reader.supportsOption(QImageIOHandler.ImageOption.ClipRect):
+            # 逐个区域只解码需要的部分，并直接解码到目标尺寸
+            for name, rect in regions.items():
+                reader = QImageReader(filepath)
+                reader.setClipRect(QRect(*rect))
+                reader.setScaledSize(self._scaled_size(rect, scale_factor))
+                image = reader.read()
+                if image.isNull():
+                    raise ValueError(f"图片加载失败: {filepath} ({reader.errorString()})")
+                crops[name] = image
+            return crops
+            
+        # 不支持裁剪读取（如 PNG）：整图只解码一次
+        source = reader.read()
+        if source.isNull():
+            raise ValueError(f"图片加载失败: {filepath} ({reader.errorString()})")
+        for name, rect in regions.items():
+            crops[name] = source.copy(QRect(*rect)).scaled(
+                self._scaled_size(rect, scale_factor),
+                Qt.AspectRatioMode.IgnoreAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            )
+        del source
+        return crops
+        
+    @staticmethod
+    def _scaled_size(rect: CropRect, scale_factor: float) -> QSize:
+        """裁剪区域缩放后的尺寸"""
+        return QSize(max(1, round(rect[2] * scale_factor)),
+                     max(1, round(rect[3] * scale_factor)))
+        
+    def _crop_cache_dir(self, filepath: str) -> str:
+        """原图对应的缓存目录，目录名包含文件修改时间，原图更新后自动失效"""
+        stem = os.path.splitext(os.path.basename(filepath))[0]
+        return os.path.join(self._cache_dir, f"{stem}-{os.stat(filepath).st_mtime_ns}")
+        
+    @staticmethod
+    def _crop_cache_path(cache_dir: str, rect: CropRect, scale_factor: float) -> str:
+        """裁剪结果的缓存文件路径"""
+        x, y, width, height = rect
+        return os.path.join(cache_dir, f"{x}_{y}_{width}_{height}@{scale_factor:.4f}.png")
+        
+    def _save_crop(self, cache_dir: str, rect: CropRect, scale_factor: float, image: QImage):
+        """写入磁盘缓存，并清理同一原图旧修改时间的缓存（写入失败时忽略）"""
+        try:
+            if not os.path.isdir(cache_dir):
+                stem = os.path.basename(cache_dir).rsplit('-', 1)[0]
+                if os.path.isdir(self._cache_dir):
+                    for entry in os.listdir(self._cache_dir):
+                        if entry.rsplit('-', 1)[0] == stem:
+                            shutil.rmtree(os.path.join(self._cache_dir, entry), ignore_errors=True)
+                os.makedirs(cache_dir, exist_ok=True)
+                
+            # 先写临时文件再替换，避免并发读取到写了一半的文件
+            path = self._crop_cache_path(cache_dir, rect, scale_factor)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            if image.save(temp_path, 'PNG'):
+                os.replace(temp_path, path)
+        except OSError:
+            pass
+            
     def get_image_size(self, filename: str) -> Tuple[int, int]:
         """获取图片尺寸
         
@@ -106,4 +238,39 @@ class ImageLoader:
     def clear_cache(self):
         """清除图片缓存"""
         
-        self._images.clear() 
\ No newline at end of file
+        self._images.clear()
+
+
+class CropLoader(QThread):
+    """在工作线程中读取裁剪区域"""
+    # 读取完成信号：区域名称 -> QImage
+    crops_ready = Signal(object)
+    
+    # 读取失败信号：错误信息
+    failed = Signal(str)
+    
+    def __init__(self, loader: ImageLoader, filename: str, regions: Dict[str, CropRect],
+                 scale_factor: float, parent=None):
+        """初始化读取线程
+        
+        Args:
+            loader: 图片加载器
+            filename: 图片文件名
+            regions: 区域名称 -> 裁剪区域
+            scale_factor: 裁剪结果的缩放因子
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._loader = loader
+        self._filename = filename
+        self._regions = dict(regions)
+        self._scale_factor = scale_factor
+        
+    def run(self):
+        """读取所有区域"""
+        try:
+            crops = self._loader.load_crops(self._filename, self._regions, self._scale_factor)
+        except (OSError, ValueError) as e:
+            self.failed.emit(str(e))
+            return
+        self.crops_ready.emit(crops)
@@ -0,0 +1,40 @@
+import time
+from typing import Callable, Optional
+
+
+class MotionClock:
+    """单调运动时钟，暂停期间不计时
+
+    所有运动状态都从这里取时间，丢帧或暂停后位置不会漂移。
+    """
+    def __init__(self, time_source: Callable[[], float] = time.monotonic):
+        """初始化时钟
+
+        Args:
+            time_source: 单调时间源（秒），默认使用 time.monotonic
+        """
+        self._time_source = time_source
+        self._origin = time_source()
+        self._paused_at: Optional[float] = None
+        self._paused_total = 0.0
+
+    def now(self) -> float:
+        """获取运动时间（秒），不包含暂停的时长"""
+        current = self._paused_at if self._paused_at is not None else self._time_source()
+        return current - self._origin - self._paused_total
+
+    def pause(self):
+        """暂停计时"""
+        if self._paused_at is None:
+            self._paused_at = self._time_source()
+
+    def resume(self):
+        """恢复计时"""
+        if self._paused_at is not None:
+            self._paused_total += self._time_source() - self._paused_at
+            self._paused_at = None
+
+    @property
+    def is_paused(self) -> bool:
+        """是否已暂停"""
+        return self._paused_at is not None
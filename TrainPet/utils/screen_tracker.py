@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from functools import partial
+from typing import Dict, Optional, Set
+from PySide6.QtCore import QObject, QPoint, QRect, Signal
+from PySide6.QtGui import QGuiApplication, QScreen
+
+
+@dataclass(frozen=True)
+class ScreenInfo:
+    """屏幕几何信息快照"""
+    name: str  # 屏幕名称
+    geometry: QRect  # 屏幕区域（虚拟桌面坐标）
+    device_pixel_ratio: float  # 设备像素比
+
+
+class ScreenTracker(QObject):
+    """屏幕监视器
+
+    监听屏幕插拔、几何变化和 DPI 变化，只针对实际变化的屏幕发出信号，
+    使依赖屏幕的缓存可以单独失效，而不是全部重建。
+    """
+    # 某块屏幕的几何或设备像素比发生变化（屏幕名称）
+    screen_changed = Signal(str)
+
+    # 某块屏幕被移除（屏幕名称）
+    screen_removed = Signal(str)
+
+    # 某个设备像素比不再被任何屏幕使用
+    device_pixel_ratio_released = Signal(float)
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._screens: Dict[str, ScreenInfo] = {}
+
+        app = QGuiApplication.instance()
+        for screen in QGuiApplication.screens():
+            self._watch(screen)
+        app.screenAdded.connect(self._on_screen_added)
+        app.screenRemoved.connect(self._on_screen_removed)
+
+    def info(self, name: str) -> Optional[ScreenInfo]:
+        """获取屏幕信息快照，屏幕不存在时返回 None"""
+        return self._screens.get(name)
+
+    def primary(self) -> ScreenInfo:
+        """获取主屏幕信息"""
+        return self._screens[QGuiApplication.primaryScreen().name()]
+
+    def screen_at(self, point: QPoint) -> ScreenInfo:
+        """获取包含指定点的屏幕信息，不在任何屏幕上时返回主屏幕"""
+        for info in self._screens.values():
+            if info.geometry.contains(point):
+                return info
+        return self.primary()
+
+    @property
+    def device_pixel_ratios(self) -> Set[float]:
+        """当前所有屏幕使用的设备像素比"""
+        return {info.device_pixel_ratio for info in self._screens.values()}
+
+    def _watch(self, screen: QScreen):
+        """记录屏幕并监听其变化"""
+        self._screens[screen.name()] = self._snapshot(screen)
+        refresh = partial(self._on_screen_updated, screen)
+        screen.geometryChanged.connect(refresh)
+        screen.logicalDotsPerInchChanged.connect(refresh)
+        screen.physicalDotsPerInchChanged.connect(refresh)
+
+    @staticmethod
+    def _snapshot(screen: QScreen) -> ScreenInfo:
+        """生成屏幕信息快照"""
+        return ScreenInfo(screen.name(), screen.geometry(), screen.devicePixelRatio())
+
+    def _on_screen_added(self, screen: QScreen):
+        """屏幕插入"""
+        self._watch(screen)
+        self.screen_changed.emit(screen.name())
+
+    def _on_screen_removed(self, screen: QScreen):
+        """屏幕移除"""
+        info = self._screens.pop(screen.name(), None)
+        self.screen_removed.emit(screen.name())
+        if info is not None:
+            self._release_ratio(info.device_pixel_ratio)
+
+    def _on_screen_updated(self, screen: QScreen, *args):
+        """屏幕几何或 DPI 变化，只在快照实际变化时通知"""
+        old = self._screens.get(screen.name())
+        new = self._snapshot(screen)
+        if old == new:
+            return
+        self._screens[screen.name()] = new
+        self.screen_changed.emit(screen.name())
+        if old is not None and old.device_pixel_ratio != new.device_pixel_ratio:
+            self._release_ratio(old.device_pixel_ratio)
+
+    def _release_ratio(self, ratio: float):
+        """设备像素比不再被使用时发出通知"""
+        if ratio not in self.device_pixel_ratios:
+            self.device_pixel_ratio_released.emit(ratio)
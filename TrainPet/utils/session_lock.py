@@ -0,0 +1,117 @@
+import sys
+from typing import Optional
+from PySide6.QtCore import QAbstractNativeEventFilter, QCoreApplication, QObject, Signal, SLOT
+from PySide6.QtGui import QAction, QActionGroup, QWindow
+
+# Windows 会话变化通知（wtsapi32）
+_WM_WTSSESSION_CHANGE = 0x02B1
+_WTS_SESSION_LOCK = 0x7
+_WTS_SESSION_UNLOCK = 0x8
+_NOTIFY_FOR_THIS_SESSION = 0
+
+# 会话总线上的屏幕保护程序接口 (路径, 接口)，锁屏时发出 ActiveChanged(true)；
+# 不限定发送方，各桌面环境的服务名不同
+_SCREENSAVER_INTERFACES = (
+    ('/org/freedesktop/ScreenSaver', 'org.freedesktop.ScreenSaver'),
+    ('/ScreenSaver', 'org.freedesktop.ScreenSaver'),
+    ('/org/gnome/ScreenSaver', 'org.gnome.ScreenSaver'),
+    ('/org/mate/ScreenSaver', 'org.mate.ScreenSaver'),
+    ('/org/cinnamon/ScreenSaver', 'org.cinnamon.ScreenSaver'),
+)
+
+
+class _WindowsSessionFilter(QAbstractNativeEventFilter):
+    """接收 WM_WTSSESSION_CHANGE 的原生事件过滤器"""
+    def __init__(self, monitor: 'SessionLockMonitor'):
+        super().__init__()
+        self._monitor = monitor
+
+    def nativeEventFilter(self, event_type, message):
+        if event_type == b'windows_generic_MSG':
+            from ctypes import wintypes
+            msg = wintypes.MSG.from_address(int(message))
+            if msg.message == _WM_WTSSESSION_CHANGE:
+                if msg.wParam == _WTS_SESSION_LOCK:
+                    self._monitor.set_locked(True)
+                elif msg.wParam == _WTS_SESSION_UNLOCK:
+                    self._monitor.set_locked(False)
+        return False, 0
+
+
+class SessionLockMonitor(QObject):
+    """会话锁定监视器
+
+    桌面版 Windows 和 X11 锁屏时应用状态不会变成挂起或隐藏，需要平台的
+    锁屏通知：Windows 上注册 WTS 会话通知，在原生事件里接收锁定和解锁；
+    Linux 上监听会话总线上各桌面环境屏幕保护程序的 ActiveChanged 信号。
+    平台不支持或总线不可用时不会发出信号，只剩应用状态一种判断方式。
+    """
+    # 会话锁定状态变化（True 表示已锁定）
+    locked_changed = Signal(bool)
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._locked = False
+        self._window: Optional[QWindow] = None  # Windows 上接收会话通知的隐藏窗口
+        self._filter: Optional[_WindowsSessionFilter] = None
+        self._dbus_receiver: Optional[QAction] = None  # Linux 上接收总线信号的对象
+
+        if sys.platform == 'win32':
+            self._watch_windows()
+        elif sys.platform.startswith('linux'):
+            self._watch_dbus()
+
+    @property
+    def is_locked(self) -> bool:
+        """会话是否已锁定"""
+        return self._locked
+
+    def set_locked(self, locked: bool):
+        """更新锁定状态，变化时发出信号"""
+        if locked == self._locked:
+            return
+        self._locked = locked
+        self.locked_changed.emit(locked)
+
+    def _watch_windows(self):
+        """注册 WTS 会话通知（通知发给一个不显示的原生窗口）"""
+        import ctypes
+        try:
+            wtsapi32 = ctypes.windll.wtsapi32
+        except OSError:
+            return
+        self._window = QWindow()
+        hwnd = int(self._window.winId())
+        if not wtsapi32.WTSRegisterSessionNotification(hwnd, _NOTIFY_FOR_THIS_SESSION):
+            return
+        app = QCoreApplication.instance()
+        self._filter = _WindowsSessionFilter(self)
+        app.installNativeEventFilter(self._filter)
+
+        # 过滤器不能比监视器活得久
+        session_filter = self._filter
+        def unregister():
+            app.removeNativeEventFilter(session_filter)
+            wtsapi32.WTSUnRegisterSessionNotification(hwnd)
+        self.destroyed.connect(unregister)
+
+    def _watch_dbus(self):
+        """监听会话总线上屏幕保护程序的激活信号（锁屏时激活）"""
+        try:
+            from PySide6.QtDBus import QDBusConnection
+        except ImportError:
+            return
+        bus = QDBusConnection.sessionBus()
+        if not bus.isConnected():
+            return
+        # 接收对象必须由 C++ 创建：总线线程会查询接收对象的元对象，Python 创建
+        # 的对象需要 GIL，而 connect 阻塞等待总线线程时不释放 GIL，会死锁。
+        # 动作组创建的可勾选动作正好有 setChecked(bool) 槽和 toggled(bool) 信号
+        group = QActionGroup(self)
+        group.setExclusionPolicy(QActionGroup.ExclusionPolicy.None_)
+        self._dbus_receiver = group.addAction('')
+        self._dbus_receiver.setCheckable(True)
+        self._dbus_receiver.toggled.connect(self.set_locked)
+        for path, interface in _SCREENSAVER_INTERFACES:
+            bus.connect('', path, interface, 'ActiveChanged',
+                        self._dbus_receiver, SLOT('setChecked(bool)'))
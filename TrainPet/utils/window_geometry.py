@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+from typing import Optional
+from PySide6.QtCore import QObject, QPoint, QSize, QTimer
+from PySide6.QtWidgets import QWidget
+
+
+@dataclass(frozen=True)
+class GeometryStats:
+    """原生窗口几何变更统计"""
+    moves: int  # 窗口移动次数
+    resizes: int  # 窗口尺寸变化次数
+    requests: int  # 收到的几何请求次数（合并前）
+
+    @property
+    def changes(self) -> int:
+        """原生几何变更总次数"""
+        return self.moves + self.resizes
+
+
+class WindowGeometry(QObject):
+    """窗口几何管理器
+
+    收集一帧内的所有位置、尺寸请求，只应用最后一次，保证每帧最多一次
+    原生移动；帧外的请求（如拖拽）在下一次事件循环时合并应用。
+    """
+    def __init__(self, widget: QWidget):
+        """初始化管理器
+
+        Args:
+            widget: 需要管理的窗口
+        """
+        super().__init__(widget)
+        self._widget = widget
+        self._pending_pos: Optional[QPoint] = None
+        self._pending_size: Optional[QSize] = None
+
+        # 帧外请求在下一次事件循环时应用
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(0)
+        self._flush_timer.timeout.connect(self.flush)
+
+        # 统计计数
+        self._moves = 0
+        self._resizes = 0
+        self._requests = 0
+
+    def request(self, pos: QPoint, size: Optional[QSize] = None):
+        """请求移动（和调整尺寸），实际变更推迟到 flush
+
+        Args:
+            pos: 窗口左上角（屏幕坐标）
+            size: 窗口尺寸，None 表示不变
+        """
+        self._requests += 1
+        if size is not None:
+            self._pending_size = None if size == self._widget.size() else QSize(size)
+        self._pending_pos = None if pos == self._widget.pos() else QPoint(pos)
+        if self.has_pending and not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    @property
+    def has_pending(self) -> bool:
+        """是否有尚未应用的变更"""
+        return self._pending_pos is not None or self._pending_size is not None
+
+    def flush(self):
+        """应用合并后的位置和尺寸"""
+        self._flush_timer.stop()
+        if self._pending_size is not None:
+            self._widget.setFixedSize(self._pending_size)
+            self._pending_size = None
+            self._resizes += 1
+        if self._pending_pos is not None:
+            self._widget.move(self._pending_pos)
+            self._pending_pos = None
+            self._moves += 1
+
+    def reset_stats(self):
+        """重置统计计数"""
+        self._moves = 0
+        self._resizes = 0
+        self._requests = 0
+
+    @property
+    def stats(self) -> GeometryStats:
+        """获取统计信息"""
+        return GeometryStats(moves=self._moves, resizes=self._resizes, requests=self._requests)